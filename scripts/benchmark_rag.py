@@ -0,0 +1,189 @@
+"""Compare RAG embedding backends on recall and query latency.
+
+Each corpus is chunked the same way the app does it and indexed once per
+backend. Probe queries are sentences sampled from the chunks themselves; a
+probe counts as recalled when its source chunk is in the top-k. Free-form
+questions from ``--queries`` have no labels, so for those the script reports
+how many of the Ollama top-k results the local backend also returns.
+With ``--ann`` the script also builds an IVF index over each backend's
+vectors and reports its recall@k against exact search for each ``nprobe``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+sys.path.insert(0, str(SRC_ROOT))
+
+from Furhat.RAG import builder, config, retriever  # noqa: E402
+from Furhat.RAG.ann import IvfIndex  # noqa: E402
+from Furhat.RAG.embeddings import BACKEND_HASHED_NGRAM, BACKEND_OLLAMA, EMBED_BACKENDS  # noqa: E402
+from Furhat.RAG.retriever import RagIndex  # noqa: E402
+
+
+_SENTENCE_RE = re.compile(r"[^.!?]{40,200}[.!?]")
+
+
+def _probes(index: RagIndex, count: int, rng: random.Random) -> list[tuple[str, int]]:
+    candidates: list[tuple[str, int]] = []
+    for idx, entry in enumerate(index.entries):
+        for sentence in _SENTENCE_RE.findall(entry.text):
+            candidates.append((sentence.strip(), idx))
+    rng.shuffle(candidates)
+    return candidates[:count]
+
+
+def _timed_ids(index: RagIndex, query: str, k: int) -> tuple[list[int], float]:
+    positions = {id(entry): idx for idx, entry in enumerate(index.entries)}
+    started = time.perf_counter()
+    results = index.retrieve(query, k=k)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return [positions[id(entry)] for entry in results], elapsed_ms
+
+
+def _latency(samples: list[float]) -> str:
+    if not samples:
+        return "n/a"
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"mean {statistics.fmean(ordered):.1f} ms, p95 {p95:.1f} ms"
+
+
+def ann_report(index: RagIndex, queries: list[str], *, k: int, nlist: int, nprobes: list[int]) -> None:
+    if not queries:
+        return
+    started = time.perf_counter()
+    index.ann = IvfIndex.build(index.embeddings, nlist=nlist)
+    print(f"    IVF: {index.ann.nlist} lists built in {time.perf_counter() - started:.1f} s")
+    vectors = [index.embedder.embed_query(query) for query in queries]
+    exact: list[set[int]] = []
+    exact_ms: list[float] = []
+    for vector in vectors:
+        started = time.perf_counter()
+        exact.append(set(index.rank_vector(vector, k, exact=True)))
+        exact_ms.append((time.perf_counter() - started) * 1000.0)
+    print(f"    exact: {_latency(exact_ms)}")
+    for nprobe in nprobes:
+        retriever.set_retrieval_settings(
+            top_k=k,
+            max_context_chars=retriever.MAX_CONTEXT_CHARS,
+            embed_model=retriever.EMBED_MODEL,
+            ann_nprobe=nprobe,
+            ann_min_chunks=1,
+        )
+        hits = 0
+        latencies: list[float] = []
+        for vector, expected in zip(vectors, exact):
+            started = time.perf_counter()
+            found = index.rank_vector(vector, k)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            hits += len(expected.intersection(found))
+        recall = hits / max(1, sum(len(expected) for expected in exact))
+        print(f"    nprobe {nprobe}: recall@{k} vs exact {recall:.2%}; {_latency(latencies)}")
+
+
+def benchmark_corpus(
+    data_dir: Path,
+    *,
+    backends: list[str],
+    model: str,
+    k: int,
+    probes: int,
+    queries: list[str],
+    seed: int,
+    ann_nlist: int | None = None,
+    ann_nprobes: list[int] | None = None,
+) -> None:
+    indexes: dict[str, RagIndex] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for backend in backends:
+            output = Path(temp_dir) / f"{backend}.pkl"
+            started = time.perf_counter()
+            try:
+                count = builder.build_index(data_dir=data_dir, output=output, model=model, backend=backend)
+            except Exception as exc:
+                print(f"  {backend}: build failed ({exc})")
+                continue
+            if not count:
+                print(f"  no .txt files in {data_dir}")
+                return
+            print(f"  {backend}: built {count} chunks in {time.perf_counter() - started:.1f} s")
+            indexes[backend] = RagIndex.load(output)
+
+    if not indexes:
+        return
+    probe_set = _probes(next(iter(indexes.values())), probes, random.Random(seed))
+    results: dict[str, dict[str, list[list[int]]]] = {}
+    for backend, index in indexes.items():
+        hits = 0
+        latencies: list[float] = []
+        for query, expected in probe_set:
+            ids, elapsed = _timed_ids(index, query, k)
+            latencies.append(elapsed)
+            hits += int(expected in ids)
+        free_ids: list[list[int]] = []
+        for query in queries:
+            ids, elapsed = _timed_ids(index, query, k)
+            latencies.append(elapsed)
+            free_ids.append(ids)
+        results[backend] = {"free": free_ids}
+        recall = hits / len(probe_set) if probe_set else 0.0
+        print(f"  {backend}: probe recall@{k} {recall:.2%} over {len(probe_set)} probes; {_latency(latencies)}")
+        if ann_nprobes:
+            ann_queries = [query for query, _ in probe_set] + queries
+            ann_report(index, ann_queries, k=k, nlist=ann_nlist or 0, nprobes=ann_nprobes)
+
+    if queries and BACKEND_OLLAMA in results and BACKEND_HASHED_NGRAM in results:
+        overlaps = [
+            len(set(local) & set(remote)) / max(1, len(remote))
+            for local, remote in zip(results[BACKEND_HASHED_NGRAM]["free"], results[BACKEND_OLLAMA]["free"])
+        ]
+        print(f"  {BACKEND_HASHED_NGRAM} overlap with {BACKEND_OLLAMA} top-{k}: {statistics.fmean(overlaps):.2%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, action="append", help="Corpus folder (repeatable).")
+    parser.add_argument("--queries", type=Path, help="Text file with one visitor question per line.")
+    parser.add_argument("--backend", choices=EMBED_BACKENDS, action="append")
+    parser.add_argument("--model", type=str, default=config.EMBED_MODEL)
+    parser.add_argument("--k", type=int, default=config.TOP_K)
+    parser.add_argument("--probes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--ann", action="store_true", help="Also measure IVF recall against exact search.")
+    parser.add_argument("--ann-nlist", type=int, default=config.ANN_NLIST, help="IVF lists (0 = sqrt of chunks).")
+    parser.add_argument("--ann-nprobe", type=int, action="append", help="nprobe values to try (repeatable).")
+    args = parser.parse_args()
+
+    data_dirs = args.data_dir or [config.DATA_DIR]
+    backends = args.backend or list(EMBED_BACKENDS)
+    queries: list[str] = []
+    if args.queries:
+        queries = [line.strip() for line in args.queries.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    for data_dir in data_dirs:
+        print(f"{data_dir}:")
+        benchmark_corpus(
+            data_dir,
+            backends=backends,
+            model=args.model,
+            k=args.k,
+            probes=args.probes,
+            queries=queries,
+            seed=args.seed,
+            ann_nlist=args.ann_nlist,
+            ann_nprobes=(args.ann_nprobe or [1, 2, 4, 8, 16]) if args.ann else None,
+        )
+
+
+if __name__ == "__main__":
+    main()
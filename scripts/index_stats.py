@@ -0,0 +1,85 @@
+"""Report size and layout of a RAG index, and what int8 storage would change.
+
+With ``--compare-storage`` the float32 vectors are quantized in memory and
+each chunk's own vector is used as a query: recall@k of int8 scoring (with and
+without exact re-scoring) is measured against float32 exact search, alongside
+the memory each layout needs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+sys.path.insert(0, str(SRC_ROOT))
+
+from Furhat.RAG import config, retriever, vectors  # noqa: E402
+from Furhat.RAG.retriever import RagIndex  # noqa: E402
+
+
+def _mib(value: int) -> str:
+    return f"{value / (1024 * 1024):.2f} MiB"
+
+
+def _recall(index: RagIndex, reference: list[set[int]], queries: list[list[float]], k: int) -> float:
+    hits = 0
+    for query, expected in zip(queries, reference):
+        hits += len(expected.intersection(index.rank_vector(query, k, exact=True)))
+    return hits / max(1, sum(len(expected) for expected in reference))
+
+
+def compare_storage(index: RagIndex, *, k: int, samples: int) -> None:
+    rows = [index.embeddings[idx] for idx in range(len(index.embeddings))]
+    float_store = vectors.Float32Store.from_rows(rows)
+    exact_index = RagIndex(float_store, index.entries, norms=index.norms, embedder=index.embedder)
+    queries = rows[:: max(1, len(rows) // max(1, samples))][:samples]
+    reference = [set(exact_index.rank_vector(query, k, exact=True)) for query in queries]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sidecar = Path(temp_dir) / "index.f32"
+        vectors.write_exact_sidecar(sidecar, rows)
+        int8_store = vectors.Int8Store.from_rows(rows)
+        int8_store.exact_path = sidecar
+        int8_index = RagIndex(int8_store, index.entries, norms=index.norms, embedder=index.embedder)
+        with_rescore = _recall(int8_index, reference, queries, k)
+        retriever.RESCORE_CANDIDATES, saved = 0, retriever.RESCORE_CANDIDATES
+        try:
+            without_rescore = _recall(int8_index, reference, queries, k)
+        finally:
+            retriever.RESCORE_CANDIDATES = saved
+            int8_store.close()
+
+    float_bytes = float_store.memory_bytes()
+    int8_bytes = int8_store.memory_bytes()
+    print(f"float32 vectors: {_mib(float_bytes)}")
+    print(f"int8 vectors:    {_mib(int8_bytes)} ({int8_bytes / max(1, float_bytes):.0%} of float32)")
+    print(f"int8 recall@{k} vs float32 over {len(queries)} queries: {without_rescore:.2%}")
+    print(f"int8 + rescore of top {max(k, saved)}: {with_rescore:.2%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("index", type=Path, nargs="?", default=config.INDEX_PATH)
+    parser.add_argument("--compare-storage", action="store_true")
+    parser.add_argument("--k", type=int, default=config.TOP_K)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    index = RagIndex.load(args.index)
+    stats = index.stats()
+    stats["file_bytes"] = args.index.stat().st_size
+    sidecar = getattr(index.embeddings, "exact_path", None)
+    if sidecar is not None and sidecar.exists():
+        stats["sidecar_bytes"] = sidecar.stat().st_size
+    print(json.dumps(stats, indent=2))
+    if args.compare_storage:
+        compare_storage(index, k=args.k, samples=args.samples)
+
+
+if __name__ == "__main__":
+    main()
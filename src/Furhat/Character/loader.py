@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import asyncio
+import functools
 import hashlib
 import html
 import json
@@ -16,7 +16,7 @@ from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
 from ..RAG import builder, retriever
-from .. import paths
+from .. import executors, paths
 from .. import settings_store
 from ..settings_store import AppSettings
 
@@ -716,6 +716,7 @@ def _prepare_character_rag_sync(
     character = load_character(character_path)
     if not character.external_links:
         _notify(notify, f"Character '{character.name}' has no external links for RAG.")
+        retriever.clear_index(retriever.INDEX_CHARACTER)
         return
 
     base_dir = get_character_storage_dir(character_path)
@@ -737,17 +738,18 @@ def _prepare_character_rag_sync(
             )
         except Exception as exc:
             _notify(notify, f"RAG build failed: {exc}")
+            retriever.clear_index(retriever.INDEX_CHARACTER)
             return
         if entries == 0:
             _notify(notify, "RAG build skipped: no sources found.")
+            retriever.clear_index(retriever.INDEX_CHARACTER)
             return
         _write_manifest(manifest_path, character.external_links)
         _notify(notify, f"RAG index ready ({entries} chunks).")
     else:
         _notify(notify, f"RAG index already up to date for '{character.name}'.")
 
-    retriever.set_index_path(index_path)
-    retriever.reload_index()
+    retriever.set_index_path(index_path, retriever.INDEX_CHARACTER)
 
 
 async def prepare_character_rag(
@@ -756,4 +758,7 @@ async def prepare_character_rag(
     *,
     force: bool = False,
 ) -> None:
-    await asyncio.to_thread(_prepare_character_rag_sync, character_path, notify, force=force)
+    await executors.run(
+        executors.RAG_BUILD,
+        functools.partial(_prepare_character_rag_sync, character_path, notify, force=force),
+    )
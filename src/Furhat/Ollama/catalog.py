@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_CATALOG_TTL_SEC = float(os.getenv("MODEL_CATALOG_TTL_SEC", "300"))
+MODEL_VALIDATION_TTL_SEC = float(os.getenv("MODEL_VALIDATION_TTL_SEC", str(6 * 3600)))
+MODEL_VALIDATION_MAX_STALE_SEC = float(os.getenv("MODEL_VALIDATION_MAX_STALE_SEC", str(7 * 24 * 3600)))
+
+VALIDATION_FRESH = "fresh"
+VALIDATION_STALE = "stale"
+VALIDATION_MISSING = "missing"
+
+ModelFetcher = Callable[[str, str, str], list[str]]
+CatalogCallback = Callable[[list[str], Optional[Exception]], None]
+
+
+def _write_json_atomic(path: Path, payload: dict[str, object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+def credential_fingerprint(api_key: str) -> str:
+    value = str(api_key).strip()
+    if not value:
+        return ""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    models: tuple[str, ...]
+    fetched_at: float
+
+    def to_dict(self) -> dict[str, object]:
+        return {"models": list(self.models), "fetched_at": self.fetched_at}
+
+    @classmethod
+    def from_dict(cls, data: object) -> "CatalogEntry | None":
+        if not isinstance(data, dict):
+            return None
+        models = data.get("models")
+        if not isinstance(models, list):
+            return None
+        try:
+            fetched_at = float(data.get("fetched_at", 0.0))
+        except (TypeError, ValueError):
+            return None
+        return cls(models=tuple(str(item) for item in models if str(item).strip()), fetched_at=fetched_at)
+
+
+class ModelCatalog:
+    """Model lists cached per (provider, base URL) with a TTL.
+
+    Entries survive restarts when a persistence path is configured, so the UI
+    can show the last known list while a background fetch runs. The API key
+    is passed through to the fetcher but never stored.
+    """
+
+    def __init__(
+        self,
+        fetcher: ModelFetcher,
+        *,
+        ttl_sec: float = MODEL_CATALOG_TTL_SEC,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._fetcher = fetcher
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], CatalogEntry] = {}
+        self._inflight: dict[tuple[str, str], list[CatalogCallback]] = {}
+        self.ttl_sec = max(0.0, float(ttl_sec))
+        self.path = path
+        self._loaded = path is None
+
+    def configure(self, *, ttl_sec: float | None = None, path: Path | None = None) -> None:
+        with self._lock:
+            if ttl_sec is not None:
+                self.ttl_sec = max(0.0, float(ttl_sec))
+            if path is not None and path != self.path:
+                self.path = Path(path)
+                self._loaded = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Failed to read model catalog cache: %s", exc)
+            return
+        items = payload.get("entries", []) if isinstance(payload, dict) else []
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            entry = CatalogEntry.from_dict(item)
+            if entry is None:
+                continue
+            key = (str(item.get("provider", "")), str(item.get("base_url", "")))
+            self._entries.setdefault(key, entry)
+
+    def _persist(self) -> None:
+        if self.path is None:
+            return
+        payload = {
+            "version": 1,
+            "entries": [
+                {"provider": provider, "base_url": base_url, **entry.to_dict()}
+                for (provider, base_url), entry in self._entries.items()
+            ],
+        }
+        try:
+            _write_json_atomic(self.path, payload)
+        except Exception as exc:
+            logger.warning("Failed to write model catalog cache: %s", exc)
+
+    def cached(self, provider: str, base_url: str) -> CatalogEntry | None:
+        with self._lock:
+            self._ensure_loaded()
+            return self._entries.get((provider, base_url))
+
+    def is_fresh(self, entry: CatalogEntry | None) -> bool:
+        if entry is None:
+            return False
+        return (self._clock() - entry.fetched_at) < self.ttl_sec
+
+    def fetch(self, provider: str, base_url: str, api_key: str) -> list[str]:
+        models = list(self._fetcher(provider, base_url, api_key))
+        entry = CatalogEntry(models=tuple(models), fetched_at=self._clock())
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[(provider, base_url)] = entry
+            self._persist()
+        return models
+
+    def get_models(
+        self,
+        provider: str,
+        base_url: str,
+        api_key: str,
+        *,
+        refresh: bool = False,
+    ) -> list[str]:
+        entry = self.cached(provider, base_url)
+        if not refresh and self.is_fresh(entry):
+            assert entry is not None
+            return list(entry.models)
+        return self.fetch(provider, base_url, api_key)
+
+    def get_models_async(
+        self,
+        provider: str,
+        base_url: str,
+        api_key: str,
+        callback: CatalogCallback,
+        *,
+        refresh: bool = False,
+    ) -> threading.Thread | None:
+        entry = self.cached(provider, base_url)
+        if not refresh and self.is_fresh(entry):
+            assert entry is not None
+            callback(list(entry.models), None)
+            return None
+
+        key = (provider, base_url)
+        with self._lock:
+            waiters = self._inflight.get(key)
+            if waiters is not None:
+                waiters.append(callback)
+                return None
+            self._inflight[key] = [callback]
+
+        def _worker() -> None:
+            models: list[str] = []
+            error: Exception | None = None
+            try:
+                models = self.fetch(provider, base_url, api_key)
+            except Exception as exc:
+                error = exc
+            with self._lock:
+                callbacks = self._inflight.pop(key, [])
+            for waiter in callbacks:
+                try:
+                    waiter(list(models), error)
+                except Exception:
+                    logger.exception("Model catalog callback failed")
+
+        thread = threading.Thread(target=_worker, name="model-catalog", daemon=True)
+        thread.start()
+        return thread
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationEntry:
+    validated_at: float
+    credential: str = ""
+    # Read back from disk: proven by an earlier process, so re-checked before it counts as fresh.
+    restored: bool = False
+
+
+class ModelValidationCache:
+    """Remembers which (provider, base URL, model) combinations passed validation.
+
+    Entries younger than ``ttl_sec`` are trusted outright. Older entries, up to
+    ``max_stale_sec``, are still trusted but trigger one background
+    revalidation, and so do entries read back from disk: the model may have
+    been removed, or never pulled on this machine, since they were proven.
+    Entries are tied to a fingerprint of the API key, so a new key never
+    reuses a result proven with another one.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_sec: float = MODEL_VALIDATION_TTL_SEC,
+        max_stale_sec: float = MODEL_VALIDATION_MAX_STALE_SEC,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str, str], ValidationEntry] = {}
+        self._revalidating: set[tuple[str, str, str]] = set()
+        self.ttl_sec = max(0.0, float(ttl_sec))
+        self.max_stale_sec = max(self.ttl_sec, float(max_stale_sec))
+        self.path = path
+        self._loaded = path is None
+
+    def configure(self, *, path: Path | None = None, ttl_sec: float | None = None) -> None:
+        with self._lock:
+            if ttl_sec is not None:
+                self.ttl_sec = max(0.0, float(ttl_sec))
+                self.max_stale_sec = max(self.ttl_sec, self.max_stale_sec)
+            if path is not None and path != self.path:
+                self.path = Path(path)
+                self._loaded = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Failed to read model validation cache: %s", exc)
+            return
+        items = payload.get("entries", []) if isinstance(payload, dict) else []
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                key = (str(item["provider"]), str(item.get("base_url", "")), str(item["model"]))
+                entry = ValidationEntry(
+                    validated_at=float(item["validated_at"]),
+                    credential=str(item.get("credential", "")),
+                    restored=True,
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._entries.setdefault(key, entry)
+
+    def _persist(self) -> None:
+        if self.path is None:
+            return
+        payload = {
+            "version": 1,
+            "entries": [
+                {
+                    "provider": provider,
+                    "base_url": base_url,
+                    "model": model,
+                    "validated_at": entry.validated_at,
+                    "credential": entry.credential,
+                }
+                for (provider, base_url, model), entry in self._entries.items()
+            ],
+        }
+        try:
+            _write_json_atomic(self.path, payload)
+        except Exception as exc:
+            logger.warning("Failed to write model validation cache: %s", exc)
+
+    def lookup(self, key: tuple[str, str, str], api_key: str = "") -> str:
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+        if entry is None or entry.credential != credential_fingerprint(api_key):
+            return VALIDATION_MISSING
+        age = self._clock() - entry.validated_at
+        if age < self.ttl_sec and not entry.restored:
+            return VALIDATION_FRESH
+        if age < self.max_stale_sec:
+            return VALIDATION_STALE
+        return VALIDATION_MISSING
+
+    def mark_valid(self, key: tuple[str, str, str], api_key: str = "") -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[key] = ValidationEntry(
+                validated_at=self._clock(),
+                credential=credential_fingerprint(api_key),
+            )
+            self._persist()
+
+    def discard(self, key: tuple[str, str, str]) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            if self._entries.pop(key, None) is not None:
+                self._persist()
+
+    def revalidate_async(
+        self,
+        key: tuple[str, str, str],
+        api_key: str,
+        validator: Callable[[], None],
+    ) -> threading.Thread | None:
+        with self._lock:
+            if key in self._revalidating:
+                return None
+            self._revalidating.add(key)
+
+        def _worker() -> None:
+            try:
+                validator()
+            except Exception as exc:
+                logger.warning("Background revalidation failed for model %s: %s", key[2], exc)
+                self.discard(key)
+            else:
+                self.mark_valid(key, api_key)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        thread = threading.Thread(target=_worker, name="model-revalidate", daemon=True)
+        thread.start()
+        return thread
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import http.client
 import json
 import logging
 import os
 import re
+from pathlib import Path
 from typing import Generator
-from urllib import error as urlerror
-from urllib import request as urlrequest
 
 import ollama
 
-from . import config
+from .. import executors
+from . import catalog, config, http_pool, routing
+from .residency import KIND_CHAT, get_keep_alive, residency_manager
 
 logger = logging.getLogger(__name__)
 
@@ -23,18 +25,32 @@ PROVIDER_LABELS = {
 }
 DEFAULT_EXTERNAL_API_BASE_URL = "https://api.openai.com/v1"
 EXTERNAL_API_TIMEOUT = float(os.getenv("EXTERNAL_API_TIMEOUT", "30"))
+EXTERNAL_HTTP_POOL_SIZE = int(os.getenv("EXTERNAL_HTTP_POOL_SIZE", "4"))
+EXTERNAL_HTTP_IDLE_SEC = float(os.getenv("EXTERNAL_HTTP_IDLE_SEC", "60"))
 RECOMMENDED_REMOTE_CHAT_MODELS = ("openai/gpt-5-mini", "openai/gpt-4.1-mini")
 UNSUPPORTED_EXTERNAL_CHAT_MODEL_PATTERNS = (
     re.compile(r"(?:^|/)(?:o1|o3|o4)(?:[-_].*|$)", re.IGNORECASE),
 )
+# A chat error mentioning the model and one of these means the model itself was refused.
+_MODEL_ERROR_MARKERS = ("not found", "does not exist", "not supported", "does not support", "no such model")
 
 system_prompt: str | None = None
-_chat_model_ok: set[tuple[str, str]] = set()
 MAX_TOKENS = int(os.getenv("CHAT_MAX_TOKENS", "120"))
 MAX_HISTORY_MESSAGES = int(os.getenv("CHAT_MAX_HISTORY_MESSAGES", "16"))
 MAX_HISTORY_CHARS = int(os.getenv("CHAT_MAX_HISTORY_CHARS", "8000"))
+# Extra backends to route turns to, as a JSON list of objects with name,
+# provider, model and optionally api_base_url / api_key. Empty disables routing.
+LLM_ROUTES = os.getenv("LLM_ROUTES", "").strip()
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "5"))
+LLM_ROUTE_WINDOW = int(os.getenv("LLM_ROUTE_WINDOW", "20"))
+LLM_ROUTE_MAX_ERROR_RATE = float(os.getenv("LLM_ROUTE_MAX_ERROR_RATE", "0.5"))
+LLM_ROUTE_COOLDOWN_SEC = float(os.getenv("LLM_ROUTE_COOLDOWN_SEC", "30"))
+LLM_ROUTE_FIRST_TOKEN_SEC = float(os.getenv("LLM_ROUTE_FIRST_TOKEN_SEC", "8"))
+PRIMARY_ROUTE = "primary"
 
 client = ollama.Client()
+external_pool = http_pool.HttpPool(max_idle=EXTERNAL_HTTP_POOL_SIZE, idle_timeout=EXTERNAL_HTTP_IDLE_SEC)
 messages: list[dict[str, str]] = []
 current_provider: str = PROVIDER_OLLAMA
 current_model: str = config.DEFAULT_MODEL
@@ -92,18 +108,119 @@ def get_chat_settings() -> dict[str, float | int]:
     }
 
 
+def get_http_pool_stats() -> dict[str, object]:
+    return external_pool.stats()
+
+
 def get_last_completion_info() -> dict[str, object]:
     return dict(last_completion_info)
 
 
-def _set_last_completion_info(*, finish_reason: str = "", truncated: bool = False) -> None:
+def _set_last_completion_info(
+    *,
+    finish_reason: str = "",
+    truncated: bool = False,
+    route: routing.Route | None = None,
+) -> None:
     global last_completion_info
     last_completion_info = {
-        "provider": current_provider,
-        "model": current_model,
+        "provider": route.provider if route else current_provider,
+        "model": route.model if route else current_model,
         "finish_reason": finish_reason,
         "truncated": bool(truncated),
     }
+    if route is not None:
+        last_completion_info["route"] = route.name
+
+
+def _parse_routes(raw: str) -> list[routing.Route]:
+    if not raw:
+        return []
+    try:
+        items = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"LLM_ROUTES is not valid JSON: {exc}") from exc
+    if not isinstance(items, list):
+        raise ValueError("LLM_ROUTES must be a JSON list.")
+    routes: list[routing.Route] = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError("Each LLM_ROUTES entry must be an object.")
+        name = str(item.get("name", "")).strip()
+        model = str(item.get("model", "")).strip()
+        if not name or not model or name == PRIMARY_ROUTE:
+            raise ValueError(f"Each LLM_ROUTES entry needs a model and a name other than '{PRIMARY_ROUTE}'.")
+        routes.append(
+            routing.Route(
+                name=name,
+                provider=_normalize_provider(str(item.get("provider", PROVIDER_OLLAMA))),
+                model=model,
+                api_base_url=str(item.get("api_base_url", "")).strip().rstrip("/"),
+                api_key=str(item.get("api_key", "")).strip(),
+            )
+        )
+    return routes
+
+
+extra_routes: list[routing.Route] = []
+router = routing.Router()
+
+
+def configure_routing(
+    *,
+    routes: list[routing.Route] | None = None,
+    hedge_percentile: float | None = None,
+    hedge_min_samples: int | None = None,
+    window: int | None = None,
+    max_error_rate: float | None = None,
+    cooldown_sec: float | None = None,
+    first_token_sec: float | None = None,
+) -> None:
+    """Replaces the extra routes and resets the collected route stats."""
+    global extra_routes, router
+    global LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES, LLM_ROUTE_WINDOW
+    global LLM_ROUTE_MAX_ERROR_RATE, LLM_ROUTE_COOLDOWN_SEC, LLM_ROUTE_FIRST_TOKEN_SEC
+    if routes is not None:
+        extra_routes = list(routes)
+    if hedge_percentile is not None:
+        if not 0 <= float(hedge_percentile) <= 100:
+            raise ValueError("Hedge percentile must be between 0 and 100.")
+        LLM_HEDGE_PERCENTILE = float(hedge_percentile)
+    if hedge_min_samples is not None:
+        LLM_HEDGE_MIN_SAMPLES = max(1, int(hedge_min_samples))
+    if window is not None:
+        LLM_ROUTE_WINDOW = max(1, int(window))
+    if max_error_rate is not None:
+        LLM_ROUTE_MAX_ERROR_RATE = float(max_error_rate)
+    if cooldown_sec is not None:
+        LLM_ROUTE_COOLDOWN_SEC = float(cooldown_sec)
+    if first_token_sec is not None:
+        if float(first_token_sec) <= 0:
+            raise ValueError("First-token timeout must be > 0.")
+        LLM_ROUTE_FIRST_TOKEN_SEC = float(first_token_sec)
+    router = routing.Router(
+        window=LLM_ROUTE_WINDOW,
+        max_error_rate=LLM_ROUTE_MAX_ERROR_RATE,
+        cooldown_sec=LLM_ROUTE_COOLDOWN_SEC,
+        hedge_percentile=LLM_HEDGE_PERCENTILE / 100.0,
+        min_samples=LLM_HEDGE_MIN_SAMPLES,
+    )
+
+
+def get_routes() -> list[routing.Route]:
+    """The current provider settings first, then the extra routes."""
+    primary = routing.Route(
+        name=PRIMARY_ROUTE,
+        provider=current_provider,
+        model=current_model,
+        api_base_url=current_api_base_url,
+        api_key=current_api_key,
+    )
+    return [primary, *extra_routes]
+
+
+def get_route_stats() -> dict[str, dict[str, object]]:
+    return router.stats() if extra_routes else {}
 
 
 def _normalize_provider(provider: str) -> str:
@@ -115,6 +232,12 @@ def _normalize_provider(provider: str) -> str:
     return value
 
 
+try:
+    configure_routing(routes=_parse_routes(LLM_ROUTES))
+except ValueError:
+    logger.exception("Ignoring LLM_ROUTES; turns go to the configured provider only.")
+
+
 def get_provider_options() -> tuple[str, ...]:
     return SUPPORTED_PROVIDERS
 
@@ -135,7 +258,6 @@ def is_ollama_provider() -> bool:
 def set_provider(provider: str) -> None:
     global current_provider
     current_provider = _normalize_provider(provider)
-    _chat_model_ok.clear()
 
 
 def get_api_base_url() -> str:
@@ -145,7 +267,6 @@ def get_api_base_url() -> str:
 def set_api_base_url(value: str) -> None:
     global current_api_base_url
     current_api_base_url = str(value).strip().rstrip("/")
-    _chat_model_ok.clear()
 
 
 def get_api_key() -> str:
@@ -155,26 +276,25 @@ def get_api_key() -> str:
 def set_api_key(value: str) -> None:
     global current_api_key
     current_api_key = str(value).strip()
-    _chat_model_ok.clear()
 
 
-def _effective_api_base_url() -> str:
-    base_url = current_api_base_url.strip().rstrip("/")
+def _effective_api_base_url(value: str | None = None) -> str:
+    base_url = (current_api_base_url if value is None else str(value)).strip().rstrip("/")
     if base_url:
         return base_url
     return DEFAULT_EXTERNAL_API_BASE_URL
 
 
-def _effective_api_key() -> str:
+def _effective_api_key(value: str | None = None) -> str:
     return (
-        current_api_key.strip()
+        (current_api_key if value is None else str(value)).strip()
         or os.getenv("LLM_API_KEY", "").strip()
         or os.getenv("OPENAI_API_KEY", "").strip()
     )
 
 
-def _require_api_key() -> str:
-    api_key = _effective_api_key()
+def _require_api_key(value: str | None = None) -> str:
+    api_key = _effective_api_key(value)
     if not api_key:
         raise ValueError(
             "External API key is required. Set it in Settings or via LLM_API_KEY / OPENAI_API_KEY."
@@ -182,36 +302,44 @@ def _require_api_key() -> str:
     return api_key
 
 
-def _external_headers() -> dict[str, str]:
+def _external_headers(api_key: str | None = None) -> dict[str, str]:
     return {
-        "Authorization": f"Bearer {_require_api_key()}",
+        "Authorization": f"Bearer {_require_api_key(api_key)}",
         "Content-Type": "application/json",
         "Accept": "application/json",
         "User-Agent": "Furhat-Realtime/0.2",
     }
 
 
-def _external_request(path: str, *, payload: dict[str, object] | None = None) -> dict[str, object]:
-    url = f"{_effective_api_base_url()}/{path.lstrip('/')}"
+def _raise_for_external_status(response: http_pool.PooledResponse) -> None:
+    if response.status < 400:
+        return
+    detail = response.read().decode("utf-8", errors="replace")
+    raise RuntimeError(f"External API HTTP {response.status}: {detail or response.reason}")
+
+
+def _external_request(
+    path: str,
+    *,
+    payload: dict[str, object] | None = None,
+    api_base_url: str | None = None,
+    api_key: str | None = None,
+) -> dict[str, object]:
+    url = f"{_effective_api_base_url(api_base_url)}/{path.lstrip('/')}"
     body = None
     method = "GET"
     if payload is not None:
         body = json.dumps(payload).encode("utf-8")
         method = "POST"
-    request = urlrequest.Request(
-        url,
-        data=body,
-        headers=_external_headers(),
-        method=method,
-    )
+    headers = _external_headers(api_key)
     try:
-        with urlrequest.urlopen(request, timeout=EXTERNAL_API_TIMEOUT) as response:
+        with external_pool.request(
+            method, url, body=body, headers=headers, timeout=EXTERNAL_API_TIMEOUT
+        ) as response:
+            _raise_for_external_status(response)
             raw = response.read().decode("utf-8")
-    except urlerror.HTTPError as exc:
-        detail = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"External API HTTP {exc.code}: {detail or exc.reason}") from exc
-    except urlerror.URLError as exc:
-        raise RuntimeError(f"External API request failed: {exc.reason}") from exc
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"External API request failed: {exc}") from exc
 
     try:
         data = json.loads(raw or "{}")
@@ -222,20 +350,22 @@ def _external_request(path: str, *, payload: dict[str, object] | None = None) ->
     return data
 
 
-def _external_stream_events(payload: dict[str, object]) -> Generator[dict[str, object], None, None]:
-    url = f"{_effective_api_base_url()}/chat/completions"
+def _external_stream_events(
+    payload: dict[str, object],
+    *,
+    api_base_url: str | None = None,
+    api_key: str | None = None,
+) -> Generator[dict[str, object], None, None]:
+    url = f"{_effective_api_base_url(api_base_url)}/chat/completions"
     body = json.dumps(payload).encode("utf-8")
-    headers = _external_headers()
+    headers = _external_headers(api_key)
     headers["Accept"] = "text/event-stream"
-    request = urlrequest.Request(
-        url,
-        data=body,
-        headers=headers,
-        method="POST",
-    )
 
     try:
-        with urlrequest.urlopen(request, timeout=EXTERNAL_API_TIMEOUT) as response:
+        with external_pool.request(
+            "POST", url, body=body, headers=headers, timeout=EXTERNAL_API_TIMEOUT
+        ) as response:
+            _raise_for_external_status(response)
             event_lines: list[str] = []
             for raw_line in response:
                 line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
@@ -251,6 +381,8 @@ def _external_stream_events(payload: dict[str, object]) -> Generator[dict[str, o
                         continue
                     payload_text = "\n".join(data_lines).strip()
                     if payload_text == "[DONE]":
+                        # Read to the end so the connection can go back to the pool.
+                        response.read()
                         break
                     try:
                         data = json.loads(payload_text)
@@ -261,11 +393,8 @@ def _external_stream_events(payload: dict[str, object]) -> Generator[dict[str, o
                     yield data
                     continue
                 event_lines.append(line)
-    except urlerror.HTTPError as exc:
-        detail = exc.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"External API HTTP {exc.code}: {detail or exc.reason}") from exc
-    except urlerror.URLError as exc:
-        raise RuntimeError(f"External API request failed: {exc.reason}") from exc
+    except (OSError, http.client.HTTPException) as exc:
+        raise RuntimeError(f"External API request failed: {exc}") from exc
 
 
 def _unsupported_remote_model_message(model: str) -> str:
@@ -402,15 +531,15 @@ def _extract_ollama_finish_reason(response: object) -> str:
     return ""
 
 
-def _log_if_completion_truncated(*, finish_reason: str) -> None:
+def _log_if_completion_truncated(*, finish_reason: str, route: routing.Route | None = None) -> None:
     normalized = str(finish_reason).strip().lower()
     truncated = normalized in {"length", "max_tokens"}
-    _set_last_completion_info(finish_reason=finish_reason, truncated=truncated)
+    _set_last_completion_info(finish_reason=finish_reason, truncated=truncated, route=route)
     if truncated:
         logger.warning(
             "LLM output hit max token limit: provider=%s model=%s max_tokens=%s finish_reason=%s",
-            current_provider,
-            current_model,
+            last_completion_info["provider"],
+            last_completion_info["model"],
             MAX_TOKENS,
             finish_reason,
         )
@@ -431,19 +560,15 @@ def _rollback_last_user_message(prompt: str) -> None:
 def check_for_model(model: str) -> None:
     if not is_ollama_provider():
         return
+    _ensure_ollama_model(model)
 
-    response = ollama.list()
-    models = getattr(response, "models", None)
-    if models is None:
-        models = response.model_dump().get("models", [])
-    installed_models = []
-    for item in models:
-        if isinstance(item, dict):
-            name = item.get("model")
-        else:
-            name = getattr(item, "model", None)
-        if name:
-            installed_models.append(name)
+
+def _ensure_ollama_model(model: str) -> None:
+    base_url = catalog_base_url(PROVIDER_OLLAMA)
+    installed_models = model_catalog.get_models(PROVIDER_OLLAMA, base_url, "")
+    if model in installed_models:
+        return
+    installed_models = model_catalog.get_models(PROVIDER_OLLAMA, base_url, "", refresh=True)
     if model in installed_models:
         return
 
@@ -455,6 +580,7 @@ def check_for_model(model: str) -> None:
             "Failed to download model %s. Check connectivity or model name.", model
         )
         raise
+    model_catalog.fetch(PROVIDER_OLLAMA, base_url, "")
 
 
 def set_model(model: str) -> None:
@@ -499,8 +625,14 @@ def get_temperature() -> float:
     return current_temperature
 
 
-def list_models() -> list[str]:
-    if is_ollama_provider():
+def list_models(
+    *,
+    provider: str | None = None,
+    api_base_url: str | None = None,
+    api_key: str | None = None,
+) -> list[str]:
+    provider_key = _normalize_provider(provider or current_provider)
+    if provider_key == PROVIDER_OLLAMA:
         response = ollama.list()
         models = getattr(response, "models", None)
         if models is None:
@@ -515,7 +647,7 @@ def list_models() -> list[str]:
                 names.append(name)
         return names
 
-    data = _external_request("models")
+    data = _external_request("models", api_base_url=api_base_url, api_key=api_key)
     items = data.get("data", [])
     if not isinstance(items, list):
         raise RuntimeError("External API models response missing data list.")
@@ -528,19 +660,41 @@ def list_models() -> list[str]:
     return names
 
 
-def _validate_chat_model(model: str) -> None:
-    cache_key = (current_provider, model)
-    if cache_key in _chat_model_ok:
-        return
+def catalog_base_url(provider: str, api_base_url: str | None = None) -> str:
+    if _normalize_provider(provider) == PROVIDER_OLLAMA:
+        return os.getenv("OLLAMA_HOST", "").strip().rstrip("/")
+    return _effective_api_base_url(api_base_url)
 
-    if is_ollama_provider():
-        check_for_model(model)
+
+def _fetch_catalog_models(provider: str, api_base_url: str, api_key: str) -> list[str]:
+    return list_models(provider=provider, api_base_url=api_base_url, api_key=api_key)
+
+
+model_catalog = catalog.ModelCatalog(_fetch_catalog_models)
+validation_cache = catalog.ModelValidationCache()
+
+
+def get_catalog_models(*, refresh: bool = False) -> list[str]:
+    return model_catalog.get_models(
+        current_provider,
+        catalog_base_url(current_provider),
+        _effective_api_key(),
+        refresh=refresh,
+    )
+
+
+def _check_chat_model(model: str, provider: str, api_base_url: str, api_key: str, ollama_host: str = "") -> None:
+    if provider == PROVIDER_OLLAMA:
+        # Models are only pulled on the local server; other hosts just get the ping.
+        if not ollama_host:
+            _ensure_ollama_model(model)
         try:
-            client.chat(
+            response = _ollama_client(ollama_host).chat(
                 model=model,
                 messages=[{"role": "user", "content": "ping"}],
                 stream=False,
                 options={"num_predict": 1},
+                keep_alive=get_keep_alive(),
             )
         except ollama.ResponseError as exc:
             message = str(exc).lower()
@@ -549,16 +703,69 @@ def _validate_chat_model(model: str) -> None:
                     f"Model '{model}' does not support chat. Please select a chat model."
                 ) from exc
             raise
-    else:
-        if _is_unsupported_external_chat_model(model):
-            raise ValueError(_unsupported_remote_model_message(model))
-        available = list_models()
-        if available and model not in available:
-            raise ValueError(
-                f"Model '{model}' was not returned by the external API models endpoint."
-            )
+        if not ollama_host:
+            residency_manager.observe(KIND_CHAT, model, response)
+        return
+
+    if _is_unsupported_external_chat_model(model):
+        raise ValueError(_unsupported_remote_model_message(model))
+    available = model_catalog.get_models(provider, api_base_url, api_key)
+    if available and model not in available:
+        available = model_catalog.get_models(provider, api_base_url, api_key, refresh=True)
+    if available and model not in available:
+        raise ValueError(
+            f"Model '{model}' was not returned by the external API models endpoint."
+        )
+
+
+def _validation_target(model: str, route: routing.Route | None = None) -> tuple[str, str, str, str]:
+    """(provider, api_base_url, api_key, ollama_host) that ``model`` is validated against."""
+    provider = route.provider if route else current_provider
+    ollama_host = route.api_base_url if route and provider == PROVIDER_OLLAMA else ""
+    if provider == PROVIDER_OLLAMA:
+        return provider, ollama_host or catalog_base_url(provider), "", ollama_host
+    api_base_url = catalog_base_url(provider, route.api_base_url if route else None)
+    return provider, api_base_url, _effective_api_key(route.api_key if route else None), ollama_host
 
-    _chat_model_ok.add(cache_key)
+
+def _is_model_error(exc: BaseException) -> bool:
+    if isinstance(exc, ollama.ResponseError) and getattr(exc, "status_code", None) == 404:
+        return True
+    message = str(exc).lower()
+    return "model" in message and any(marker in message for marker in _MODEL_ERROR_MARKERS)
+
+
+def _forget_failed_model(model: str, exc: BaseException, route: routing.Route | None = None) -> None:
+    """Drops the cached validation of ``model`` when a chat call failed because of it."""
+    if not _is_model_error(exc):
+        return
+    provider, api_base_url, _, _ = _validation_target(model, route)
+    validation_cache.discard((provider, api_base_url, model))
+    logger.info("Chat call rejected model %s; it will be validated again: %s", model, exc)
+
+
+def _validate_chat_model(model: str, route: routing.Route | None = None) -> None:
+    """Checks ``model`` on the current provider, or on ``route`` when given."""
+    provider, api_base_url, api_key, ollama_host = _validation_target(model, route)
+    cache_key = (provider, api_base_url, model)
+    state = validation_cache.lookup(cache_key, api_key)
+    if state == catalog.VALIDATION_FRESH:
+        return
+    if state == catalog.VALIDATION_STALE:
+        validation_cache.revalidate_async(
+            cache_key,
+            api_key,
+            lambda: _check_chat_model(model, provider, api_base_url, api_key, ollama_host),
+        )
+        return
+
+    _check_chat_model(model, provider, api_base_url, api_key, ollama_host)
+    validation_cache.mark_valid(cache_key, api_key)
+
+
+def configure_model_caches(*, path_root: Path) -> None:
+    model_catalog.configure(path=path_root / "model_catalog.json")
+    validation_cache.configure(path=path_root / "model_validation.json")
 
 
 def clear_messages() -> None:
@@ -597,6 +804,124 @@ def _trim_history() -> None:
         messages[:] = system + rest
 
 
+_ollama_clients: dict[str, ollama.Client] = {}
+
+
+def _ollama_client(host: str) -> ollama.Client:
+    if not host:
+        return client
+    route_client = _ollama_clients.get(host)
+    if route_client is None:
+        route_client = _ollama_clients[host] = ollama.Client(host=host)
+    return route_client
+
+
+def _stream_route(
+    route: routing.Route,
+    history: list[dict[str, str]],
+    finish_reasons: dict[str, str],
+) -> Generator[str, None, None]:
+    try:
+        yield from _route_tokens(route, history, finish_reasons)
+    except Exception as exc:
+        # The primary route was validated against the current provider settings.
+        _forget_failed_model(route.model, exc, None if route.name == PRIMARY_ROUTE else route)
+        raise
+
+
+def _route_tokens(
+    route: routing.Route,
+    history: list[dict[str, str]],
+    finish_reasons: dict[str, str],
+) -> Generator[str, None, None]:
+    if route.provider == PROVIDER_OLLAMA:
+        stream = _ollama_client(route.api_base_url).chat(
+            model=route.model,
+            messages=history,
+            stream=True,
+            options={"temperature": current_temperature, "num_predict": MAX_TOKENS},
+            keep_alive=get_keep_alive(),
+        )
+        for chunk in stream:
+            chunk_finish_reason = _extract_ollama_finish_reason(chunk)
+            if chunk_finish_reason:
+                finish_reasons[route.name] = chunk_finish_reason
+                if not route.api_base_url:
+                    residency_manager.observe(KIND_CHAT, route.model, chunk)
+            if isinstance(chunk, dict):
+                yield str(chunk.get("message", {}).get("content", "") or "")
+            elif hasattr(chunk, "message"):
+                yield str(getattr(chunk.message, "content", "") or "")
+        return
+
+    payload = {
+        "model": route.model,
+        "messages": history,
+        "temperature": current_temperature,
+        "max_tokens": MAX_TOKENS,
+        "stream": True,
+    }
+    events = _external_stream_events(payload, api_base_url=route.api_base_url, api_key=route.api_key)
+    try:
+        for event in events:
+            token, event_finish_reason = _extract_external_stream_delta(event)
+            if event_finish_reason:
+                finish_reasons[route.name] = event_finish_reason
+            yield token
+    finally:
+        events.close()
+
+
+def _validate_routes(routes: list[routing.Route]) -> list[routing.Route]:
+    valid: list[routing.Route] = []
+    for route in routes:
+        if route.name == PRIMARY_ROUTE:
+            _validate_chat_model(route.model)
+            valid.append(route)
+            continue
+        try:
+            _validate_chat_model(route.model, route)
+        except Exception as exc:
+            logger.warning("Skipping LLM route %s: %s", route.name, exc)
+            continue
+        valid.append(route)
+    return valid
+
+
+async def get_reply(prompt: str) -> str:
+    """``get_full_response`` on the LLM executor, or routed when ``LLM_ROUTES`` is set.
+
+    Only the first token of a routed reply has a deadline
+    (``LLM_ROUTE_FIRST_TOKEN_SEC``); callers bound the whole reply.
+    """
+    if not extra_routes:
+        return await executors.run(executors.LLM, get_full_response, prompt)
+
+    routes = await executors.run(executors.LLM, _validate_routes, get_routes())
+    _ensure_system_prompt()
+    _set_last_completion_info()
+    messages.append({"role": "user", "content": prompt})
+    _trim_history()
+    history = list(messages)
+    finish_reasons: dict[str, str] = {}
+    try:
+        route, response = await router.run(
+            routes,
+            lambda candidate: _stream_route(candidate, history, finish_reasons),
+            first_token_timeout=LLM_ROUTE_FIRST_TOKEN_SEC,
+        )
+    except BaseException:
+        # A failed or cancelled turn must not leave an unanswered prompt in the history.
+        _rollback_last_user_message(prompt)
+        raise
+    _log_if_completion_truncated(finish_reason=finish_reasons.get(route.name, ""), route=route)
+    response = response.strip()
+    if response:
+        messages.append({"role": "assistant", "content": response})
+        _trim_history()
+    return response
+
+
 def get_full_response(prompt: str) -> str:
     _ensure_system_prompt()
     _validate_chat_model(current_model)
@@ -605,12 +930,18 @@ def get_full_response(prompt: str) -> str:
     _trim_history()
 
     if is_ollama_provider():
-        response_obj = client.chat(
-            model=current_model,
-            messages=messages,
-            stream=False,
-            options={"temperature": current_temperature, "num_predict": MAX_TOKENS},
-        )
+        try:
+            response_obj = client.chat(
+                model=current_model,
+                messages=messages,
+                stream=False,
+                options={"temperature": current_temperature, "num_predict": MAX_TOKENS},
+                keep_alive=get_keep_alive(),
+            )
+        except Exception as exc:
+            _forget_failed_model(current_model, exc)
+            raise
+        residency_manager.observe(KIND_CHAT, current_model, response_obj)
         response = response_obj.message.content
         _log_if_completion_truncated(finish_reason=_extract_ollama_finish_reason(response_obj))
     else:
@@ -620,8 +951,12 @@ def get_full_response(prompt: str) -> str:
             "temperature": current_temperature,
             "max_tokens": MAX_TOKENS,
         }
-        data = _external_request("chat/completions", payload=payload)
-        response = _extract_external_text(data)
+        try:
+            data = _external_request("chat/completions", payload=payload)
+            response = _extract_external_text(data)
+        except Exception as exc:
+            _forget_failed_model(current_model, exc)
+            raise
         _log_if_completion_truncated(finish_reason=_extract_external_finish_reason(data))
 
     if response:
@@ -645,20 +980,26 @@ def get_response_by_token(prompt: str) -> Generator[str, None, None]:
             messages=messages,
             stream=True,
             options={"temperature": current_temperature, "num_predict": MAX_TOKENS},
+            keep_alive=get_keep_alive(),
         )
 
-        for chunk in stream:
-            chunk_finish_reason = _extract_ollama_finish_reason(chunk)
-            if chunk_finish_reason:
-                finish_reason = chunk_finish_reason
-            token = ""
-            if isinstance(chunk, dict):
-                token = str(chunk.get("message", {}).get("content", "") or "")
-            elif hasattr(chunk, "message") and getattr(chunk.message, "content", None):
-                token = str(chunk.message.content)
-            if token:
-                full_response += token
-                yield token
+        try:
+            for chunk in stream:
+                chunk_finish_reason = _extract_ollama_finish_reason(chunk)
+                if chunk_finish_reason:
+                    finish_reason = chunk_finish_reason
+                    residency_manager.observe(KIND_CHAT, current_model, chunk)
+                token = ""
+                if isinstance(chunk, dict):
+                    token = str(chunk.get("message", {}).get("content", "") or "")
+                elif hasattr(chunk, "message") and getattr(chunk.message, "content", None):
+                    token = str(chunk.message.content)
+                if token:
+                    full_response += token
+                    yield token
+        except Exception as exc:
+            _forget_failed_model(current_model, exc)
+            raise
     else:
         payload = {
             "model": current_model,
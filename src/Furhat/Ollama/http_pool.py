@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import http.client
+import logging
+import threading
+import time
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+
+logger = logging.getLogger(__name__)
+
+_Key = tuple[str, str, int]
+
+
+class PooledResponse:
+    """An HTTP response that hands its connection back to the pool.
+
+    The connection is reused only if the body was read to the end; closing a
+    response part-way (e.g. an abandoned stream) drops the connection.
+    """
+
+    def __init__(
+        self,
+        pool: "HttpPool",
+        key: _Key,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        reused: bool,
+    ) -> None:
+        self._pool = pool
+        self._key = key
+        self._conn: Optional[http.client.HTTPConnection] = conn
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.reused = reused
+
+    def read(self) -> bytes:
+        data = self._response.read()
+        self.close()
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._response)
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._response.isclosed() and not self._response.will_close:
+            self._pool._release(self._key, conn)
+        else:
+            self._response.close()
+            self._pool._discard(conn)
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+class HttpPool:
+    """Keep-alive HTTP(S) connections, reused per scheme, host and port.
+
+    Up to ``max_idle`` idle connections are kept per host and dropped once
+    idle for ``idle_timeout`` seconds. A request that fails on a reused
+    connection before any response (the server closed it while idle) is sent
+    once more on a fresh one. Thread-safe; a connection serves one request at
+    a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle: int = 4,
+        idle_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_idle = max(0, int(max_idle))
+        self.idle_timeout = float(idle_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._idle: dict[_Key, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._in_use = 0
+        self._created = 0
+        self._reused = 0
+        self._expired = 0
+        self._discarded = 0
+        self._retried = 0
+
+    def _connect(self, key: _Key, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        proxy = getproxies().get(scheme)
+        if proxy and not proxy_bypass(host):
+            proxy_parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            proxy_host, proxy_port = proxy_parts.hostname or "", proxy_parts.port or 80
+            if scheme == "https":
+                # HTTPS through a proxy: CONNECT tunnel, then TLS to the real host.
+                conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout)
+                conn.set_tunnel(host, port)
+            else:
+                conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self._created += 1
+            self._in_use += 1
+        return conn
+
+    def _checkout(self, key: _Key, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        stale: list[http.client.HTTPConnection] = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            now = self._clock()
+            while idle:
+                candidate, idle_since = idle.pop()
+                if now - idle_since >= self.idle_timeout:
+                    stale.append(candidate)
+                    self._expired += 1
+                    continue
+                conn = candidate
+                self._reused += 1
+                self._in_use += 1
+                break
+        for candidate in stale:
+            candidate.close()
+        if conn is None:
+            return self._connect(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, key: _Key, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._in_use -= 1
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((conn, self._clock()))
+                return
+        conn.close()
+
+    def _discard(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._in_use -= 1
+            self._discarded += 1
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+        timeout: float,
+    ) -> PooledResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        for attempt in range(2):
+            conn, reused = self._checkout(key, timeout)
+            path = target
+            if scheme == "http" and conn.host != parts.hostname:
+                path = url  # Plain HTTP through a proxy takes the absolute URL.
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+            except (ConnectionResetError, BrokenPipeError, http.client.BadStatusLine) as exc:
+                self._discard(conn)
+                if reused and attempt == 0:
+                    with self._lock:
+                        self._retried += 1
+                    logger.debug("Reused connection to %s was closed (%s); reconnecting.", key[1], exc)
+                    continue
+                raise
+            except BaseException:
+                self._discard(conn)
+                raise
+            return PooledResponse(self, key, conn, response, reused)
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            requests = self._created + self._reused
+            return {
+                "max_idle": self.max_idle,
+                "idle_timeout_sec": self.idle_timeout,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "in_use": self._in_use,
+                "created": self._created,
+                "reused": self._reused,
+                "reuse_rate": round(self._reused / requests, 3) if requests else 0.0,
+                "expired": self._expired,
+                "discarded": self._discarded,
+                "retried": self._retried,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn, _ in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
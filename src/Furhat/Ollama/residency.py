@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, Callable, Optional
+
+import ollama
+
+from .. import executors
+from .scheduler import Preempted
+
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_KEEPWARM_SEC = float(os.getenv("OLLAMA_KEEPWARM_SEC", "240"))
+OLLAMA_LOAD_LOG_MS = float(os.getenv("OLLAMA_LOAD_LOG_MS", "250"))
+
+KIND_CHAT = "chat"
+KIND_EMBED = "embed"
+WARMUP_TEXT = "warm-up"
+
+ModelSource = Callable[[], tuple[str, str]]
+SlotFactory = Callable[[], AsyncContextManager[None]]
+
+
+def configure_residency(
+    *,
+    keep_alive: str | float | None = None,
+    keepwarm_sec: float | None = None,
+    load_log_ms: float | None = None,
+) -> None:
+    global OLLAMA_KEEP_ALIVE, OLLAMA_KEEPWARM_SEC, OLLAMA_LOAD_LOG_MS
+    if keep_alive is not None:
+        OLLAMA_KEEP_ALIVE = str(keep_alive).strip() or OLLAMA_KEEP_ALIVE
+    if keepwarm_sec is not None:
+        if float(keepwarm_sec) < 0:
+            raise ValueError("Keep-warm interval must be non-negative.")
+        OLLAMA_KEEPWARM_SEC = float(keepwarm_sec)
+    if load_log_ms is not None:
+        if float(load_log_ms) < 0:
+            raise ValueError("Load log threshold must be non-negative.")
+        OLLAMA_LOAD_LOG_MS = float(load_log_ms)
+
+
+def get_keep_alive() -> str | float:
+    """Value for Ollama's ``keep_alive`` parameter.
+
+    Ollama reads bare numbers as seconds and strings as durations ("30m", "-1").
+    """
+    value = str(OLLAMA_KEEP_ALIVE).strip()
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _duration_ms(response: Any, name: str) -> float | None:
+    if isinstance(response, dict):
+        value = response.get(name)
+    else:
+        value = getattr(response, name, None)
+    if value is None:
+        return None
+    try:
+        return float(value) / 1_000_000.0
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class ModelResidency:
+    kind: str
+    model: str
+    resident: bool = False
+    loads: int = 0
+    evictions: int = 0
+    last_load_ms: float = 0.0
+    last_seen: float = 0.0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "kind": self.kind,
+            "model": self.model,
+            "resident": self.resident,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "last_load_ms": round(self.last_load_ms, 1),
+            "last_seen": self.last_seen,
+        }
+
+
+class ResidencyManager:
+    """Keeps the chat and embed models loaded in Ollama.
+
+    Every response is passed to ``observe``; a ``load_duration`` above
+    ``OLLAMA_LOAD_LOG_MS`` means Ollama had to load the model for that call,
+    which is logged as a cold load the first time and as an eviction after.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._models: dict[tuple[str, str], ModelResidency] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def snapshot(self) -> list[dict[str, object]]:
+        with self._lock:
+            return [state.to_dict() for state in self._models.values()]
+
+    def observe(self, kind: str, model: str, response: Any) -> None:
+        if not model:
+            return
+        load_ms = _duration_ms(response, "load_duration")
+        with self._lock:
+            state = self._models.get((kind, model))
+            if state is None:
+                state = ModelResidency(kind=kind, model=model)
+                self._models[(kind, model)] = state
+            state.last_seen = self._clock()
+            loaded = load_ms is not None and load_ms >= OLLAMA_LOAD_LOG_MS
+            was_resident = state.resident
+            state.resident = True
+            if not loaded:
+                return
+            state.loads += 1
+            state.last_load_ms = float(load_ms or 0.0)
+            if was_resident:
+                state.evictions += 1
+        if was_resident:
+            logger.warning(
+                "Ollama %s model %s was evicted and reloaded in %.0f ms.", kind, model, load_ms
+            )
+        else:
+            logger.info("Ollama loaded %s model %s in %.0f ms.", kind, model, load_ms)
+
+    def mark_unavailable(self, kind: str, model: str) -> None:
+        with self._lock:
+            state = self._models.get((kind, model))
+            if state is not None:
+                state.resident = False
+
+    def ping_chat(self, client: Any, model: str) -> None:
+        # An empty message list makes Ollama load the model without generating.
+        response = client.chat(model=model, messages=[], keep_alive=get_keep_alive())
+        self.observe(KIND_CHAT, model, response)
+
+    def ping_embed(self, model: str) -> None:
+        response = ollama.embed(model=model, input=WARMUP_TEXT, keep_alive=get_keep_alive())
+        self.observe(KIND_EMBED, model, response)
+
+    def ping(self, client: Any, chat_model: str, embed_model: str) -> None:
+        for kind, model, call in (
+            (KIND_CHAT, chat_model, lambda: self.ping_chat(client, chat_model)),
+            (KIND_EMBED, embed_model, lambda: self.ping_embed(embed_model)),
+        ):
+            if not model:
+                continue
+            try:
+                call()
+            except Exception as exc:
+                self.mark_unavailable(kind, model)
+                logger.warning("Failed to keep Ollama %s model %s loaded: %s", kind, model, exc)
+
+    async def warm(self, client: Any, chat_model: str, embed_model: str) -> None:
+        # On the LLM pool, so pings count against its limit and a not yet started one can be dropped.
+        await asyncio.gather(
+            executors.run(executors.LLM, self.ping, client, chat_model, ""),
+            executors.run(executors.LLM, self.ping, client, "", embed_model),
+        )
+
+    async def keep_warm(self, client: Any, models: ModelSource, *, slot: Optional[SlotFactory] = None) -> None:
+        """Warm the current models now, then re-ping them every ``OLLAMA_KEEPWARM_SEC``.
+
+        Each round runs inside ``slot()`` when given, so it can wait for or
+        be preempted by interactive turns (see ``scheduler.LlmScheduler``),
+        and its pings run on the LLM pool. A round the pool cannot admit is
+        skipped.
+        """
+        while True:
+            chat_model, embed_model = await asyncio.to_thread(models)
+            try:
+                async with slot() if slot is not None else contextlib.nullcontext():
+                    await self.warm(client, chat_model, embed_model)
+            except Preempted:
+                logger.info("Model warm-up yielded to a visitor turn.")
+            except executors.ExecutorSaturated:
+                logger.info("Model warm-up skipped; the LLM pool is busy.")
+            if OLLAMA_KEEPWARM_SEC <= 0:
+                return
+            await asyncio.sleep(OLLAMA_KEEPWARM_SEC)
+
+
+residency_manager = ResidencyManager()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Sequence
+
+from ..executors import LLM, ExecutorSaturated, get_executor
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class Route:
+    name: str
+    provider: str
+    model: str
+    api_base_url: str = ""
+    api_key: str = field(default="", repr=False)
+
+
+StreamFn = Callable[[Route], Iterator[str]]
+SubmitFn = Callable[..., concurrent.futures.Future]
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+@dataclass(slots=True)
+class RouteStats:
+    window: int
+    ttft: deque = field(init=False)
+    outcomes: deque = field(init=False)
+    last_error_at: Optional[float] = None
+    hedges: int = 0
+    wins: int = 0
+
+    def __post_init__(self) -> None:
+        self.ttft = deque(maxlen=self.window)
+        self.outcomes = deque(maxlen=self.window)
+
+    def record_success(self, ttft_sec: float) -> None:
+        self.ttft.append(ttft_sec)
+        self.outcomes.append(True)
+
+    def record_error(self, now: float) -> None:
+        self.outcomes.append(False)
+        self.last_error_at = now
+
+    def record_slow(self, elapsed_sec: float) -> None:
+        # A lost hedge never showed its first token; what it waited is a lower bound.
+        self.ttft.append(elapsed_sec)
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def median(self) -> float:
+        return _percentile(self.ttft, 0.5) if self.ttft else 0.0
+
+    def to_dict(self, healthy: bool) -> dict[str, object]:
+        return {
+            "healthy": healthy,
+            "samples": len(self.ttft),
+            "ttft_p50_ms": round(self.median() * 1000.0, 1),
+            "ttft_p90_ms": round(_percentile(self.ttft, 0.9) * 1000.0, 1) if self.ttft else 0.0,
+            "error_rate": round(self.error_rate(), 3),
+            "wins": self.wins,
+            "hedges": self.hedges,
+        }
+
+
+@dataclass(slots=True)
+class _Attempt:
+    route: Route
+    # Set when a worker actually sends the request, so executor queue time is never counted.
+    started: Optional[float] = None
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+
+class Router:
+    """Sends each request to the fastest healthy route, hedging slow starts.
+
+    Routes are ranked by median time to first token over the last ``window``
+    requests; a route with no samples yet ranks first so it gets measured. A
+    route whose error rate is above ``max_error_rate`` is skipped until
+    ``cooldown_sec`` after its last error. A route that fails, or shows no
+    token within the first-token timeout, counts as an error and hands over
+    to the next one. With ``hedge_percentile`` set and at least
+    ``min_samples`` samples, a second route is started when the first has not
+    produced a token by that percentile of its own TTFT; whichever streams
+    first wins, the other is told to stop and its wait so far is kept as a
+    slow sample.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = 20,
+        max_error_rate: float = 0.5,
+        cooldown_sec: float = 30.0,
+        hedge_percentile: float = 0.9,
+        min_samples: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window = max(1, int(window))
+        self.max_error_rate = float(max_error_rate)
+        self.cooldown_sec = float(cooldown_sec)
+        self.hedge_percentile = float(hedge_percentile)
+        self.min_samples = max(1, int(min_samples))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: dict[str, RouteStats] = {}
+
+    def _route_stats(self, route: Route) -> RouteStats:
+        stats = self._stats.get(route.name)
+        if stats is None:
+            stats = self._stats[route.name] = RouteStats(self.window)
+        return stats
+
+    def _healthy(self, stats: RouteStats) -> bool:
+        if stats.error_rate() <= self.max_error_rate or stats.last_error_at is None:
+            return True
+        return self._clock() - stats.last_error_at >= self.cooldown_sec
+
+    def rank(self, routes: Sequence[Route]) -> list[Route]:
+        with self._lock:
+            keyed = []
+            for position, route in enumerate(routes):
+                stats = self._route_stats(route)
+                keyed.append(((not self._healthy(stats), stats.median(), position), route))
+        return [route for _, route in sorted(keyed, key=lambda item: item[0])]
+
+    def hedge_delay(self, route: Route) -> Optional[float]:
+        if self.hedge_percentile <= 0:
+            return None
+        with self._lock:
+            stats = self._route_stats(route)
+            if len(stats.ttft) < self.min_samples:
+                return None
+            return _percentile(stats.ttft, self.hedge_percentile)
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        with self._lock:
+            return {name: stats.to_dict(self._healthy(stats)) for name, stats in self._stats.items()}
+
+    def _drive(self, attempt: _Attempt, stream: StreamFn, notify: Callable[[str, _Attempt, object], None]) -> None:
+        tokens: list[str] = []
+        iterator = None
+        if attempt.cancel.is_set():
+            return
+        notify("started", attempt, self._clock())
+        try:
+            iterator = stream(attempt.route)
+            for token in iterator:
+                if attempt.cancel.is_set():
+                    return
+                if not token:
+                    continue
+                if not tokens:
+                    notify("first", attempt, None)
+                tokens.append(token)
+            notify("done", attempt, "".join(tokens))
+        except Exception as exc:
+            notify("error", attempt, exc)
+        finally:
+            close = getattr(iterator, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    def _record(self, attempt: _Attempt, *, ok: bool, at: float) -> None:
+        with self._lock:
+            stats = self._route_stats(attempt.route)
+            if ok:
+                stats.record_success(at - attempt.started)
+                stats.wins += 1
+            else:
+                stats.record_error(at)
+
+    async def run(
+        self,
+        routes: Sequence[Route],
+        stream: StreamFn,
+        *,
+        first_token_timeout: float,
+        submit: Optional[SubmitFn] = None,
+    ) -> tuple[Route, str]:
+        """Returns the winning route and its full text.
+
+        Each attempted route runs ``stream`` as one job on ``submit`` (the
+        bounded LLM executor by default) and must yield text tokens. Only the
+        first token has a deadline; the caller bounds the whole reply. The
+        first-token deadline, hedge delay and TTFT samples are measured from
+        when a worker picks the attempt up, not from when it was queued. A
+        cancelled attempt stops at its next token, so a loser stuck before its
+        first byte keeps its worker until the backend answers or ``stream``
+        times out on its own.
+        """
+        if not routes:
+            raise ValueError("No LLM routes configured.")
+        submit = submit or get_executor(LLM).submit
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        pending = deque(self.rank(routes))
+        live: list[_Attempt] = []
+        winner: Optional[_Attempt] = None
+        last_error: Optional[BaseException] = None
+
+        def notify(kind: str, attempt: _Attempt, value: object) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, (kind, attempt, value))
+
+        def start() -> Optional[_Attempt]:
+            nonlocal last_error
+            while pending:
+                attempt = _Attempt(pending.popleft())
+                try:
+                    submit(self._drive, attempt, stream, notify)
+                except ExecutorSaturated as exc:
+                    last_error = exc
+                    logger.info("LLM route %s not started: %s", attempt.route.name, exc)
+                    return None
+                live.append(attempt)
+                return attempt
+            return None
+
+        def fail(attempt: _Attempt, exc: BaseException, now: float) -> None:
+            nonlocal last_error
+            attempt.cancel.set()
+            live.remove(attempt)
+            last_error = exc
+            self._record(attempt, ok=False, at=now)
+            logger.info("LLM route %s failed: %s", attempt.route.name, exc)
+
+        first = start()
+        if first is None:
+            raise last_error or RuntimeError("No LLM route could be started.")
+        delay = self.hedge_delay(first.route)
+        hedge_at: Optional[float] = None
+
+        try:
+            while True:
+                timeout = None
+                if winner is None:
+                    deadlines = [
+                        attempt.started + first_token_timeout for attempt in live if attempt.started is not None
+                    ]
+                    if hedge_at is not None and pending:
+                        deadlines.append(hedge_at)
+                    if deadlines:
+                        timeout = max(0.0, min(deadlines) - self._clock())
+                try:
+                    kind, attempt, value = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    now = self._clock()
+                    expired = [a for a in live if a.started is not None and now - a.started >= first_token_timeout]
+                    for attempt in expired:
+                        fail(attempt, TimeoutError(f"no first token within {first_token_timeout:g}s"), now)
+                    if hedge_at is not None and now >= hedge_at:
+                        hedge_at = None
+                        hedged = start() if live else None
+                        if hedged is not None:
+                            with self._lock:
+                                self._route_stats(first.route).hedges += 1
+                            logger.info(
+                                "No first token from %s after %.0f ms; hedging with %s.",
+                                first.route.name,
+                                (now - first.started) * 1000.0,
+                                hedged.route.name,
+                            )
+                    if not live and start() is None:
+                        raise TimeoutError("No LLM route produced a first token.") from last_error
+                    continue
+
+                if attempt not in live or (winner is not None and attempt is not winner):
+                    continue
+                if kind == "started":
+                    attempt.started = value
+                    if attempt is first and delay is not None:
+                        hedge_at = value + delay
+                    continue
+                now = self._clock()
+                if kind == "error":
+                    if winner is attempt:
+                        raise value
+                    fail(attempt, value, now)
+                    if not live:
+                        hedge_at = None
+                        if start() is None:
+                            raise value
+                    continue
+                if winner is None:
+                    winner = attempt
+                    self._record(attempt, ok=True, at=now)
+                    for other in live:
+                        if other is not attempt:
+                            other.cancel.set()
+                            if other.started is not None:
+                                with self._lock:
+                                    self._route_stats(other.route).record_slow(now - other.started)
+                if kind == "done":
+                    return attempt.route, value
+        finally:
+            # Covers the caller giving up (e.g. ``asyncio.wait_for``) mid-turn.
+            for attempt in live:
+                attempt.cancel.set()
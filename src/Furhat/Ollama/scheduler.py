@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE_DESKTOP = "interactive_desktop"
+INTERACTIVE_WEB = "interactive_web"
+BACKGROUND = "background"
+# Lower runs first; FIFO within a class.
+PRIORITIES = {INTERACTIVE_DESKTOP: 0, INTERACTIVE_WEB: 1, BACKGROUND: 2}
+
+
+def priority_for_channel(channel: str) -> str:
+    return INTERACTIVE_WEB if channel == "web" else INTERACTIVE_DESKTOP
+
+
+class Preempted(Exception):
+    """A background job gave up its slot to interactive work."""
+
+
+# Cancel message that marks a cancellation as our own preemption.
+_PREEMPT_MESSAGE = "furhat-llm-preempted"
+
+
+def _forget_own_cancel(task: Optional[asyncio.Task]) -> bool:
+    """Withdraws the preemption's cancel request; False if the task was also cancelled by someone else."""
+    uncancel = getattr(task, "uncancel", None)  # Python 3.11+; 3.10 keeps no cancel count.
+    return uncancel is None or uncancel() == 0
+
+
+@dataclass(slots=True)
+class _Ticket:
+    priority: str
+    enqueued: float
+    task: Optional[asyncio.Task] = None
+    future: Optional[asyncio.Future] = None
+    preempted: bool = False
+
+
+@dataclass(slots=True)
+class _ClassStats:
+    admitted: int = 0
+    preempted: int = 0
+    total_wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+
+    def to_dict(self, waiting: int, running: int) -> dict[str, object]:
+        mean = self.total_wait_sec / self.admitted if self.admitted else 0.0
+        return {
+            "waiting": waiting,
+            "running": running,
+            "admitted": self.admitted,
+            "preempted": self.preempted,
+            "mean_wait_ms": round(mean * 1000.0, 1),
+            "max_wait_ms": round(self.max_wait_sec * 1000.0, 1),
+        }
+
+
+class LlmScheduler:
+    """Hands out ``capacity`` LLM slots by priority class.
+
+    Interactive desktop turns go before web turns, which go before
+    background work such as model warm-ups. When interactive work has to
+    wait and ``preempt`` is set, one running background job is cancelled to
+    make room; inside ``slot`` it sees ``Preempted`` instead of a bare
+    cancellation. Must be used from a single event loop.
+
+    Preemption cancels the awaiting coroutine only. A blocking call already
+    running on an executor thread (e.g. a warm-up ping) runs to its end and
+    keeps that worker until then; keep background calls short.
+    """
+
+    def __init__(self, capacity: int, *, preempt: bool = True, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = max(1, int(capacity))
+        self.preempt = preempt
+        self._clock = clock
+        self._seq = itertools.count()
+        self._waiting: list[tuple[int, int, _Ticket]] = []
+        self._running: list[_Ticket] = []
+        self._stats = {name: _ClassStats() for name in PRIORITIES}
+
+    def _admit(self, ticket: _Ticket) -> None:
+        self._running.append(ticket)
+        stats = self._stats[ticket.priority]
+        waited = self._clock() - ticket.enqueued
+        stats.admitted += 1
+        stats.total_wait_sec += waited
+        stats.max_wait_sec = max(stats.max_wait_sec, waited)
+
+    def _grant(self) -> None:
+        while self._waiting and len(self._running) < self.capacity:
+            _, _, ticket = heapq.heappop(self._waiting)
+            assert ticket.future is not None
+            if ticket.future.done():
+                continue
+            self._admit(ticket)
+            ticket.future.set_result(None)
+
+    def _preempt_for(self, priority: str) -> None:
+        if not self.preempt or priority == BACKGROUND:
+            return
+        for ticket in reversed(self._running):
+            if ticket.priority == BACKGROUND and not ticket.preempted and ticket.task is not None:
+                ticket.preempted = True
+                self._stats[BACKGROUND].preempted += 1
+                logger.info("Preempting background LLM work for %s.", priority)
+                ticket.task.cancel(_PREEMPT_MESSAGE)
+                return
+
+    async def acquire(self, priority: str) -> _Ticket:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM priority '{priority}'.")
+        ticket = _Ticket(priority, self._clock(), task=asyncio.current_task())
+        if len(self._running) < self.capacity and not self._waiting:
+            self._admit(ticket)
+            return ticket
+        ticket.future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (PRIORITIES[priority], next(self._seq), ticket))
+        self._preempt_for(priority)
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                # Granted in the same tick as the cancellation: hand the slot on.
+                self.release(ticket)
+            else:
+                ticket.future.cancel()
+            raise
+        return ticket
+
+    def release(self, ticket: _Ticket) -> None:
+        if ticket in self._running:
+            self._running.remove(ticket)
+        self._grant()
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        ticket = await self.acquire(priority)
+        try:
+            yield
+        except asyncio.CancelledError as exc:
+            if ticket.preempted and _PREEMPT_MESSAGE in exc.args and _forget_own_cancel(ticket.task):
+                raise Preempted(f"{priority} LLM work was preempted") from None
+            raise
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        waiting = [ticket.priority for _, _, ticket in self._waiting if ticket.future and not ticket.future.done()]
+        running = [ticket.priority for ticket in self._running]
+        return {
+            name: stats.to_dict(waiting.count(name), running.count(name)) for name, stats in self._stats.items()
+        }
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import operator
+import random
+import time
+from array import array
+from typing import Mapping, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+KMEANS_ITERATIONS = 6
+# k-means trains on a sample of this many points per list instead of every chunk.
+TRAIN_POINTS_PER_LIST = 32
+
+
+def _dot(left: Sequence[float], right: Sequence[float]) -> float:
+    return sum(map(operator.mul, left, right))
+
+
+def _normalized(vector: Sequence[float]) -> list[float]:
+    norm = math.sqrt(_dot(vector, vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _nearest(vector: Sequence[float], centroids: Sequence[Sequence[float]]) -> int:
+    best, best_score = 0, -math.inf
+    for idx, centroid in enumerate(centroids):
+        score = _dot(vector, centroid)
+        if score > best_score:
+            best, best_score = idx, score
+    return best
+
+
+def _seed_centroids(sample: Sequence[Sequence[float]], nlist: int, rng: random.Random) -> list[list[float]]:
+    # k-means++ seeding on cosine distance keeps two seeds from landing in one cluster.
+    centroids = [list(rng.choice(sample))]
+    best = [_dot(vector, centroids[0]) for vector in sample]
+    while len(centroids) < nlist:
+        weights = [max(0.0, 1.0 - score) ** 2 for score in best]
+        if not any(weights):
+            centroids.append(list(rng.choice(sample)))
+            continue
+        chosen = rng.choices(range(len(sample)), weights=weights)[0]
+        centroids.append(list(sample[chosen]))
+        best = [max(score, _dot(vector, sample[chosen])) for score, vector in zip(best, sample)]
+    return centroids
+
+
+def default_nlist(count: int) -> int:
+    return max(1, int(round(math.sqrt(count))))
+
+
+class IvfIndex:
+    """Inverted-file ANN index over cosine similarity.
+
+    Vectors are clustered with spherical k-means; each list holds the ids of
+    the chunks nearest its centroid, stored CSR-style in ``offsets``/``ids``.
+    A query scores only the chunks in its ``nprobe`` nearest lists, so
+    ``nprobe`` trades recall for latency.
+    """
+
+    def __init__(
+        self,
+        *,
+        centroids: Sequence[Sequence[float]],
+        offsets: Sequence[int],
+        ids: Sequence[int],
+    ) -> None:
+        self.centroids = [list(centroid) for centroid in centroids]
+        self.offsets = array("I", offsets)
+        self.ids = array("I", ids)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        vectors: Sequence[Sequence[float]],
+        *,
+        nlist: int = 0,
+        iterations: int = KMEANS_ITERATIONS,
+        seed: int = 0,
+    ) -> "IvfIndex":
+        started = time.perf_counter()
+        count = len(vectors)
+        nlist = min(count, nlist or default_nlist(count))
+        rng = random.Random(seed)
+        sample_ids = rng.sample(range(count), min(count, nlist * TRAIN_POINTS_PER_LIST))
+        sample = [_normalized(vectors[idx]) for idx in sample_ids]
+        centroids = _seed_centroids(sample, nlist, rng)
+
+        for _ in range(max(1, iterations)):
+            sums = [[0.0] * len(centroids[0]) for _ in centroids]
+            sizes = [0] * nlist
+            for vector in sample:
+                target = _nearest(vector, centroids)
+                sizes[target] += 1
+                sums[target] = list(map(operator.add, sums[target], vector))
+            for idx in range(nlist):
+                # An empty list is reseeded so every centroid keeps covering data.
+                centroids[idx] = _normalized(sums[idx]) if sizes[idx] else list(rng.choice(sample))
+
+        lists: list[list[int]] = [[] for _ in range(nlist)]
+        for idx, vector in enumerate(vectors):
+            lists[_nearest(vector, centroids)].append(idx)
+        offsets = [0]
+        ids: list[int] = []
+        for members in lists:
+            ids.extend(members)
+            offsets.append(len(ids))
+        logger.info(
+            "Built IVF index: %s vectors in %s lists (%.1f s).",
+            count,
+            nlist,
+            time.perf_counter() - started,
+        )
+        return cls(centroids=centroids, offsets=offsets, ids=ids)
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object]) -> "IvfIndex":
+        return cls(
+            centroids=payload["centroids"],  # type: ignore[arg-type]
+            offsets=payload["offsets"],  # type: ignore[arg-type]
+            ids=payload["ids"],  # type: ignore[arg-type]
+        )
+
+    def to_payload(self) -> dict[str, object]:
+        return {"centroids": self.centroids, "offsets": self.offsets, "ids": self.ids}
+
+    def probe(self, query_vec: Sequence[float], nprobe: int) -> list[int]:
+        nearest = heapq.nlargest(
+            max(1, nprobe),
+            range(self.nlist),
+            key=lambda idx: _dot(query_vec, self.centroids[idx]),
+        )
+        candidates: list[int] = []
+        for idx in nearest:
+            candidates.extend(self.ids[self.offsets[idx] : self.offsets[idx + 1]])
+        return candidates
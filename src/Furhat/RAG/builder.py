@@ -1,27 +1,60 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import math
+import os
 import pickle
-import re
-from dataclasses import asdict, dataclass
+import tempfile
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Iterable, List
+from typing import List
 
-from .config import CHUNK_OVERLAP, CHUNK_SIZE, EMBED_MODEL
-from .embeddings import embed_texts
+from . import chunking, embeddings, vectors as vector_store
+from .ann import IvfIndex
+from .config import (
+    ANN_MIN_CHUNKS,
+    ANN_NLIST,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    EMBED_BACKEND,
+    EMBED_MODEL,
+    VECTOR_STORAGE,
+)
+from .lexical import InvertedIndex
 
 
 logger = logging.getLogger(__name__)
 
 
-def set_build_settings(model: str, chunk_size: int, chunk_overlap: int) -> None:
+def set_build_settings(
+    model: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    *,
+    backend: str | None = None,
+    ann_nlist: int | None = None,
+    ann_min_chunks: int | None = None,
+    vector_storage: str | None = None,
+) -> None:
     if chunk_size <= 0:
         raise ValueError("Chunk size must be > 0.")
     if chunk_overlap < 0:
         raise ValueError("Chunk overlap must be >= 0.")
-    global EMBED_MODEL, CHUNK_SIZE, CHUNK_OVERLAP
+    if ann_nlist is not None and ann_nlist < 0:
+        raise ValueError("ANN list count must be >= 0.")
+    if ann_min_chunks is not None and ann_min_chunks < 0:
+        raise ValueError("ANN minimum chunk count must be >= 0.")
+    global EMBED_BACKEND, EMBED_MODEL, CHUNK_SIZE, CHUNK_OVERLAP, ANN_NLIST, ANN_MIN_CHUNKS, VECTOR_STORAGE
+    if backend is not None:
+        EMBED_BACKEND = embeddings.normalize_backend(backend)
+    if vector_storage is not None:
+        VECTOR_STORAGE = vector_store.normalize_storage(vector_storage)
+    if ann_nlist is not None:
+        ANN_NLIST = int(ann_nlist)
+    if ann_min_chunks is not None:
+        ANN_MIN_CHUNKS = int(ann_min_chunks)
     EMBED_MODEL = model.strip() or EMBED_MODEL
     CHUNK_SIZE = int(chunk_size)
     CHUNK_OVERLAP = int(chunk_overlap)
@@ -34,26 +67,8 @@ class RagEntry:
     chunk_id: int
     start: int
     end: int
-
-
-def clean_text(text: str) -> str:
-    text = re.sub(r"\\s+", " ", text)
-    return text.strip()
-
-
-def chunk_text(text: str, size: int, overlap: int) -> Iterable[tuple[int, int, str]]:
-    if size <= 0:
-        return
-    if overlap >= size:
-        overlap = max(0, size // 5)
-    step = max(1, size - overlap)
-    for start in range(0, len(text), step):
-        end = min(len(text), start + size)
-        chunk = text[start:end]
-        if chunk.strip():
-            yield start, end, chunk
-        if end >= len(text):
-            break
+    title: str = ""
+    section: str = ""
 
 
 def load_txt_files(root: Path) -> List[tuple[str, str]]:
@@ -68,63 +83,342 @@ def load_txt_files(root: Path) -> List[tuple[str, str]]:
     return items
 
 
+def chunk_file(rel: str, content: str, size: int, overlap: int) -> List[RagEntry]:
+    return [
+        RagEntry(
+            text=chunk.text,
+            source=rel,
+            chunk_id=chunk_id,
+            start=chunk.start,
+            end=chunk.end,
+            title=chunk.title,
+            section=chunk.section,
+        )
+        for chunk_id, chunk in enumerate(
+            chunking.chunk_document(content, source=rel, max_tokens=size, overlap_tokens=overlap)
+        )
+    ]
+
+
 def build_entries(data_dir: Path, size: int, overlap: int) -> List[RagEntry]:
     entries: List[RagEntry] = []
     for rel, content in load_txt_files(data_dir):
-        cleaned = clean_text(content)
-        chunk_id = 0
-        for start, end, chunk in chunk_text(cleaned, size=size, overlap=overlap):
-            entries.append(
-                RagEntry(
-                    text=chunk,
-                    source=rel,
-                    chunk_id=chunk_id,
-                    start=start,
-                    end=end,
-                )
-            )
-            chunk_id += 1
+        entries.extend(chunk_file(rel, content, size, overlap))
     return entries
 
 
+def _digest(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def index_manifest_path(output: Path) -> Path:
+    return output.with_suffix(".json")
+
+
+def index_checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_index_manifest(output: Path) -> dict[str, object]:
+    try:
+        data = json.loads(index_manifest_path(output).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def index_is_published(output: Path) -> bool:
+    """True when ``output`` matches the checksum its manifest was written with.
+
+    The manifest is replaced last, so a mismatch means a build is still in
+    progress (or was interrupted). Manifests from before checksums were
+    recorded are trusted as-is.
+    """
+    if not output.exists():
+        return False
+    checksum = read_index_manifest(output).get("checksum")
+    if not checksum:
+        return True
+    try:
+        return index_checksum(output) == checksum
+    except OSError:
+        return False
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    fd, temp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, target)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass(slots=True)
+class IndexUpdate:
+    entries: int
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    embedded: int = 0
+    full_rebuild: bool = False
+
+    @property
+    def written(self) -> bool:
+        return self.full_rebuild or bool(self.added or self.changed or self.removed)
+
+
+def _resolve(
+    model: str | None,
+    chunk_size: int | None,
+    chunk_overlap: int | None,
+    backend: str | None,
+    vector_storage: str | None,
+) -> tuple[embeddings.EmbeddingBackend, int, int, str]:
+    storage = vector_store.normalize_storage(vector_storage or VECTOR_STORAGE)
+    chunk_size = CHUNK_SIZE if chunk_size is None else chunk_size
+    chunk_overlap = CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+    embedder = embeddings.create_embedder(backend or EMBED_BACKEND, model or EMBED_MODEL)
+    return embedder, chunk_size, chunk_overlap, storage
+
+
+def _contextual(entry: RagEntry) -> str:
+    return chunking.contextual_text(entry.text, entry.title, entry.section)
+
+
+def _embed(embedder: embeddings.EmbeddingBackend, entries: List[RagEntry]) -> List[List[float]]:
+    logger.info("Embedding %s chunks with %s backend (%s)", len(entries), embedder.name, embedder.model)
+    return embedder.embed_documents([_contextual(entry) for entry in entries])
+
+
+def _write_index(
+    output: Path,
+    *,
+    data_dir: Path,
+    embedder: embeddings.EmbeddingBackend,
+    entries: List[RagEntry],
+    vectors: List[List[float]],
+    storage: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    files: dict[str, str],
+) -> None:
+    norms = [math.sqrt(sum(v * v for v in vec)) for vec in vectors]
+    payload = {
+        "model": embedder.model,
+        "backend": embedder.to_payload(),
+        "entries": [asdict(entry) for entry in entries],
+        "vectors": vector_store.create_store(vectors, storage).to_payload(),
+        "norms": norms,
+        "lexical": InvertedIndex.build(_contextual(entry) for entry in entries).to_payload(),
+    }
+    if ANN_MIN_CHUNKS and len(vectors) >= ANN_MIN_CHUNKS:
+        payload["ann"] = IvfIndex.build(vectors, nlist=ANN_NLIST).to_payload()
+
+    # Sidecar, index, manifest: each is renamed into place, and readers treat
+    # the index as published once the manifest checksum matches it. The
+    # sidecar is named after its build, so the index only ever points at its own.
+    output.parent.mkdir(parents=True, exist_ok=True)
+    sidecar = None
+    if storage == vector_store.STORAGE_INT8:
+        exact = vector_store.exact_sidecar_bytes(vectors)
+        build_id = vector_store.exact_build_id(exact)
+        payload["vectors"]["exact_build"] = build_id  # type: ignore[index]
+        sidecar = vector_store.exact_sidecar_path(output, build_id)
+        _write_atomic(sidecar, exact)
+    data = pickle.dumps(payload)
+    _write_atomic(output, data)
+    manifest = {
+        "data_dir": str(data_dir),
+        "entries": len(entries),
+        "model": embedder.model,
+        "backend": embedder.name,
+        "vector_storage": storage,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "chunker": chunking.CHUNKER,
+        "checksum": hashlib.sha256(data).hexdigest(),
+        "files": files,
+    }
+    _write_atomic(index_manifest_path(output), json.dumps(manifest, indent=2).encode("utf-8"))
+    for stale in vector_store.stale_exact_sidecars(output, keep=sidecar):
+        try:
+            stale.unlink()
+        except OSError as exc:
+            # Windows keeps a file that a running reader still maps; the next build retries.
+            logger.debug("Could not remove old sidecar %s: %s", stale, exc)
+
+
 def build_index(
     *,
     data_dir: Path,
     output: Path,
-    model: str = EMBED_MODEL,
-    chunk_size: int = CHUNK_SIZE,
-    chunk_overlap: int = CHUNK_OVERLAP,
+    model: str | None = None,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+    backend: str | None = None,
+    vector_storage: str | None = None,
 ) -> int:
-    output.parent.mkdir(parents=True, exist_ok=True)
-    entries = build_entries(data_dir, size=chunk_size, overlap=chunk_overlap)
+    embedder, chunk_size, chunk_overlap, storage = _resolve(
+        model, chunk_size, chunk_overlap, backend, vector_storage
+    )
+    files = load_txt_files(data_dir)
+    entries = [entry for rel, content in files for entry in chunk_file(rel, content, chunk_size, chunk_overlap)]
     if not entries:
         logger.warning("No .txt files found in %s", data_dir)
         return 0
 
-    logger.info("Embedding %s chunks with model %s", len(entries), model)
-    embeddings = embed_texts([entry.text for entry in entries], model)
-    norms = [math.sqrt(sum(v * v for v in vec)) for vec in embeddings]
+    _write_index(
+        output,
+        data_dir=data_dir,
+        embedder=embedder,
+        entries=entries,
+        vectors=_embed(embedder, entries),
+        storage=storage,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        files={rel: _digest(content) for rel, content in files},
+    )
+    return len(entries)
 
-    payload = {
-        "model": model,
-        "entries": [asdict(entry) for entry in entries],
-        "embeddings": embeddings,
-        "norms": norms,
-    }
 
-    output.write_bytes(pickle.dumps(payload))
-    manifest = output.with_suffix(".json")
-    manifest.write_text(
-        json.dumps(
-            {
-                "data_dir": str(data_dir),
-                "entries": len(entries),
-                "model": model,
-                "chunk_size": chunk_size,
-                "chunk_overlap": chunk_overlap,
-            },
-            indent=2,
-        ),
-        encoding="utf-8",
+def _previous_rows(output: Path) -> dict[str, List[tuple[RagEntry, List[float]]]]:
+    payload = pickle.loads(output.read_bytes())
+    store = vector_store.store_from_payload(payload, output)
+    exact = isinstance(store, vector_store.Int8Store) and store.has_exact
+    rows: dict[str, List[tuple[RagEntry, List[float]]]] = {}
+    try:
+        for idx, item in enumerate(payload.get("entries", [])):
+            vector = store.exact_row(idx).tolist() if exact else store[idx]  # type: ignore[union-attr]
+            entry = RagEntry(**item)
+            rows.setdefault(entry.source, []).append((entry, vector))
+    finally:
+        if isinstance(store, vector_store.Int8Store):
+            store.close()
+    return rows
+
+
+def update_index(
+    *,
+    data_dir: Path,
+    output: Path,
+    model: str | None = None,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+    backend: str | None = None,
+    vector_storage: str | None = None,
+) -> IndexUpdate:
+    """Bring ``output`` in line with ``data_dir``, re-embedding only changed files.
+
+    Files are compared by content hash against the manifest of the last build.
+    A different model, backend or chunking, a corpus-fitted backend, or a
+    missing or unpublished index falls back to a full rebuild. Once every file
+    is gone an empty index is written, so readers stop serving the old chunks.
+    """
+    embedder, chunk_size, chunk_overlap, storage = _resolve(
+        model, chunk_size, chunk_overlap, backend, vector_storage
+    )
+    contents = dict(load_txt_files(data_dir))
+    digests = {rel: _digest(content) for rel, content in contents.items()}
+    manifest = read_index_manifest(output)
+    previous = manifest.get("files")
+    previous = previous if isinstance(previous, dict) else {}
+    added = sorted(set(digests) - set(previous))
+    removed = sorted(set(previous) - set(digests))
+    changed = sorted(rel for rel in digests if rel in previous and previous[rel] != digests[rel])
+
+    compatible = (
+        isinstance(manifest.get("files"), dict)
+        and not embedder.fits_corpus
+        and manifest.get("model") == embedder.model
+        and manifest.get("backend") == embedder.name
+        and manifest.get("chunk_size") == chunk_size
+        and manifest.get("chunk_overlap") == chunk_overlap
+        and manifest.get("chunker") == chunking.CHUNKER
+        and index_is_published(output)
+    )
+    if compatible and not (added or changed or removed) and manifest.get("vector_storage") == storage:
+        return IndexUpdate(entries=int(manifest.get("entries", 0) or 0))
+    if not compatible:
+        entries = build_index(
+            data_dir=data_dir,
+            output=output,
+            model=embedder.model,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            backend=embedder.name,
+            vector_storage=storage,
+        )
+        if not entries and output.exists() and manifest.get("entries") != 0:
+            _write_index(
+                output,
+                data_dir=data_dir,
+                embedder=embedder,
+                entries=[],
+                vectors=[],
+                storage=storage,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                files=digests,
+            )
+            return IndexUpdate(entries=0, added=added, changed=changed, removed=removed, full_rebuild=True)
+        return IndexUpdate(
+            entries=entries,
+            added=added,
+            changed=changed,
+            removed=removed,
+            embedded=entries,
+            full_rebuild=bool(entries),
+        )
+
+    kept = _previous_rows(output)
+    for rel in changed + removed:
+        kept.pop(rel, None)
+    fresh = [
+        entry
+        for rel in added + changed
+        for entry in chunk_file(rel, contents[rel], chunk_size, chunk_overlap)
+    ]
+    fresh_vectors = _embed(embedder, fresh) if fresh else []
+    for entry, vector in zip(fresh, fresh_vectors):
+        kept.setdefault(entry.source, []).append((entry, vector))
+    rows = [row for rel in sorted(kept) for row in kept[rel]]
+    if not rows:
+        logger.warning("No .txt files left in %s; writing an empty index.", data_dir)
+
+    _write_index(
+        output,
+        data_dir=data_dir,
+        embedder=embedder,
+        entries=[entry for entry, _ in rows],
+        vectors=[vector for _, vector in rows],
+        storage=storage,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        files=digests,
+    )
+    logger.info(
+        "Updated RAG index: %s added, %s changed, %s removed (%s chunks embedded).",
+        len(added),
+        len(changed),
+        len(removed),
+        len(fresh),
+    )
+    return IndexUpdate(
+        entries=len(rows),
+        added=added,
+        changed=changed,
+        removed=removed,
+        embedded=len(fresh),
     )
-    return len(entries)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from .chunking import collapse_whitespace
+
+
+V = TypeVar("V")
+
+
+def normalize_query(query: str) -> str:
+    return collapse_whitespace(query).casefold()
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU whose entries also expire ``ttl`` seconds after being stored.
+
+    Bounded by entry count; ``capacity`` 0 disables it. Hits and misses are
+    counted for diagnostics.
+    """
+
+    def __init__(self, capacity: int, ttl: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = max(0, int(capacity))
+        self.ttl = float(ttl)
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and self.ttl > 0 and self._clock() - item[0] > self.ttl:
+                del self._entries[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: Hashable, value: V) -> None:
+        if not self.capacity:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def resize(self, capacity: int, ttl: float | None = None) -> None:
+        with self._lock:
+            self.capacity = max(0, int(capacity))
+            if ttl is not None:
+                self.ttl = float(ttl)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
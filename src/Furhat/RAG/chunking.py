@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Iterator, List, Sequence
+
+
+# Words and punctuation marks; close to what BPE tokenizers produce for prose.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_MD_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)[\s#]*$")
+_RULE_RE = re.compile(r"^([=\-*_~#])\1{2,}$")
+_LIST_RE = re.compile(r"^([-*+•▪◦]|\d{1,3}[.)])\s")
+# A sentence ends at terminal punctuation (plus closing quotes or brackets) or a line break.
+_BOUNDARY_RE = re.compile(r"(?<=[.!?…])[\"'”’)\]]*[ \t]+|[ \t]*\n\s*")
+_ABBREVIATIONS = {"e.g.", "i.e.", "etc.", "vs.", "mr.", "mrs.", "ms.", "dr.", "st.", "no.", "approx.", "ca."}
+
+# Plain-text headings nest below every markdown level.
+_PLAIN_HEADING_LEVEL = 7
+SECTION_SEPARATOR = " > "
+# Recorded in index manifests; bump when chunk boundaries change.
+CHUNKER = "structured-1"
+
+
+def estimate_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+def collapse_whitespace(text: str) -> str:
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def contextual_text(text: str, title: str = "", section: str = "") -> str:
+    """Chunk text led by its title and heading path, so it can be matched on its own."""
+    context = [part for part in (title, *section.split(SECTION_SEPARATOR)) if part and part not in text]
+    return f"{SECTION_SEPARATOR.join(context)}\n{text}" if context else text
+
+
+@dataclass(slots=True)
+class Chunk:
+    text: str
+    start: int
+    end: int
+    title: str = ""
+    headings: tuple[str, ...] = ()
+
+    @property
+    def section(self) -> str:
+        return SECTION_SEPARATOR.join(self.headings)
+
+
+@dataclass(slots=True)
+class _Unit:
+    text: str
+    start: int
+    end: int
+    tokens: int
+    path: tuple[str, ...]
+    heading: bool = False
+
+
+def _looks_like_heading(line: str) -> bool:
+    if len(line) > 80 or len(line.split()) > 10 or line[-1] in ".!?,;:" or _LIST_RE.match(line):
+        return False
+    letters = sum(ch.isalpha() for ch in line)
+    return letters * 2 >= len(line.replace(" ", ""))
+
+
+def _split_long(text: str, start: int, path: tuple[str, ...], max_tokens: int) -> Iterator[_Unit]:
+    tokens = list(_TOKEN_RE.finditer(text))
+    for first in range(0, len(tokens), max_tokens):
+        window = tokens[first : first + max_tokens]
+        lo, hi = window[0].start(), window[-1].end()
+        yield _Unit(collapse_whitespace(text[lo:hi]), start + lo, start + hi, len(window), path)
+
+
+def _sentences(text: str, start: int, end: int, path: tuple[str, ...], max_tokens: int) -> Iterator[_Unit]:
+    block = text[start:end]
+    spans: list[list[int]] = []
+    cursor = 0
+    for match in _BOUNDARY_RE.finditer(block):
+        if match.start() > cursor:
+            spans.append([cursor, match.start()])
+        cursor = match.end()
+    if cursor < len(block):
+        spans.append([cursor, len(block)])
+
+    merged: list[list[int]] = []
+    for span in spans:
+        piece = block[span[0] : span[1]]
+        if merged:
+            previous = block[merged[-1][0] : merged[-1][1]]
+            last_word = previous.rsplit(None, 1)[-1].casefold()
+            # Hard-wrapped lines and abbreviations do not end a sentence.
+            wrapped = previous[-1] not in ".!?…:" and not _LIST_RE.match(piece)
+            if piece[0].islower() or wrapped or last_word in _ABBREVIATIONS:
+                merged[-1][1] = span[1]
+                continue
+        merged.append(span)
+
+    for lo, hi in merged:
+        sentence = collapse_whitespace(block[lo:hi])
+        tokens = estimate_tokens(sentence)
+        if tokens > max_tokens:
+            yield from _split_long(block[lo:hi], start + lo, path, max_tokens)
+        elif tokens:
+            yield _Unit(sentence, start + lo, start + hi, tokens, path)
+
+
+def _parse(text: str, max_tokens: int) -> tuple[str, List[_Unit]]:
+    lines: list[tuple[int, int, str]] = []
+    offset = 0
+    for raw in text.splitlines(keepends=True):
+        stripped = raw.strip()
+        lead = len(raw) - len(raw.lstrip())
+        lines.append((offset + lead, offset + lead + len(stripped), stripped))
+        offset += len(raw)
+
+    title = ""
+    stack: list[tuple[int, str]] = []
+    units: List[_Unit] = []
+    paragraph: list[tuple[int, int]] = []
+
+    def path() -> tuple[str, ...]:
+        return tuple(name for _, name in stack)
+
+    def flush() -> None:
+        if paragraph:
+            units.extend(_sentences(text, paragraph[0][0], paragraph[-1][1], path(), max_tokens))
+            paragraph.clear()
+
+    def push(level: int, name: str, start: int, end: int) -> None:
+        nonlocal title
+        flush()
+        name = collapse_whitespace(name)
+        if level < _PLAIN_HEADING_LEVEL:
+            title = title or name
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, name))
+        units.append(_Unit(name, start, end, estimate_tokens(name), path(), heading=True))
+
+    idx = 0
+    while idx < len(lines):
+        start, end, line = lines[idx]
+        following = lines[idx + 1][2] if idx + 1 < len(lines) else ""
+        if not line:
+            flush()
+        elif match := _MD_HEADING_RE.match(line):
+            push(len(match.group(1)), match.group(2), start, end)
+        elif _RULE_RE.match(line):
+            after = lines[idx + 2][2] if idx + 2 < len(lines) else ""
+            if following and len(following) <= 100 and _RULE_RE.match(after):
+                # ===== / TITLE / ===== banner
+                push(1, following, lines[idx + 1][0], lines[idx + 1][1])
+                idx += 2
+            else:
+                flush()
+        elif not paragraph and following[:3] in {"===", "---"} and _RULE_RE.match(following):
+            push(1 if following[0] == "=" else 2, line, start, end)
+            idx += 1
+        elif (
+            not paragraph
+            and following
+            and (idx == 0 or not lines[idx - 1][2])
+            and _looks_like_heading(line)
+        ):
+            push(_PLAIN_HEADING_LEVEL, line, start, end)
+        else:
+            paragraph.append((start, end))
+        idx += 1
+    flush()
+    first = next((line for _, _, line in lines if line), "")
+    if match := _MD_HEADING_RE.match(first):
+        first = match.group(2)
+    if first and not _RULE_RE.match(first) and _looks_like_heading(first):
+        title = collapse_whitespace(first)
+    return title, units
+
+
+def _common_prefix(paths: Sequence[tuple[str, ...]]) -> tuple[str, ...]:
+    prefix = paths[0]
+    for other in paths[1:]:
+        size = 0
+        while size < min(len(prefix), len(other)) and prefix[size] == other[size]:
+            size += 1
+        prefix = prefix[:size]
+    return prefix
+
+
+def _render(units: Sequence[_Unit], title: str) -> Chunk:
+    parts: list[str] = []
+    for position, unit in enumerate(units):
+        if position:
+            parts.append("\n" if unit.heading or units[position - 1].heading else " ")
+        parts.append(unit.text)
+    return Chunk(
+        text="".join(parts),
+        start=units[0].start,
+        end=units[-1].end,
+        title=title,
+        headings=_common_prefix([unit.path for unit in units]),
+    )
+
+
+def title_from_source(source: str) -> str:
+    # Downloaded sources are named "<nn>_<hash>_<name>.txt"; keep only the name words.
+    words = re.split(r"[\s_\-.]+", PurePath(source).stem)
+    return " ".join(word for word in words if word and not re.fullmatch(r"\d+|[0-9a-f]{8}", word))
+
+
+def chunk_document(
+    text: str,
+    *,
+    source: str = "",
+    max_tokens: int = 220,
+    overlap_tokens: int = 30,
+) -> List[Chunk]:
+    """Split ``text`` into chunks of at most ``max_tokens`` approximate tokens.
+
+    Headings (markdown, underlined, ``=====`` banners and short standalone
+    lines) and blank-line paragraphs are parsed first, then paragraphs are
+    split into sentences and packed greedily. A chunk only crosses a heading
+    once it is a quarter full, so sections stay together. Up to
+    ``overlap_tokens`` of trailing sentences are repeated at the start of the
+    next chunk within the same section.
+    """
+    if max_tokens <= 0:
+        raise ValueError("Chunk size must be > 0.")
+    if overlap_tokens < 0:
+        raise ValueError("Chunk overlap must be >= 0.")
+    if overlap_tokens >= max_tokens:
+        overlap_tokens = max_tokens // 5
+    title, units = _parse(text, max_tokens)
+    title = title or title_from_source(source)
+
+    chunks: List[Chunk] = []
+    current: List[_Unit] = []
+    tokens = 0
+    for unit in units:
+        # Headings always travel with the text that follows them.
+        full = tokens + unit.tokens > max_tokens and not all(item.heading for item in current)
+        new_section = current and unit.heading and tokens * 4 >= max_tokens
+        if full or new_section:
+            chunks.append(_render(current, title))
+            carry: List[_Unit] = []
+            if full and not unit.heading:
+                budget = overlap_tokens
+                for previous in reversed(current[1:]):
+                    if previous.heading or previous.path != unit.path or previous.tokens > budget:
+                        break
+                    carry.insert(0, previous)
+                    budget -= previous.tokens
+            current, tokens = carry, sum(item.tokens for item in carry)
+        current.append(unit)
+        tokens += unit.tokens
+    if current and not all(unit.heading for unit in current):
+        chunks.append(_render(current, title))
+    return chunks
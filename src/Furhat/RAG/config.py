@@ -4,12 +4,47 @@ import os
 from pathlib import Path
 
 from .. import paths
+from ..settings_store import chunk_tokens_from_env
+
+
+def _parse_weights(spec: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            weights[name.strip()] = float(value)
+    return weights
 
 
 DATA_DIR = Path(os.getenv("RAG_DATA_DIR", paths.get_data_root()))
 INDEX_PATH = Path(os.getenv("RAG_INDEX_PATH", DATA_DIR / "rag_index.pkl"))
+EVENT_INDEX_PATH = os.getenv("RAG_EVENT_INDEX_PATH", "")
+INDEX_WEIGHTS = _parse_weights(os.getenv("RAG_INDEX_WEIGHTS", "event=1.2,character=1.0,global=0.8"))
+RETRIEVAL_BUDGET_MS = float(os.getenv("RAG_RETRIEVAL_BUDGET_MS", "500"))
+INDEX_CACHE_SIZE = int(os.getenv("RAG_INDEX_CACHE_SIZE", "4"))
+INDEX_WATCH_SEC = float(os.getenv("RAG_INDEX_WATCH_SEC", "2"))
+CORPUS_WATCH_SEC = float(os.getenv("RAG_CORPUS_WATCH_SEC", "0"))
 EMBED_MODEL = os.getenv("RAG_EMBED_MODEL", "nomic-embed-text")
+EMBED_BACKEND = os.getenv("RAG_EMBED_BACKEND", "ollama")
 TOP_K = int(os.getenv("RAG_TOP_K", "4"))
+# A negative floor uses the embedding backend's own (see EmbeddingBackend.min_similarity).
+MIN_SIMILARITY = float(os.getenv("RAG_MIN_SIMILARITY", "-1"))
+RELATIVE_SIMILARITY = float(os.getenv("RAG_RELATIVE_SIMILARITY", "0.5"))
+# 1 ranks by relevance alone; lower values trade relevance for coverage.
+MMR_LAMBDA = float(os.getenv("RAG_MMR_LAMBDA", "1"))
+MMR_CANDIDATES = int(os.getenv("RAG_MMR_CANDIDATES", "20"))
+QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "256"))
+QUERY_CACHE_TTL_SEC = float(os.getenv("RAG_QUERY_CACHE_TTL_SEC", "600"))
 MAX_CONTEXT_CHARS = int(os.getenv("RAG_MAX_CONTEXT_CHARS", "3200"))
-CHUNK_SIZE = int(os.getenv("RAG_CHUNK_SIZE", "900"))
-CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "180"))
+# Chunk size and overlap are in approximate tokens (words and punctuation marks). The older
+# RAG_CHUNK_SIZE / RAG_CHUNK_OVERLAP counted characters and are converted with a warning.
+CHUNK_SIZE = chunk_tokens_from_env("RAG_CHUNK_TOKENS", "RAG_CHUNK_SIZE", 220, minimum=1)
+CHUNK_OVERLAP = chunk_tokens_from_env("RAG_CHUNK_OVERLAP_TOKENS", "RAG_CHUNK_OVERLAP", 30)
+HYBRID_SEARCH = os.getenv("RAG_HYBRID", "1").lower() in {"1", "true", "yes", "y", "on"}
+RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+RRF_CANDIDATES = int(os.getenv("RAG_RRF_CANDIDATES", "20"))
+ANN_MIN_CHUNKS = int(os.getenv("RAG_ANN_MIN_CHUNKS", "2000"))
+ANN_NLIST = int(os.getenv("RAG_ANN_NLIST", "0"))
+ANN_NPROBE = int(os.getenv("RAG_ANN_NPROBE", "8"))
+VECTOR_STORAGE = os.getenv("RAG_VECTOR_STORAGE", "float32")
+RESCORE_CANDIDATES = int(os.getenv("RAG_RESCORE_CANDIDATES", "16"))
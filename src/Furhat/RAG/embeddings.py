@@ -1,21 +1,197 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Iterable, List, Mapping, Protocol, Sequence
 import ollama
 
+from ..Ollama.residency import KIND_EMBED, get_keep_alive, residency_manager
+
+
+BACKEND_OLLAMA = "ollama"
+BACKEND_HASHED_NGRAM = "hashed_ngram"
+EMBED_BACKENDS = (BACKEND_OLLAMA, BACKEND_HASHED_NGRAM)
+
+HASH_DIM = int(os.getenv("RAG_HASH_DIM", "4096"))
+HASH_NGRAM_MIN = 3
+HASH_NGRAM_MAX = 5
+
+_WORD_RE = re.compile(r"\w+")
+
 
 def _extract_embedding(response) -> List[float]:
     if hasattr(response, "embedding"):
         return list(response.embedding)
     if isinstance(response, dict) and "embedding" in response:
         return list(response["embedding"])
+    embeddings = getattr(response, "embeddings", None)
+    if embeddings is None and isinstance(response, dict):
+        embeddings = response.get("embeddings")
+    if embeddings:
+        return list(embeddings[0])
     raise RuntimeError("Ollama embeddings response missing 'embedding'.")
 
 
 def embed_text(text: str, model: str) -> List[float]:
-    response = ollama.embeddings(model=model, prompt=text)
+    response = ollama.embed(model=model, input=text, keep_alive=get_keep_alive())
+    residency_manager.observe(KIND_EMBED, model, response)
     return _extract_embedding(response)
 
 
 def embed_texts(texts: Iterable[str], model: str) -> List[List[float]]:
     return [embed_text(text, model) for text in texts]
+
+
+def normalize_backend(backend: str) -> str:
+    value = str(backend).strip().lower() or BACKEND_OLLAMA
+    if value not in EMBED_BACKENDS:
+        raise ValueError(
+            f"Unsupported embed backend '{backend}'. Choose one of: {', '.join(EMBED_BACKENDS)}."
+        )
+    return value
+
+
+class EmbeddingBackend(Protocol):
+    """Turns chunk and query text into vectors for one index.
+
+    ``embed_documents`` is called once at build time and may fit state (such
+    as IDF weights) that ``to_payload`` persists alongside the vectors, so
+    queries are embedded exactly the way the index was. Backends that do set
+    ``fits_corpus``: their vectors depend on the whole corpus, so an
+    incremental update has to re-embed every chunk. ``min_similarity`` is
+    the cosine below which a chunk is unrelated to the query; scores are on a
+    different scale for every backend.
+    """
+
+    name: str
+    model: str
+    fits_corpus: bool
+    min_similarity: float
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]: ...
+
+    def embed_query(self, text: str) -> List[float]: ...
+
+    def to_payload(self) -> dict[str, object]: ...
+
+
+class OllamaEmbedder:
+    name = BACKEND_OLLAMA
+    fits_corpus = False
+    # Dense sentence embeddings put unrelated text at roughly 0.3-0.4.
+    min_similarity = 0.4
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]:
+        return embed_texts(texts, self.model)
+
+    def embed_query(self, text: str) -> List[float]:
+        return embed_text(text, self.model)
+
+    def to_payload(self) -> dict[str, object]:
+        return {"name": self.name}
+
+
+class HashedNgramEmbedder:
+    """Local TF-IDF over hashed character n-grams and whole words.
+
+    Features are hashed into ``dim`` signed buckets with CRC32, which is stable
+    across processes, so the IDF table fitted at build time is all that has to
+    be stored with the index. Vectors are L2-normalised.
+    """
+
+    name = BACKEND_HASHED_NGRAM
+    fits_corpus = True
+    # Greetings and thanks share almost no weighted n-grams with a corpus (under 0.08).
+    min_similarity = 0.08
+
+    def __init__(
+        self,
+        *,
+        dim: int = HASH_DIM,
+        ngram_min: int = HASH_NGRAM_MIN,
+        ngram_max: int = HASH_NGRAM_MAX,
+        idf: Sequence[float] | None = None,
+    ) -> None:
+        if dim <= 0:
+            raise ValueError("Hash dimension must be > 0.")
+        if ngram_min <= 0 or ngram_max < ngram_min:
+            raise ValueError("N-gram range must satisfy 0 < min <= max.")
+        self.dim = int(dim)
+        self.ngram_min = int(ngram_min)
+        self.ngram_max = int(ngram_max)
+        self.idf: List[float] = list(idf) if idf is not None else [1.0] * self.dim
+        if len(self.idf) != self.dim:
+            raise ValueError("IDF table does not match the hash dimension.")
+        self.model = f"hashed-ngram-{self.dim}"
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object]) -> "HashedNgramEmbedder":
+        return cls(
+            dim=int(payload.get("dim", HASH_DIM)),
+            ngram_min=int(payload.get("ngram_min", HASH_NGRAM_MIN)),
+            ngram_max=int(payload.get("ngram_max", HASH_NGRAM_MAX)),
+            idf=payload.get("idf"),  # type: ignore[arg-type]
+        )
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "dim": self.dim,
+            "ngram_min": self.ngram_min,
+            "ngram_max": self.ngram_max,
+            "idf": self.idf,
+        }
+
+    def _buckets(self, text: str) -> Counter[int]:
+        words = _WORD_RE.findall(text.casefold())
+        counts: Counter[int] = Counter()
+        features = [f"w:{word}" for word in words]
+        padded = f" {' '.join(words)} "
+        for size in range(self.ngram_min, self.ngram_max + 1):
+            features.extend(padded[i : i + size] for i in range(len(padded) - size + 1))
+        for feature in features:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            counts[digest % self.dim] += -1 if digest & 0x80000000 else 1
+        return counts
+
+    def _vector(self, counts: Counter[int]) -> List[float]:
+        vector = [0.0] * self.dim
+        for bucket, count in counts.items():
+            if count:
+                weight = (1.0 + math.log(abs(count))) * self.idf[bucket]
+                vector[bucket] = weight if count > 0 else -weight
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]:
+        bucket_counts = [self._buckets(text) for text in texts]
+        doc_freq = [0] * self.dim
+        for counts in bucket_counts:
+            for bucket, count in counts.items():
+                if count:
+                    doc_freq[bucket] += 1
+        total = len(bucket_counts)
+        self.idf = [math.log((1 + total) / (1 + df)) + 1.0 for df in doc_freq]
+        return [self._vector(counts) for counts in bucket_counts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(self._buckets(text))
+
+
+def create_embedder(backend: str, model: str) -> EmbeddingBackend:
+    if normalize_backend(backend) == BACKEND_HASHED_NGRAM:
+        return HashedNgramEmbedder()
+    return OllamaEmbedder(model)
+
+
+def embedder_from_payload(payload: Mapping[str, object], default_model: str) -> EmbeddingBackend:
+    backend = payload.get("backend")
+    if isinstance(backend, Mapping) and backend.get("name") == BACKEND_HASHED_NGRAM:
+        return HashedNgramEmbedder.from_payload(backend)
+    return OllamaEmbedder(str(payload.get("model") or default_model))
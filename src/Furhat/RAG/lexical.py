@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Iterable, Mapping, Sequence
+
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Terms in more than this share of chunks are skipped when the query has rarer ones.
+COMMON_TERM_RATIO = 0.5
+# Postings are impact-ordered; only this many per query term are scored.
+MAX_POSTINGS_PER_TERM = 1000
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class InvertedIndex:
+    """BM25 over a term -> postings index stored in CSR form.
+
+    ``terms[i]`` owns ``docs[offsets[i]:offsets[i + 1]]`` and the matching
+    term frequencies in ``tfs``. On load each posting list is re-sorted by its
+    precomputed BM25 impact, so a query sums at most ``MAX_POSTINGS_PER_TERM``
+    floats per term and long lists of common words stop early.
+    """
+
+    def __init__(
+        self,
+        *,
+        terms: Sequence[str],
+        offsets: Sequence[int],
+        docs: Sequence[int],
+        tfs: Sequence[int],
+        doc_lengths: Sequence[int],
+    ) -> None:
+        self.terms = list(terms)
+        self.offsets = array("I", offsets)
+        self.docs = array("I", docs)
+        self.tfs = array("H", tfs)
+        self.doc_lengths = array("I", doc_lengths)
+        self._slots = {term: slot for slot, term in enumerate(self.terms)}
+        self._ranked_docs, self._impacts = self._rank_postings()
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> "InvertedIndex":
+        postings: dict[str, list[tuple[int, int]]] = {}
+        doc_lengths: list[int] = []
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc_id, min(count, 0xFFFF)))
+        terms = sorted(postings)
+        offsets = [0]
+        docs: list[int] = []
+        tfs: list[int] = []
+        for term in terms:
+            for doc_id, count in postings[term]:
+                docs.append(doc_id)
+                tfs.append(count)
+            offsets.append(len(docs))
+        return cls(terms=terms, offsets=offsets, docs=docs, tfs=tfs, doc_lengths=doc_lengths)
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object]) -> "InvertedIndex":
+        return cls(
+            terms=payload["terms"],  # type: ignore[arg-type]
+            offsets=payload["offsets"],  # type: ignore[arg-type]
+            docs=payload["docs"],  # type: ignore[arg-type]
+            tfs=payload["tfs"],  # type: ignore[arg-type]
+            doc_lengths=payload["doc_lengths"],  # type: ignore[arg-type]
+        )
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "terms": self.terms,
+            "offsets": self.offsets,
+            "docs": self.docs,
+            "tfs": self.tfs,
+            "doc_lengths": self.doc_lengths,
+        }
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def _rank_postings(self) -> tuple[array, array]:
+        total = len(self.doc_lengths)
+        avg_length = (sum(self.doc_lengths) / total) if total else 0.0
+        norms = [
+            BM25_K1 * (1.0 - BM25_B + BM25_B * (length / avg_length if avg_length else 0.0))
+            for length in self.doc_lengths
+        ]
+        ranked_docs = array("I")
+        impacts = array("f")
+        for slot in range(len(self.terms)):
+            start, end = self.offsets[slot], self.offsets[slot + 1]
+            df = end - start
+            idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+            postings = sorted(
+                (
+                    (idf * tf * (BM25_K1 + 1.0) / (tf + norms[doc_id]), doc_id)
+                    for doc_id, tf in zip(self.docs[start:end], self.tfs[start:end])
+                ),
+                reverse=True,
+            )
+            ranked_docs.extend(doc_id for _, doc_id in postings)
+            impacts.extend(impact for impact, _ in postings)
+        return ranked_docs, impacts
+
+    def search(self, query: str, k: int) -> list[tuple[float, int]]:
+        slots = [self._slots[term] for term in set(tokenize(query)) if term in self._slots]
+        if not slots or k <= 0:
+            return []
+        limit = COMMON_TERM_RATIO * len(self.doc_lengths)
+        rare = [slot for slot in slots if self.offsets[slot + 1] - self.offsets[slot] <= limit]
+        scores: dict[int, float] = {}
+        for slot in rare or slots:
+            start = self.offsets[slot]
+            end = min(self.offsets[slot + 1], start + MAX_POSTINGS_PER_TERM)
+            for doc_id, impact in zip(self._ranked_docs[start:end], self._impacts[start:end]):
+                scores[doc_id] = scores.get(doc_id, 0.0) + impact
+        return heapq.nlargest(k, ((score, doc_id) for doc_id, score in scores.items()))
+
+
+def reciprocal_rank_scores(
+    rankings: Iterable[Sequence[int]],
+    *,
+    k: int = 60,
+    weights: Sequence[float] | None = None,
+) -> list[tuple[int, float]]:
+    """Merge ranked id lists by summing ``weight / (k + rank)``; ties keep first-seen order."""
+    fused: dict[int, float] = {}
+    for position, ranking in enumerate(rankings):
+        weight = weights[position] if weights is not None else 1.0
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[int]],
+    *,
+    k: int = 60,
+    weights: Sequence[float] | None = None,
+) -> list[int]:
+    return [doc_id for doc_id, _ in reciprocal_rank_scores(rankings, k=k, weights=weights)]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from typing import List, Protocol, Sequence
+
+
+BLOCK_SEPARATOR = "\n\n"
+# Blocks sharing this fraction of their words count as the same passage.
+NEAR_DUPLICATE_JACCARD = 0.8
+# Below this many characters a trimmed block is not worth its separator.
+MIN_TRIMMED_CHARS = 80
+
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_END_RE = re.compile(r"[.!?…][\"'”’)\]]*(?=\s|$)|\n")
+
+
+class _Entry(Protocol):
+    text: str
+    source: str
+    chunk_id: int
+    start: int
+    end: int
+
+
+class _Hit(Protocol):
+    entry: _Entry
+    score: float
+
+
+@dataclass(slots=True)
+class _Block:
+    source: str
+    text: str
+    start: int
+    end: int
+    last_chunk: int
+    score: float
+    rank: int
+
+
+def _sentence_ends(text: str) -> List[int]:
+    return [match.end() for match in _SENTENCE_END_RE.finditer(text)]
+
+
+def _join(left: str, right: str, overlap_hint: int) -> str:
+    if right in left:
+        return left
+    # Legacy character windows overlap by exactly the span their offsets share.
+    if 0 < overlap_hint < len(right) and left.endswith(right[:overlap_hint]):
+        return left + right[overlap_hint:]
+    # Structured chunks repeat whole sentences, so the overlap ends on a sentence boundary.
+    for end in reversed(_sentence_ends(right)):
+        if left.endswith(right[:end].rstrip()):
+            return left + right[end:]
+    return f"{left} {right}"
+
+
+def _merge(hits: Sequence[_Hit]) -> List[_Block]:
+    """Fold hits from the same source that overlap or are consecutive chunks into one block."""
+    ordered = sorted(
+        enumerate(hits),
+        key=lambda item: (item[1].entry.source, item[1].entry.start, item[1].entry.chunk_id),
+    )
+    blocks: List[_Block] = []
+    for rank, hit in ordered:
+        entry = hit.entry
+        text = entry.text.strip()
+        if not text:
+            continue
+        previous = blocks[-1] if blocks else None
+        if (
+            previous is not None
+            and previous.source == entry.source
+            and (entry.start < previous.end or entry.chunk_id == previous.last_chunk + 1)
+        ):
+            previous.text = _join(previous.text, text, previous.end - entry.start)
+            previous.end = max(previous.end, entry.end)
+            previous.last_chunk = max(previous.last_chunk, entry.chunk_id)
+            previous.score += hit.score
+            previous.rank = min(previous.rank, rank)
+            continue
+        blocks.append(
+            _Block(
+                source=entry.source,
+                text=text,
+                start=entry.start,
+                end=entry.end,
+                last_chunk=entry.chunk_id,
+                score=hit.score,
+                rank=rank,
+            )
+        )
+    blocks.sort(key=lambda block: block.rank)
+    return blocks
+
+
+def _drop_near_duplicates(blocks: Sequence[_Block]) -> List[_Block]:
+    kept: List[_Block] = []
+    kept_words: List[set[str]] = []
+    for block in blocks:
+        words = set(_WORD_RE.findall(block.text.casefold()))
+        if any(
+            len(words & other) >= NEAR_DUPLICATE_JACCARD * len(words | other)
+            for other in kept_words
+            if words or other
+        ):
+            continue
+        kept.append(block)
+        kept_words.append(words)
+    return kept
+
+
+def _trim(text: str, limit: int, *, force: bool = False) -> str:
+    if len(text) <= limit:
+        return text
+    if limit < MIN_TRIMMED_CHARS and not force:
+        return ""
+    ends = [end for end in _sentence_ends(text) if end <= limit]
+    if ends:
+        return text[: ends[-1]].rstrip()
+    if not force:
+        return ""
+    # Only the best block is ever cut mid-sentence, and then at a word boundary.
+    cut = text[:limit].rsplit(None, 1)[0] if " " in text[:limit] else text[:limit]
+    return cut.rstrip()
+
+
+def pack_context(hits: Sequence[_Hit], max_chars: int) -> str:
+    """Build the context block for ``hits`` within ``max_chars``.
+
+    Overlapping or consecutive chunks of one source are merged, and
+    near-duplicate passages are kept once. The best-ranked block always goes
+    in first; the rest fill the remaining budget by score per character and
+    are trimmed at sentence boundaries. Blocks are emitted in rank order.
+    """
+    if max_chars <= 0:
+        return ""
+    blocks = _drop_near_duplicates(_merge(hits))
+    if not blocks:
+        return ""
+
+    chosen: List[_Block] = []
+    remaining = max_chars
+    rest = sorted(blocks[1:], key=lambda block: block.score / len(block.text), reverse=True)
+    for position, block in enumerate([blocks[0], *rest]):
+        room = remaining - (len(BLOCK_SEPARATOR) if chosen else 0)
+        text = _trim(block.text, room, force=position == 0)
+        if not text:
+            continue
+        chosen.append(replace(block, text=text))
+        remaining = room - len(text)
+    chosen.sort(key=lambda block: block.rank)
+    return BLOCK_SEPARATOR.join(block.text for block in chosen)
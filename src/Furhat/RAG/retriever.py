@@ -1,28 +1,111 @@
 from __future__ import annotations
 
+from array import array
+from collections import OrderedDict
+import concurrent.futures
 from dataclasses import dataclass
+import heapq
 import logging
 import math
 import pickle
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Mapping, Optional, Tuple
 
-from .config import EMBED_MODEL, INDEX_PATH, MAX_CONTEXT_CHARS, TOP_K
-from .embeddings import embed_text
+from .. import executors
+from .ann import IvfIndex
+from .config import (
+    ANN_MIN_CHUNKS,
+    ANN_NPROBE,
+    EMBED_MODEL,
+    EVENT_INDEX_PATH,
+    HYBRID_SEARCH,
+    INDEX_CACHE_SIZE,
+    INDEX_PATH,
+    INDEX_WEIGHTS,
+    MAX_CONTEXT_CHARS,
+    MIN_SIMILARITY,
+    MMR_CANDIDATES,
+    MMR_LAMBDA,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL_SEC,
+    RELATIVE_SIMILARITY,
+    RETRIEVAL_BUDGET_MS,
+    RESCORE_CANDIDATES,
+    RRF_CANDIDATES,
+    RRF_K,
+    TOP_K,
+)
+from .cache import TTLCache, normalize_query
+from .chunking import contextual_text
+from .embeddings import EmbeddingBackend, OllamaEmbedder, embedder_from_payload
+from .lexical import InvertedIndex, reciprocal_rank_scores, tokenize
+from .packing import pack_context
+from .vectors import Float32Store, Int8Store, VectorStore, store_from_payload, vector_norms
 
 
 logger = logging.getLogger(__name__)
 
 
-def set_retrieval_settings(*, top_k: int, max_context_chars: int, embed_model: str) -> None:
+def set_retrieval_settings(
+    *,
+    top_k: int,
+    max_context_chars: int,
+    embed_model: str,
+    ann_nprobe: int | None = None,
+    ann_min_chunks: int | None = None,
+    rescore_candidates: int | None = None,
+    index_cache_size: int | None = None,
+    index_weights: Mapping[str, float] | None = None,
+    retrieval_budget_ms: float | None = None,
+    min_similarity: float | None = None,
+    relative_similarity: float | None = None,
+    mmr_lambda: float | None = None,
+) -> None:
     if top_k <= 0:
         raise ValueError("Top-k must be > 0.")
     if max_context_chars <= 0:
         raise ValueError("Max context chars must be > 0.")
-    global TOP_K, MAX_CONTEXT_CHARS, EMBED_MODEL
+    if ann_nprobe is not None and ann_nprobe <= 0:
+        raise ValueError("ANN nprobe must be > 0.")
+    if ann_min_chunks is not None and ann_min_chunks < 0:
+        raise ValueError("ANN minimum chunk count must be >= 0.")
+    if rescore_candidates is not None and rescore_candidates < 0:
+        raise ValueError("Rescore candidates must be >= 0.")
+    if index_cache_size is not None and index_cache_size < 0:
+        raise ValueError("Index cache size must be >= 0.")
+    if index_weights is not None and any(weight < 0 for weight in index_weights.values()):
+        raise ValueError("Index weights must be >= 0.")
+    if retrieval_budget_ms is not None and retrieval_budget_ms < 0:
+        raise ValueError("Retrieval budget must be >= 0.")
+    if relative_similarity is not None and not 0 <= relative_similarity <= 1:
+        raise ValueError("Relative similarity must be between 0 and 1.")
+    if mmr_lambda is not None and not 0 <= mmr_lambda <= 1:
+        raise ValueError("MMR lambda must be between 0 and 1.")
+    global TOP_K, MAX_CONTEXT_CHARS, EMBED_MODEL, ANN_NPROBE, ANN_MIN_CHUNKS, RESCORE_CANDIDATES
+    global INDEX_WEIGHTS, RETRIEVAL_BUDGET_MS, MIN_SIMILARITY, RELATIVE_SIMILARITY, MMR_LAMBDA
     TOP_K = int(top_k)
     MAX_CONTEXT_CHARS = int(max_context_chars)
     EMBED_MODEL = embed_model.strip() or EMBED_MODEL
+    if ann_nprobe is not None:
+        ANN_NPROBE = int(ann_nprobe)
+    if ann_min_chunks is not None:
+        ANN_MIN_CHUNKS = int(ann_min_chunks)
+    if rescore_candidates is not None:
+        RESCORE_CANDIDATES = int(rescore_candidates)
+    if index_cache_size is not None:
+        _CACHE.resize(index_cache_size)
+    if index_weights is not None:
+        INDEX_WEIGHTS = {name: float(weight) for name, weight in index_weights.items()}
+    if retrieval_budget_ms is not None:
+        RETRIEVAL_BUDGET_MS = float(retrieval_budget_ms)
+    if min_similarity is not None:
+        MIN_SIMILARITY = float(min_similarity)
+    if relative_similarity is not None:
+        RELATIVE_SIMILARITY = float(relative_similarity)
+    if mmr_lambda is not None:
+        MMR_LAMBDA = float(mmr_lambda)
 
 
 @dataclass
@@ -32,28 +115,171 @@ class RagEntry:
     chunk_id: int
     start: int
     end: int
+    title: str = ""
+    section: str = ""
+
+
+@dataclass(slots=True)
+class RagHit:
+    entry: RagEntry
+    # Ranking score (fused when hybrid) and cosine similarity to the query.
+    score: float
+    similarity: float = 0.0
+
+
+def relevant_hits(hits: List[RagHit], floor: float) -> List[RagHit]:
+    """Cut ranked ``hits`` down to as many as the query has relevant chunks.
+
+    Hits below ``floor`` are unrelated to the query, so small talk ends up
+    with no context at all. Of the rest, only hits within
+    ``RELATIVE_SIMILARITY`` of the best match's margin over the floor count:
+    one clear match comes alone, several close ones all stay. The count is
+    taken from the top of ``hits`` so a fused ranking keeps its order.
+    """
+    return hits[: _relevant_count([hit.similarity - floor for hit in hits])]
+
+
+def _relevant_count(margins: List[float]) -> int:
+    passing = [margin for margin in margins if margin >= 0]
+    if not passing:
+        return 0
+    cutoff = RELATIVE_SIMILARITY * max(passing)
+    return sum(1 for margin in passing if margin >= cutoff)
+
+
+def _shares_vector_space(a: "RagIndex", b: "RagIndex") -> bool:
+    if a is b:
+        return True
+    # Fitted embedders (hashed n-gram IDF) give each corpus its own space.
+    ea, eb = a.embedder, b.embedder
+    return (
+        not ea.fits_corpus
+        and not eb.fits_corpus
+        and (ea.name, ea.model) == (eb.name, eb.model)
+        and a.embeddings.dim == b.embeddings.dim
+    )
+
+
+def _token_overlap(left: str, right: str) -> float:
+    a, b = set(tokenize(left)), set(tokenize(right))
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _mmr_row(
+    index: "RagIndex", idx: int, sparse_by_index: dict
+) -> Tuple[float, List[float] | dict, float]:
+    """(scale, values, squared length of values) for one candidate.
+
+    Sparse rows (hashed n-gram vectors) keep only their nonzeros. Whether an
+    index is sparse is decided from its first row and kept in
+    ``sparse_by_index``, so later rows skip the scan.
+    """
+    scale, values = index.embeddings.scaled_row(idx)
+    sparse = sparse_by_index.get(index)
+    if sparse is None:
+        sparse = sparse_by_index[index] = values.count(0) * 2 > len(values)
+    if sparse:
+        return scale, {i: v for i, v in enumerate(values) if v}, 0.0
+    length = index.norms[idx] / scale
+    return scale, values, length * length
+
+
+def _mmr_dot(a: Tuple[float, List[float] | dict, float], b: Tuple[float, List[float] | dict, float]) -> float:
+    (scale_a, va, sq_a), (scale_b, vb, sq_b) = a, b
+    if isinstance(va, dict) or isinstance(vb, dict):
+        if not isinstance(va, dict) or (isinstance(vb, dict) and len(vb) < len(va)):
+            va, vb = vb, va
+        if isinstance(vb, dict):
+            total = sum(value * vb.get(i, 0.0) for i, value in va.items())
+        else:
+            total = sum(value * vb[i] for i, value in va.items())
+        return scale_a * scale_b * total
+    # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, and math.dist runs in C.
+    return scale_a * scale_b * (sq_a + sq_b - math.dist(va, vb) ** 2) / 2
+
+
+def diversify(ranked: List[Tuple["RagIndex", int, RagHit]], k: int) -> List[Tuple["RagIndex", int, RagHit]]:
+    """Pick ``k`` of ``ranked`` (index, chunk id, hit) by maximal marginal relevance.
+
+    Each pick maximises ``MMR_LAMBDA * relevance - (1 - MMR_LAMBDA) *
+    redundancy``, where relevance is the hit's score over the best score and
+    redundancy its highest cosine to a chunk already picked (token overlap for
+    chunks from indexes with different embeddings). Redundancy only grows, so
+    a candidate's last score bounds its next one: each round re-scores
+    candidates best bound first and stops as soon as a fresh score beats every
+    remaining bound. A candidate's row is read at most once and each
+    candidate-to-pick similarity is computed at most once.
+    """
+    if not ranked:
+        return []
+    top = ranked[0][2].score or 1.0
+    relevance = [hit.score / top for _, _, hit in ranked]
+    rows: List[Optional[Tuple[float, List[float] | dict, float]]] = [None] * len(ranked)
+    sparse_by_index: dict = {}
+
+    def row(pos: int) -> Tuple[float, List[float] | dict, float]:
+        cached = rows[pos]
+        if cached is None:
+            index, idx, _ = ranked[pos]
+            cached = rows[pos] = _mmr_row(index, idx, sparse_by_index)
+        return cached
+
+    def similarity(pos: int, other: int) -> float:
+        index, idx, hit = ranked[pos]
+        other_index, other_idx, other_hit = ranked[other]
+        if not _shares_vector_space(index, other_index):
+            return _token_overlap(hit.entry.text, other_hit.entry.text)
+        norms = (index.norms[idx] or 1.0) * (other_index.norms[other_idx] or 1.0)
+        return _mmr_dot(row(pos), row(other)) / norms
+
+    redundancy = [0.0] * len(ranked)
+    covered = [0] * len(ranked)  # How many picks each candidate's redundancy includes.
+    picked = [0]
+    # Max-heap on (score, lowest position first), matching max() over positions in order.
+    bounds = [(-MMR_LAMBDA * relevance[pos], pos) for pos in range(1, len(ranked))]
+    heapq.heapify(bounds)
+    while bounds and len(picked) < k:
+        while True:
+            _, pos = heapq.heappop(bounds)
+            for other in picked[covered[pos] :]:
+                redundancy[pos] = max(redundancy[pos], similarity(pos, other))
+            covered[pos] = len(picked)
+            fresh = (-(MMR_LAMBDA * relevance[pos] - (1.0 - MMR_LAMBDA) * redundancy[pos]), pos)
+            if not bounds or fresh <= bounds[0]:
+                picked.append(pos)
+                break
+            heapq.heappush(bounds, fresh)
+    return [ranked[pos] for pos in picked]
 
 
 class RagIndex:
     def __init__(
         self,
-        embeddings: List[List[float]],
+        embeddings: List[List[float]] | VectorStore,
         entries: List[RagEntry],
         norms: Optional[List[float]] = None,
         model: Optional[str] = None,
+        embedder: Optional[EmbeddingBackend] = None,
+        lexical: Optional[InvertedIndex] = None,
+        ann: Optional[IvfIndex] = None,
     ) -> None:
-        self.embeddings = embeddings
+        if not isinstance(embeddings, (Float32Store, Int8Store)):
+            embeddings = Float32Store.from_rows(embeddings)
+        self.embeddings: VectorStore = embeddings
         self.entries = entries
-        self.model = model or EMBED_MODEL
-        if norms is None:
-            self.norms = [math.sqrt(sum(v * v for v in vec)) for vec in embeddings]
-        else:
-            self.norms = norms
+        self.embedder = embedder or OllamaEmbedder(model or EMBED_MODEL)
+        self.model = self.embedder.model
+        self.norms = list(norms) if norms is not None else vector_norms(embeddings)
+        # Indexes built before hybrid search get their postings built on load.
+        self.lexical = lexical or InvertedIndex.build(
+            contextual_text(entry.text, entry.title, entry.section) for entry in entries
+        )
+        self.ann = ann
 
     @classmethod
     def load(cls, path: Path) -> "RagIndex":
         payload = pickle.loads(path.read_bytes())
-        embeddings = payload.get("embeddings", [])
+        embeddings = store_from_payload(payload, path)
         entries_raw = payload.get("entries", [])
         entries = [
             RagEntry(
@@ -62,82 +288,468 @@ class RagIndex:
                 chunk_id=int(item.get("chunk_id", 0)),
                 start=int(item.get("start", 0)),
                 end=int(item.get("end", 0)),
+                title=str(item.get("title", "")),
+                section=str(item.get("section", "")),
             )
             for item in entries_raw
         ]
         norms = payload.get("norms")
-        model = payload.get("model")
-        return cls(embeddings=embeddings, entries=entries, norms=norms, model=model)
+        embedder = embedder_from_payload(payload, EMBED_MODEL)
+        lexical_raw = payload.get("lexical")
+        lexical = InvertedIndex.from_payload(lexical_raw) if isinstance(lexical_raw, dict) else None
+        ann_raw = payload.get("ann")
+        ann = IvfIndex.from_payload(ann_raw) if isinstance(ann_raw, dict) else None
+        return cls(
+            embeddings=embeddings,
+            entries=entries,
+            norms=norms,
+            embedder=embedder,
+            lexical=lexical,
+            ann=ann,
+        )
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "chunks": len(self.entries),
+            "dim": self.embeddings.dim,
+            "backend": self.embedder.name,
+            "model": self.model,
+            "vector_storage": self.embeddings.storage,
+            "vector_bytes": self.embeddings.memory_bytes(),
+            "ann_lists": self.ann.nlist if self.ann is not None else 0,
+        }
 
     def retrieve(self, query: str, k: int = TOP_K) -> List[RagEntry]:
-        if not query.strip() or not self.embeddings:
+        return [hit.entry for hit in self.search(query, k)]
+
+    @property
+    def min_similarity(self) -> float:
+        return MIN_SIMILARITY if MIN_SIMILARITY >= 0 else self.embedder.min_similarity
+
+    def search(self, query: str, k: int = TOP_K) -> List[RagHit]:
+        """Up to ``k`` relevant chunks for ``query``; see ``relevant_hits`` and ``diversify``."""
+        diverse = MMR_LAMBDA < 1.0
+        ranked = self._rank(query, k, diverse)
+        ranked = ranked[: len(relevant_hits([hit for _, hit in ranked], self.min_similarity))]
+        if diverse and len(ranked) > k:
+            ranked = self.diversify(ranked[:MMR_CANDIDATES], k)
+        return [hit for _, hit in ranked[:k]]
+
+    def candidates(self, query: str, depth: int) -> List[Tuple[int, RagHit]]:
+        """Ranked (chunk id, hit) pairs above this index's similarity floor.
+
+        Federated search applies the relative cutoff and MMR itself, once over
+        the merged list of every index.
+        """
+        ranked = self._rank(query, depth, False)
+        return ranked[: sum(1 for _, hit in ranked if hit.similarity >= self.min_similarity)]
+
+    def _rank(self, query: str, k: int, diverse: bool) -> List[Tuple[int, RagHit]]:
+        if not query.strip() or not len(self.embeddings):
             return []
-        query_vec = embed_text(query, self.model)
+        query_vec = self.embed_query(query)
+        if not HYBRID_SEARCH:
+            depth = max(k, MMR_CANDIDATES) if diverse else k
+            ranked = [
+                (idx, RagHit(self.entries[idx], score, score))
+                for idx, score in self.score_vector(query_vec, depth)
+            ]
+        else:
+            depth = max(k, RRF_CANDIDATES, MMR_CANDIDATES if diverse else 0)
+            dense = dict(self.score_vector(query_vec, depth))
+            lexical = [idx for _, idx in self.lexical.search(query, depth)]
+            ranked = [
+                (idx, RagHit(self.entries[idx], score, dense[idx] if idx in dense else self.similarity(idx, query_vec)))
+                for idx, score in reciprocal_rank_scores([list(dense), lexical], k=RRF_K)
+            ]
+        return ranked
+
+    def diversify(self, ranked: List[Tuple[int, RagHit]], k: int) -> List[Tuple[int, RagHit]]:
+        return [(idx, hit) for _, idx, hit in diversify([(self, idx, hit) for idx, hit in ranked], k)]
+
+    def dense_ranking(self, query: str, k: int, *, exact: bool = False) -> List[int]:
+        return [idx for idx, _ in self.dense_scores(query, k, exact=exact)]
+
+    def dense_scores(self, query: str, k: int, *, exact: bool = False) -> List[tuple[int, float]]:
+        query_vec = self.embed_query(query)
+        return self.score_vector(query_vec, k, exact=exact)
+
+    def embed_query(self, query: str) -> List[float]:
+        # Model embeddings are shared by every index on that model; fitted ones
+        # (hashed n-gram IDF) are only valid for the embedder that made them.
+        embedder = self.embedder
+        owner = embedder if embedder.fits_corpus else (embedder.name, embedder.model)
+        key = (owner, normalize_query(query))
+        cached = _QUERY_VECTORS.get(key)
+        if cached is not None:
+            return cached.tolist()
+        query_vec = embedder.embed_query(query)
+        _QUERY_VECTORS.put(key, array("d", query_vec))
+        return query_vec
+
+    def similarity(self, idx: int, query_vec: List[float]) -> float:
+        store = self.embeddings
+        qnorm = math.sqrt(sum(v * v for v in query_vec)) or 1.0
+        if isinstance(store, Int8Store) and store.has_exact:
+            dot = store.exact_dot(idx, query_vec)
+        else:
+            dot = store.dot(idx, query_vec)
+        return dot / ((self.norms[idx] or 1.0) * qnorm)
+
+    def _candidates(self, query_vec: List[float], k: int, exact: bool) -> range | List[int]:
+        everything = range(len(self.embeddings))
+        if exact or self.ann is None or not ANN_MIN_CHUNKS or len(self.embeddings) < ANN_MIN_CHUNKS:
+            return everything
+        candidates = self.ann.probe(query_vec, ANN_NPROBE)
+        return candidates if len(candidates) >= k else everything
+
+    def rank_vector(self, query_vec: List[float], k: int, *, exact: bool = False) -> List[int]:
+        return [idx for idx, _ in self.score_vector(query_vec, k, exact=exact)]
+
+    def score_vector(self, query_vec: List[float], k: int, *, exact: bool = False) -> List[tuple[int, float]]:
+        """Top ``k`` chunk ids with their cosine similarity to ``query_vec``."""
         qnorm = math.sqrt(sum(v * v for v in query_vec)) or 1.0
+        # Hashed n-gram queries touch a few hundred of several thousand dimensions.
+        nonzero = [(i, v) for i, v in enumerate(query_vec) if v]
+        sparse = len(nonzero) * 2 < len(query_vec)
+        store = self.embeddings
         scored: List[tuple[float, int]] = []
-        for idx, vec in enumerate(self.embeddings):
-            denom = (self.norms[idx] or 1.0) * qnorm
-            score = sum(a * b for a, b in zip(vec, query_vec)) / denom
-            scored.append((score, idx))
+        for idx in self._candidates(query_vec, k, exact):
+            dot = store.dot_sparse(idx, nonzero) if sparse else store.dot(idx, query_vec)
+            scored.append((dot / ((self.norms[idx] or 1.0) * qnorm), idx))
         scored.sort(reverse=True, key=lambda item: item[0])
-        top = scored[:k]
-        return [self.entries[idx] for _, idx in top]
+        if isinstance(store, Int8Store) and RESCORE_CANDIDATES and store.has_exact:
+            # Quantized scores pick the shortlist; full-precision rows settle its order.
+            shortlist = scored[: max(k, RESCORE_CANDIDATES)]
+            scored = sorted(
+                (
+                    (store.exact_dot(idx, query_vec) / ((self.norms[idx] or 1.0) * qnorm), idx)
+                    for _, idx in shortlist
+                ),
+                reverse=True,
+                key=lambda item: item[0],
+            )
+        return [(idx, score) for score, idx in scored[:k]]
 
 
-_INDEX: Optional[RagIndex] = None
-_INDEX_CHECKED = False
+IndexKey = Tuple[str, int, int]
 
 
-def get_index() -> Optional[RagIndex]:
-    global _INDEX, _INDEX_CHECKED
-    if _INDEX_CHECKED:
-        return _INDEX
-    _INDEX_CHECKED = True
-    if not INDEX_PATH.exists():
-        logger.info("RAG index not found at %s", INDEX_PATH)
+def _index_key(path: Path) -> Optional[IndexKey]:
+    try:
+        stat = path.stat()
+    except OSError:
         return None
+    return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+class IndexCache:
+    """LRU of loaded indexes keyed by resolved path and file version.
+
+    The version is the file's mtime and size, so a rebuilt index is loaded
+    fresh while switching back to an unchanged one costs a ``stat`` call.
+    Evicted indexes are only dropped, never closed: a search on another thread
+    may still be reading one, and its sidecar mapping closes once the last
+    reference is gone.
+    """
+
+    def __init__(self, capacity: int = INDEX_CACHE_SIZE) -> None:
+        self.capacity = max(0, int(capacity))
+        self._entries: "OrderedDict[IndexKey, RagIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Path) -> Optional[RagIndex]:
+        key = _index_key(path)
+        if key is None:
+            logger.info("RAG index not found at %s", path)
+            return None
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+        index = RagIndex.load(path)
+        with self._lock:
+            for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+                del self._entries[stale]
+            if self.capacity:
+                self._entries[key] = index
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return index
+
+    def resize(self, capacity: int) -> None:
+        with self._lock:
+            self.capacity = max(0, int(capacity))
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHE = IndexCache()
+# Query embeddings by (embedder, normalised query), and retrieval results by
+# query, settings and index version; see ``cache_stats``.
+_QUERY_VECTORS: TTLCache[array] = TTLCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL_SEC)
+_RESULTS: TTLCache[List["RagHit"]] = TTLCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL_SEC)
+_STATE_LOCK = threading.Lock()
+_INDEX_VERSION = 0
+
+INDEX_GLOBAL = "global"
+INDEX_CHARACTER = "character"
+INDEX_EVENT = "event"
+
+
+@dataclass(slots=True)
+class _Slot:
+    path: Path
+    index: Optional[RagIndex] = None
+    checked: bool = False
+
+
+# Named indexes queried together: the site-wide corpus, the active character's
+# sources and an optional event overlay. INDEX_PATH mirrors the global slot.
+_SLOTS: dict[str, _Slot] = {INDEX_GLOBAL: _Slot(INDEX_PATH)}
+if EVENT_INDEX_PATH:
+    _SLOTS[INDEX_EVENT] = _Slot(Path(EVENT_INDEX_PATH))
+
+
+def get_index_version() -> int:
+    return _INDEX_VERSION
+
+
+def _load(path: Path) -> Optional[RagIndex]:
     try:
-        _INDEX = RagIndex.load(INDEX_PATH)
+        return _CACHE.get(path)
     except Exception as exc:
         logger.warning("Failed to load RAG index: %s", exc)
         return None
-    return _INDEX
 
 
-def reload_index() -> Optional[RagIndex]:
-    global _INDEX, _INDEX_CHECKED
-    _INDEX = None
-    _INDEX_CHECKED = False
-    return get_index()
+def _swap(name: str, path: Path, index: Optional[RagIndex], *, replace_path: bool = True) -> Optional[RagIndex]:
+    global INDEX_PATH, _INDEX_VERSION
+    with _STATE_LOCK:
+        slot = _SLOTS.get(name)
+        if not replace_path and (slot is None or path != slot.path):
+            # set_index_path or clear_index got there while this reload was loading.
+            return slot.index if slot is not None else None
+        if slot is None:
+            slot = _SLOTS[name] = _Slot(path)
+        slot.path = path
+        slot.checked = True
+        if name == INDEX_GLOBAL:
+            INDEX_PATH = path
+        if index is not slot.index:
+            slot.index = index
+            _INDEX_VERSION += 1
+            _RESULTS.clear()
+        return slot.index
+
 
-def set_index_path(path: Path) -> None:
-    global INDEX_PATH, _INDEX, _INDEX_CHECKED
-    INDEX_PATH = Path(path)
-    _INDEX = None
-    _INDEX_CHECKED = False
+def get_index(name: str = INDEX_GLOBAL) -> Optional[RagIndex]:
+    slot = _SLOTS.get(name)
+    if slot is None:
+        return None
+    if slot.checked:
+        return slot.index
+    path = slot.path
+    return _swap(name, path, _load(path), replace_path=False)
 
 
-def retrieve_context(query: str, k: int = TOP_K, max_chars: int = MAX_CONTEXT_CHARS) -> str:
-    index = get_index()
-    if index is None:
-        return ""
+def get_indexes() -> dict[str, RagIndex]:
+    loaded = {name: get_index(name) for name in list(_SLOTS)}
+    return {name: index for name, index in loaded.items() if index is not None}
+
+
+def index_paths() -> dict[str, Path]:
+    with _STATE_LOCK:
+        return {name: slot.path for name, slot in _SLOTS.items()}
+
+
+def reload_index(name: str = INDEX_GLOBAL) -> Optional[RagIndex]:
+    """Pick up a rebuilt index file; an unchanged file keeps the loaded index."""
+    slot = _SLOTS.get(name)
+    if slot is None:
+        return None
+    path = slot.path
+    return _swap(name, path, _load(path), replace_path=False)
+
+
+def set_index_path(path: Path, name: str = INDEX_GLOBAL) -> Optional[RagIndex]:
+    """Point the ``name`` slot at the index at ``path``.
+
+    The new index is loaded (or taken from the cache) before the switch, so
+    retrieval keeps answering from the current index until it is replaced.
+    """
+    path = Path(path)
+    return _swap(name, path, _load(path))
+
+
+def clear_index(name: str) -> None:
+    global _INDEX_VERSION
+    if name == INDEX_GLOBAL:
+        raise ValueError("The global index can be repointed but not removed.")
+    with _STATE_LOCK:
+        slot = _SLOTS.pop(name, None)
+        if slot is not None and slot.index is not None:
+            _INDEX_VERSION += 1
+            _RESULTS.clear()
+
+
+def retrieve(query: str, k: Optional[int] = None) -> List[RagEntry]:
+    return [hit.entry for hit in search(query, k)]
+
+
+def cache_stats() -> dict[str, object]:
+    return {"query_embeddings": _QUERY_VECTORS.stats(), "results": _RESULTS.stats()}
+
+
+def clear_query_caches() -> None:
+    _QUERY_VECTORS.clear()
+    _RESULTS.clear()
+
+
+def _settings_key() -> tuple[object, ...]:
+    return (
+        HYBRID_SEARCH,
+        RRF_K,
+        RRF_CANDIDATES,
+        ANN_NPROBE,
+        ANN_MIN_CHUNKS,
+        RESCORE_CANDIDATES,
+        MIN_SIMILARITY,
+        RELATIVE_SIMILARITY,
+        MMR_LAMBDA,
+        MMR_CANDIDATES,
+        tuple(sorted(INDEX_WEIGHTS.items())),
+    )
+
+
+def search(query: str, k: Optional[int] = None) -> List[RagHit]:
+    """Top ``k`` chunks across every loaded index.
+
+    Each index ranks its own chunks (on a worker thread when there are
+    several), and the rankings are merged with reciprocal rank fusion weighted
+    by ``INDEX_WEIGHTS``. Indexes that miss ``RETRIEVAL_BUDGET_MS`` are left out,
+    and such partial results are not cached.
+    """
+    k = TOP_K if k is None else k
+    key = (get_index_version(), normalize_query(query), k, _settings_key())
+    cached = _RESULTS.get(key)
+    if cached is not None:
+        return list(cached)
+    hits, complete = _search(query, k)
+    if complete:
+        _RESULTS.put(key, list(hits))
+    return hits
+
+
+def _run_inline(index: RagIndex, query: str, depth: int) -> concurrent.futures.Future:
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    try:
+        future.set_result(index.candidates(query, depth))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _submit_candidates(
+    indexes: Mapping[str, RagIndex], query: str, depth: int
+) -> dict[concurrent.futures.Future, str]:
+    """Start ``candidates`` for every index on the RETRIEVAL pool.
+
+    Retrieval itself usually runs on that pool, so waiting there for queued
+    jobs could wait on ourselves: a worker searches the first index on its
+    own thread and takes back any job no other worker has started. Indexes
+    the pool turns away are searched inline as well.
+    """
+    pool = executors.get_executor(executors.RETRIEVAL)
+    nested = pool.in_worker()
+    items = list(indexes.items())
+    futures: dict[concurrent.futures.Future, str] = {}
+    inline: List[str] = [items[0][0]] if nested else []
+    for name, index in items[len(inline):]:
+        try:
+            futures[pool.submit(index.candidates, query, depth)] = name
+        except executors.ExecutorSaturated:
+            inline.append(name)
+    for name in inline:
+        futures[_run_inline(indexes[name], query, depth)] = name
+    if nested:
+        for future, name in list(futures.items()):
+            if future.cancel():
+                del futures[future]
+                futures[_run_inline(indexes[name], query, depth)] = name
+    return futures
+
+
+def _search(query: str, k: int) -> tuple[List[RagHit], bool]:
+    indexes = get_indexes()
+    if len(indexes) <= 1:
+        return [hit for index in indexes.values() for hit in index.search(query, k=k)], True
+
+    diverse = MMR_LAMBDA < 1.0
+    depth = max(k, RRF_CANDIDATES, MMR_CANDIDATES if diverse else 0)
+    started = time.monotonic()
+    futures = _submit_candidates(indexes, query, depth)
+    timeout = None
+    if RETRIEVAL_BUDGET_MS > 0:
+        timeout = max(0.0, RETRIEVAL_BUDGET_MS / 1000.0 - (time.monotonic() - started))
+    done, pending = concurrent.futures.wait(futures, timeout=timeout)
+    complete = not pending
+    for future in pending:
+        future.cancel()
+        logger.info("RAG index '%s' missed the %.0f ms retrieval budget.", futures[future], RETRIEVAL_BUDGET_MS)
+
+    # (index, chunk id, hit, weighted margin over that index's floor) per candidate.
+    pool: List[Tuple[RagIndex, int, RagHit, float]] = []
+    rankings: List[List[int]] = []
+    weights: List[float] = []
+    for future, name in futures.items():
+        if future not in done:
+            continue
+        try:
+            ranked = future.result()
+        except Exception as exc:
+            logger.warning("RAG retrieval from '%s' index failed: %s", name, exc)
+            complete = False
+            continue
+        weight = INDEX_WEIGHTS.get(name, 1.0)
+        floor = indexes[name].min_similarity
+        rankings.append(list(range(len(pool), len(pool) + len(ranked))))
+        weights.append(weight)
+        index = indexes[name]
+        pool.extend((index, idx, hit, weight * (hit.similarity - floor)) for idx, hit in ranked)
+
+    merged: List[Tuple[RagIndex, int, RagHit, float]] = []
+    seen: set[str] = set()
+    for pos, score in reciprocal_rank_scores(rankings, k=RRF_K, weights=weights):
+        index, idx, hit, margin = pool[pos]
+        # A character source that copies a global page should not fill two slots.
+        if hit.entry.text in seen:
+            continue
+        seen.add(hit.entry.text)
+        merged.append((index, idx, RagHit(hit.entry, score, hit.similarity), margin))
+    # The relative cutoff compares weighted margins across indexes, so a weak
+    # hit cannot pass, or outrank a better one, just because its own index
+    # had nothing better.
+    cutoff = RELATIVE_SIMILARITY * max((margin for *_, margin in merged), default=0.0)
+    ranked = [(index, idx, hit) for index, idx, hit, margin in merged if margin >= cutoff]
+    if diverse and len(ranked) > k:
+        ranked = diversify(ranked[:MMR_CANDIDATES], k)
+    return [hit for _, _, hit in ranked[:k]], complete
+
+
+def retrieve_context(query: str, k: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    max_chars = MAX_CONTEXT_CHARS if max_chars is None else max_chars
     try:
-        entries = index.retrieve(query, k=k)
+        hits = search(query, k=k)
     except Exception as exc:
         logger.warning("RAG retrieval failed: %s", exc)
         return ""
-    if not entries:
-        return ""
-    context_chunks: List[str] = []
-    remaining = max_chars
-    for entry in entries:
-        if remaining <= 0:
-            break
-        snippet = entry.text.strip()
-        if not snippet:
-            continue
-        if len(snippet) > remaining:
-            snippet = snippet[:remaining]
-        context_chunks.append(snippet)
-        remaining -= len(snippet)
-    return "\n\n".join(context_chunks)
+    return pack_context(hits, max_chars)
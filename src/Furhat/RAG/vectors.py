@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import operator
+import re
+from array import array
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+
+
+STORAGE_FLOAT32 = "float32"
+STORAGE_INT8 = "int8"
+VECTOR_STORAGES = (STORAGE_FLOAT32, STORAGE_INT8)
+
+_INT8_MAX = 127
+
+
+def normalize_storage(storage: str) -> str:
+    value = str(storage).strip().lower() or STORAGE_FLOAT32
+    if value not in VECTOR_STORAGES:
+        raise ValueError(
+            f"Unsupported vector storage '{storage}'. Choose one of: {', '.join(VECTOR_STORAGES)}."
+        )
+    return value
+
+
+def _flatten(rows: Sequence[Sequence[float]]) -> tuple[array, int]:
+    dim = len(rows[0]) if rows else 0
+    data = array("f")
+    for row in rows:
+        if len(row) != dim:
+            raise ValueError("All embeddings in an index must have the same dimension.")
+        data.extend(row)
+    return data, dim
+
+
+class Float32Store:
+    """Row-major float32 vectors in one flat array (4 bytes per dimension)."""
+
+    storage = STORAGE_FLOAT32
+    quantized = False
+
+    def __init__(self, data: array, dim: int) -> None:
+        self.data = data
+        self.dim = int(dim)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[float]]) -> "Float32Store":
+        data, dim = _flatten(rows)
+        return cls(data, dim)
+
+    def __len__(self) -> int:
+        return len(self.data) // self.dim if self.dim else 0
+
+    def __getitem__(self, idx: int) -> list[float]:
+        start = idx * self.dim
+        return self.data[start : start + self.dim].tolist()
+
+    def __iter__(self) -> Iterator[list[float]]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def dot(self, idx: int, query: Sequence[float]) -> float:
+        start = idx * self.dim
+        return sum(map(operator.mul, self.data[start : start + self.dim], query))
+
+    def dot_sparse(self, idx: int, nonzero: Sequence[tuple[int, float]]) -> float:
+        start = idx * self.dim
+        data = self.data
+        return sum(data[start + i] * value for i, value in nonzero)
+
+    def scaled_row(self, idx: int) -> tuple[float, list[float]]:
+        """``(scale, values)`` with ``self[idx] == scale * values``."""
+        return 1.0, self[idx]
+
+    def memory_bytes(self) -> int:
+        return self.data.itemsize * len(self.data)
+
+    def to_payload(self) -> dict[str, object]:
+        return {"storage": self.storage, "dim": self.dim, "data": self.data}
+
+
+class Int8Store:
+    """Symmetric per-vector int8 quantization (1 byte per dimension plus one scale).
+
+    Each row is stored as ``round(v / scale)`` with ``scale = max(|v|) / 127``.
+    When the float32 originals were written to a sidecar file they are
+    memory-mapped, so ``exact_dot`` can re-score a handful of candidates
+    without keeping the full-precision vectors resident. Each build names its
+    sidecar after a hash of the rows (see ``exact_sidecar_path``), so an index
+    never maps the originals of another build.
+    """
+
+    storage = STORAGE_INT8
+    quantized = True
+
+    def __init__(self, codes: array, scales: array, dim: int, *, exact_path: Path | None = None) -> None:
+        self.codes = codes
+        self.scales = scales
+        self.dim = int(dim)
+        self.exact_path = exact_path
+        self._exact: mmap.mmap | None = None
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[float]]) -> "Int8Store":
+        dim = len(rows[0]) if rows else 0
+        codes = array("b")
+        scales = array("f")
+        for row in rows:
+            if len(row) != dim:
+                raise ValueError("All embeddings in an index must have the same dimension.")
+            peak = max((abs(value) for value in row), default=0.0)
+            scale = peak / _INT8_MAX if peak else 1.0
+            scales.append(scale)
+            codes.extend(max(-_INT8_MAX, min(_INT8_MAX, round(value / scale))) for value in row)
+        return cls(codes, scales, dim)
+
+    def __len__(self) -> int:
+        return len(self.scales)
+
+    def __getitem__(self, idx: int) -> list[float]:
+        start = idx * self.dim
+        scale = self.scales[idx]
+        return [code * scale for code in self.codes[start : start + self.dim]]
+
+    def __iter__(self) -> Iterator[list[float]]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def dot(self, idx: int, query: Sequence[float]) -> float:
+        start = idx * self.dim
+        return self.scales[idx] * sum(map(operator.mul, self.codes[start : start + self.dim], query))
+
+    def dot_sparse(self, idx: int, nonzero: Sequence[tuple[int, float]]) -> float:
+        start = idx * self.dim
+        codes = self.codes
+        return self.scales[idx] * sum(codes[start + i] * value for i, value in nonzero)
+
+    def scaled_row(self, idx: int) -> tuple[float, list[int]]:
+        """``(scale, codes)`` for row ``idx``, read without dequantizing."""
+        start = idx * self.dim
+        return self.scales[idx], self.codes[start : start + self.dim].tolist()
+
+    def _map_exact(self) -> mmap.mmap:
+        exact = self._exact
+        if exact is None:
+            if self.exact_path is None:
+                raise FileNotFoundError("Index has no float32 sidecar.")
+            with self.exact_path.open("rb") as handle:
+                exact = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(exact) != len(self.codes) * 4:
+                exact.close()
+                raise ValueError(f"Sidecar {self.exact_path.name} does not match its index.")
+            self._exact = exact
+        return exact
+
+    @property
+    def has_exact(self) -> bool:
+        # Maps the sidecar on first use; a missing or mismatched one is ignored rather than misread.
+        try:
+            self._map_exact()
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def exact_row(self, idx: int) -> array:
+        exact = self._map_exact()
+        width = self.dim * 4
+        row = array("f")
+        row.frombytes(exact[idx * width : (idx + 1) * width])
+        return row
+
+    def exact_dot(self, idx: int, query: Sequence[float]) -> float:
+        return sum(map(operator.mul, self.exact_row(idx), query))
+
+    def close(self) -> None:
+        if self._exact is not None:
+            self._exact.close()
+            self._exact = None
+
+    def memory_bytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + self.scales.itemsize * len(self.scales)
+
+    def to_payload(self) -> dict[str, object]:
+        return {"storage": self.storage, "dim": self.dim, "codes": self.codes, "scales": self.scales}
+
+
+VectorStore = Float32Store | Int8Store
+
+
+def exact_build_id(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def exact_sidecar_path(index_path: Path, build_id: str = "") -> Path:
+    """``<index>.<build_id>.f32``; without a build id, the legacy ``<index>.f32``.
+
+    A rebuild writes a new file next to the old one instead of replacing it,
+    which Windows refuses while a reader has the old one mapped.
+    """
+    return index_path.with_suffix(f".{build_id}.f32" if build_id else ".f32")
+
+
+def stale_exact_sidecars(index_path: Path, keep: Path | None = None) -> list[Path]:
+    """Sidecars of earlier builds of ``index_path``, other than ``keep``."""
+    pattern = re.compile(rf"{re.escape(index_path.stem)}(\.[0-9a-f]{{16}})?\.f32")
+    return [
+        path
+        for path in index_path.parent.glob(f"{index_path.stem}*.f32")
+        if pattern.fullmatch(path.name) and path != keep
+    ]
+
+
+def exact_sidecar_bytes(rows: Sequence[Sequence[float]]) -> bytes:
+    data, _ = _flatten(rows)
+    return data.tobytes()
+
+
+def write_exact_sidecar(path: Path, rows: Sequence[Sequence[float]]) -> None:
+    path.write_bytes(exact_sidecar_bytes(rows))
+
+
+def create_store(rows: Sequence[Sequence[float]], storage: str = STORAGE_FLOAT32) -> VectorStore:
+    if normalize_storage(storage) == STORAGE_INT8:
+        return Int8Store.from_rows(rows)
+    return Float32Store.from_rows(rows)
+
+
+def store_from_payload(payload: Mapping[str, object], index_path: Path | None = None) -> VectorStore:
+    """Read the ``vectors`` block of an index, or the legacy ``embeddings`` lists."""
+    block = payload.get("vectors")
+    if isinstance(block, Mapping):
+        dim = int(block.get("dim", 0))
+        if block.get("storage") == STORAGE_INT8:
+            exact_path = None
+            if index_path is not None:
+                exact_path = exact_sidecar_path(index_path, str(block.get("exact_build", "")))
+            return Int8Store(block["codes"], block["scales"], dim, exact_path=exact_path)  # type: ignore[arg-type]
+        return Float32Store(block["data"], dim)  # type: ignore[arg-type]
+    return Float32Store.from_rows(payload.get("embeddings", []))  # type: ignore[arg-type]
+
+
+def vector_norms(store: VectorStore) -> list[float]:
+    return [math.sqrt(store.dot(idx, row)) for idx, row in enumerate(store)]
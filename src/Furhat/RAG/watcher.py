@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import logging
+import os
+import select
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .. import executors
+from . import builder, retriever
+from .config import CORPUS_WATCH_SEC, DATA_DIR, INDEX_PATH, INDEX_WATCH_SEC
+
+
+logger = logging.getLogger(__name__)
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class IndexWatcher:
+    """Hot-swaps the active index when its file is rebuilt by another process.
+
+    Each poll is a ``stat`` of every active index. A changed file is only
+    loaded once its manifest checksum matches, and the swap goes through
+    ``retriever.reload_index`` so requests keep the old index until then.
+    """
+
+    def __init__(self) -> None:
+        self._stamps: dict[str, tuple[Path, tuple[int, int]]] = {}
+
+    def check(self) -> bool:
+        swapped = False
+        for name, path in retriever.index_paths().items():
+            stamp = _file_stamp(path)
+            if stamp is None or self._stamps.get(name) == (path, stamp):
+                continue
+            if not builder.index_is_published(path):
+                continue
+            before = retriever.get_index(name)
+            index = retriever.reload_index(name)
+            self._stamps[name] = (path, stamp)
+            if index is not None and index is not before:
+                logger.info("Hot-swapped %s RAG index %s (%s chunks).", name, path, len(index.entries))
+                swapped = True
+        return swapped
+
+    async def watch(self) -> None:
+        if INDEX_WATCH_SEC <= 0:
+            return
+        while True:
+            try:
+                await executors.run(executors.FILE_IO, self.check)
+            except Exception as exc:
+                logger.warning("RAG index watch failed: %s", exc)
+            await asyncio.sleep(INDEX_WATCH_SEC)
+
+
+# A corpus change is indexed once it has looked the same for this long.
+CORPUS_SETTLE_SEC = 0.5
+
+# IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_MASK = 0x002 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+
+
+class _Inotify:
+    """Just enough inotify to sleep until something under a directory changes."""
+
+    def __init__(self, fd: int, libc: ctypes.CDLL) -> None:
+        self._fd = fd
+        self._libc = libc
+
+    @classmethod
+    def open(cls) -> Optional["_Inotify"]:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        return cls(fd, libc) if fd >= 0 else None
+
+    def watch_tree(self, root: Path) -> None:
+        # Re-adding an existing watch is a no-op, so new subdirectories are picked up here.
+        for directory in [root, *(path for path in root.rglob("*") if path.is_dir())]:
+            self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _INOTIFY_MASK)
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class CorpusWatcher:
+    """Keeps an index in step with the ``.txt`` files under a data directory.
+
+    Changes are found by stat-ing every file, woken early by inotify where
+    the platform has it. A change is indexed once two scans agree, so a file
+    still being copied in is not embedded half-written, and only the files
+    that changed are re-embedded (see ``builder.update_index``).
+    """
+
+    def __init__(self, data_dir: Path | None = None, output: Path | None = None) -> None:
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self.output = Path(output or INDEX_PATH)
+        self._indexed: dict[str, tuple[int, int]] | None = None
+        self._pending: dict[str, tuple[int, int]] | None = None
+
+    @property
+    def settling(self) -> bool:
+        return self._pending is not None
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        stamps: dict[str, tuple[int, int]] = {}
+        for path in self.data_dir.rglob("*.txt"):
+            stamp = _file_stamp(path)
+            if stamp is not None:
+                stamps[str(path.relative_to(self.data_dir))] = stamp
+        return stamps
+
+    def check(self) -> Optional[builder.IndexUpdate]:
+        stamps = self.scan()
+        if stamps == self._indexed:
+            self._pending = None
+            return None
+        if stamps != self._pending:
+            self._pending = stamps
+            return None
+        update = builder.update_index(data_dir=self.data_dir, output=self.output)
+        self._indexed, self._pending = stamps, None
+        if update.written:
+            for name, path in retriever.index_paths().items():
+                if path.resolve() == self.output.resolve():
+                    retriever.reload_index(name)
+        return update
+
+    async def watch(self) -> None:
+        if CORPUS_WATCH_SEC <= 0:
+            return
+        notifier = _Inotify.open()
+        try:
+            while True:
+                try:
+                    update = await executors.run(executors.RAG_BUILD, self.check)
+                    if update is not None and update.written:
+                        logger.info(
+                            "Re-indexed %s: %s added, %s changed, %s removed.",
+                            self.data_dir,
+                            len(update.added),
+                            len(update.changed),
+                            len(update.removed),
+                        )
+                except Exception as exc:
+                    logger.warning("RAG corpus update failed: %s", exc)
+                timeout = CORPUS_SETTLE_SEC if self.settling else CORPUS_WATCH_SEC
+                if notifier is None or not self.data_dir.is_dir():
+                    await asyncio.sleep(timeout)
+                else:
+                    notifier.watch_tree(self.data_dir)
+                    # Mostly asleep in select(), so it stays off the bounded pools.
+                    await asyncio.to_thread(notifier.wait, timeout)
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+
+index_watcher = IndexWatcher()
+corpus_watcher = CorpusWatcher()
+
+
+async def watch_indexes() -> None:
+    await asyncio.gather(index_watcher.watch(), corpus_watcher.watch())
@@ -30,6 +30,10 @@ def get_runtime_status() -> dict[str, object]:
     return runtime.get_runtime_status()
 
 
+def get_llm_scheduler_stats() -> dict[str, dict[str, object]]:
+    return runtime.get_llm_scheduler_stats()
+
+
 def get_transcript() -> list[dict[str, object]]:
     return runtime.get_transcript()
 
@@ -7,15 +7,18 @@ import os
 import random
 import threading
 import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Optional
 
 from furhat_realtime_api import Events
 
-from .. import settings_store
+from .. import executors, settings_store
 from ..Character import loader as character_loader
-from ..RAG import prompting, retriever
+from ..RAG import prompting, retriever, watcher
+from ..RAG.embeddings import BACKEND_OLLAMA
 from ..Ollama import chatbot as Ollama
+from ..Ollama import residency, scheduler
 from . import config as robot_config
 from .client import FurhatClientFactory, FurhatClientProtocol, create_furhat_client
 from . import prompts, text
@@ -84,6 +87,12 @@ def configure_runtime_settings(
     robot_config.USER_LETGO_DEBOUNCER_SECONDS = float(user_letgo_debouncer_seconds)
 
 
+@dataclass(slots=True)
+class _InflightReply:
+    task: asyncio.Task[tuple[str, str]]
+    session_ids: set[int] = field(default_factory=set)
+
+
 class RobotRuntime:
     def __init__(
         self,
@@ -104,7 +113,7 @@ class RobotRuntime:
         self.voice_config = VoiceConfig()
         self.character_info = CharacterInfo()
         self.runtime_status = RuntimeStatus()
-        self.ollama_semaphore = asyncio.Semaphore(OLLAMA_MAX_CONCURRENT)
+        self.llm_scheduler = scheduler.LlmScheduler(OLLAMA_MAX_CONCURRENT)
         self.transcript: list[TranscriptTurn] = []
         self.next_turn_id = 1
         self.pending_listen_channel = "desktop"
@@ -113,6 +122,11 @@ class RobotRuntime:
         self.active_session_id: int | None = None
         self.cancelled_session_ids: set[int] = set()
         self.last_completed_response = ""
+        self.inflight_replies: dict[tuple[str, str, str, int], _InflightReply] = {}
+        self.coalesced_requests = 0
+        self.residency_task: asyncio.Task[None] | None = None
+        self.index_watch_task: asyncio.Task[None] | None = None
+        self.settings_watch_task: asyncio.Task[None] | None = None
         self._init_client(robot_config.IP)
 
     def _init_client(self, ip_address: str) -> None:
@@ -239,6 +253,9 @@ class RobotRuntime:
     def get_runtime_status(self) -> dict[str, object]:
         return self.runtime_status.to_dict()
 
+    def get_llm_scheduler_stats(self) -> dict[str, dict[str, object]]:
+        return self.llm_scheduler.stats()
+
     def get_transcript(self) -> list[dict[str, object]]:
         return [turn.to_dict() for turn in self.transcript]
 
@@ -489,13 +506,50 @@ class RobotRuntime:
         while True:
             await asyncio.sleep(1)
 
+    def _resident_models(self) -> tuple[str, str]:
+        chat_model = Ollama.get_model() if Ollama.is_ollama_provider() else ""
+        for index in retriever.get_indexes().values():
+            if index.embedder.name == BACKEND_OLLAMA:
+                return chat_model, index.model
+        return chat_model, ""
+
+    def start_model_residency(self) -> asyncio.Task[None]:
+        if self.residency_task is None or self.residency_task.done():
+            self.residency_task = asyncio.create_task(
+                residency.residency_manager.keep_warm(
+                    Ollama.client,
+                    self._resident_models,
+                    slot=lambda: self.llm_scheduler.slot(scheduler.BACKGROUND),
+                )
+            )
+        return self.residency_task
+
+    def start_index_watch(self) -> asyncio.Task[None]:
+        if self.index_watch_task is None or self.index_watch_task.done():
+            self.index_watch_task = asyncio.create_task(watcher.watch_indexes())
+        return self.index_watch_task
+
+    def start_settings_watch(self) -> asyncio.Task[None]:
+        if self.settings_watch_task is None or self.settings_watch_task.done():
+            self.settings_watch_task = asyncio.create_task(settings_store.watch_settings())
+        return self.settings_watch_task
+
     async def setup(self) -> None:
         settings = self.load_runtime_settings()
         self.load_startup_character(settings)
-        await self.connect_until_ready()
+        # Model loading runs alongside the robot connection instead of on the first turn.
+        residency_task = self.start_model_residency()
+        index_watch_task = self.start_index_watch()
+        settings_watch_task = self.start_settings_watch()
+        try:
+            await self.connect_until_ready()
 
-        print("Ready")
-        await self.run_idle_loop()
+            print("Ready")
+            await self.run_idle_loop()
+        finally:
+            residency_task.cancel()
+            index_watch_task.cancel()
+            settings_watch_task.cancel()
 
     async def _async_disconnect(self, client: FurhatClientProtocol | None = None) -> None:
         target = client or self.furhat
@@ -694,6 +748,94 @@ class RobotRuntime:
         await self._speak_direct_output(greeting)
         self._notify("replayed greeting")
 
+    def _coalesce_key(self, prompt: str) -> tuple[str, str, str, int]:
+        normalized = " ".join(prompt.casefold().split())
+        return (
+            normalized,
+            self.character_info.char_id,
+            str(Ollama.get_model()),
+            retriever.get_index_version(),
+        )
+
+    async def _shared_reply(
+        self,
+        prompt: str,
+        session_id: int,
+        priority: str = scheduler.INTERACTIVE_DESKTOP,
+    ) -> tuple[str, str, bool]:
+        key = self._coalesce_key(prompt)
+        inflight = self.inflight_replies.get(key)
+        coalesced = inflight is not None
+        if inflight is None:
+            inflight = _InflightReply(task=asyncio.create_task(self._generate_reply(prompt, key, priority)))
+            self.inflight_replies[key] = inflight
+
+            def _forget(task: asyncio.Task[tuple[str, str]]) -> None:
+                current = self.inflight_replies.get(key)
+                if current is not None and current.task is task:
+                    del self.inflight_replies[key]
+
+            inflight.task.add_done_callback(_forget)
+        else:
+            self.coalesced_requests += 1
+            logger.info("Joined in-flight reply (%d waiting).", len(inflight.session_ids) + 1)
+        inflight.session_ids.add(session_id)
+        try:
+            say_text, error_text = await asyncio.shield(inflight.task)
+        except asyncio.CancelledError:
+            inflight.session_ids.discard(session_id)
+            raise
+        return say_text, error_text, coalesced
+
+    async def _generate_reply(
+        self,
+        prompt: str,
+        key: tuple[str, str, str, int],
+        priority: str = scheduler.INTERACTIVE_DESKTOP,
+    ) -> tuple[str, str]:
+        try:
+            context = await asyncio.wait_for(
+                executors.run(executors.RETRIEVAL, retriever.retrieve_context, prompt),
+                timeout=RAG_RETRIEVAL_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("RAG retrieval timed out.")
+            self._notify("rag timeout")
+            context = ""
+        except executors.ExecutorSaturated as exc:
+            logger.warning("RAG retrieval skipped: %s", exc)
+            self._notify("rag busy")
+            context = ""
+        except Exception as exc:
+            logger.warning("RAG retrieval failed: %s", exc)
+            context = ""
+
+        inflight = self.inflight_replies.get(key)
+        if inflight is not None and all(self._is_session_cancelled(sid) for sid in inflight.session_ids):
+            return "", ""
+
+        rag_prompt = prompting.build_prompt(prompt, context)
+
+        try:
+            async with self.llm_scheduler.slot(priority):
+                say_text = await asyncio.wait_for(
+                    Ollama.get_reply(rag_prompt),
+                    timeout=OLLAMA_RESPONSE_TIMEOUT,
+                )
+        except asyncio.TimeoutError:
+            logger.warning("Ollama request timed out.")
+            self._notify("ollama timeout")
+            return "", "ollama timeout"
+        except executors.ExecutorSaturated as exc:
+            logger.warning("Ollama request rejected: %s", exc)
+            self._notify("ollama busy")
+            return "", "ollama busy"
+        except Exception as exc:
+            logger.exception("Ollama request failed")
+            self._notify(f"ollama error: {exc}")
+            return "", str(exc)
+        return say_text, ""
+
     async def speak_from_prompt(
         self,
         prompt: str,
@@ -740,41 +882,11 @@ class RobotRuntime:
                 thinking_task = asyncio.create_task(_maybe_think())
 
             try:
-                context = await asyncio.wait_for(
-                    asyncio.to_thread(retriever.retrieve_context, prompt),
-                    timeout=RAG_RETRIEVAL_TIMEOUT,
+                say_text, error_text, turn.coalesced = await self._shared_reply(
+                    prompt,
+                    session_id,
+                    scheduler.priority_for_channel(channel),
                 )
-            except asyncio.TimeoutError:
-                logger.warning("RAG retrieval timed out.")
-                self._notify("rag timeout")
-                context = ""
-            except Exception as exc:
-                logger.warning("RAG retrieval failed: %s", exc)
-                context = ""
-
-            if self._is_session_cancelled(session_id):
-                turn.status = "cancelled"
-                turn.error = "stopped"
-                return
-
-            rag_prompt = prompting.build_prompt(prompt, context)
-
-            try:
-                async with self.ollama_semaphore:
-                    say_text = await asyncio.wait_for(
-                        asyncio.to_thread(Ollama.get_full_response, rag_prompt),
-                        timeout=OLLAMA_RESPONSE_TIMEOUT,
-                    )
-            except asyncio.TimeoutError:
-                logger.warning("Ollama request timed out.")
-                self._notify("ollama timeout")
-                say_text = ""
-                error_text = "ollama timeout"
-            except Exception as exc:
-                logger.exception("Ollama request failed")
-                self._notify(f"ollama error: {exc}")
-                say_text = ""
-                error_text = str(exc)
             finally:
                 response_ready.set()
                 if thinking_task and not thinking_task.done():
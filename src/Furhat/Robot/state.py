@@ -94,6 +94,7 @@ class TranscriptTurn:
     model: str = ""
     status: str = "empty"
     error: str = ""
+    coalesced: bool = False
 
     def to_dict(self) -> dict[str, object]:
         return {
@@ -108,4 +109,5 @@ class TranscriptTurn:
             "model": self.model,
             "status": self.status,
             "error": self.error,
+            "coalesced": self.coalesced,
         }
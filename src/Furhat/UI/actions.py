@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import os
 import subprocess
 import sys
@@ -11,24 +12,20 @@ import webbrowser
 from pathlib import Path
 from tkinter import filedialog
 
-from .. import paths, presets_store, settings_store
+from .. import app_settings, paths, presets_store, settings_store
+from ..executors import executor_stats
 from ..Character import loader as character_loader
 from ..Ollama import chatbot
 from ..Robot import robot
-from ..RAG.builder import set_build_settings
-from ..RAG.retriever import set_retrieval_settings
-from ..Robot.runtime import configure_runtime_settings
-from ..Robot.text import set_speech_limits
-from ..Web.server import set_public_settings
+from ..RAG.retriever import cache_stats
+from ..Web.server import get_public_rate_limit_stats
 from ..settings_store import (
     AppSettings,
     ChatSettings,
     ListenSettings,
-    RagSettings,
     RuntimeSettings,
     SpeechSettings,
     VoiceSettings,
-    WebSettings,
 )
 from . import support
 from .state import UIState
@@ -42,6 +39,9 @@ class UIActions:
         self._preset_loaded_source_text = ""
         self._preset_loaded_mtime: float | None = None
         self._available_models: list[str] = []
+        self._model_request_id = 0
+        # Last loaded or saved settings; carries fields that have no widget in the UI.
+        self._settings_base = AppSettings()
 
     def bind(self) -> None:
         robot.set_log_callback(lambda message: self.state.root.after(0, self.handle_robot_log, message))
@@ -49,6 +49,9 @@ class UIActions:
             robot.set_listen_button_enabled_callback(self._set_listen_button_enabled)
         except Exception:
             pass
+        settings_store.subscribe(
+            lambda settings, _path: self.state.root.after(0, self._on_settings_changed, settings)
+        )
 
         self.state.controls.listen_button.bind("<ButtonPress-1>", self.on_button_press)
         self.state.controls.listen_button.bind("<ButtonRelease-1>", self.on_button_release)
@@ -111,7 +114,8 @@ class UIActions:
         self.refresh_character_status()
         self.refresh_rag_status()
         self.reload_preset_from_disk()
-        self.refresh_model_list()
+        chatbot.configure_model_caches(path_root=paths.get_data_root())
+        self.refresh_model_list(force=False)
         self.refresh_runtime_state()
         self.refresh_transcript()
         status = robot.get_runtime_status()
@@ -622,6 +626,12 @@ class UIActions:
             character_info=robot.get_character_info(),
             settings_path=settings_store.get_canonical_settings_path(),
             log_lines=self._get_log_lines(),
+            rag_cache=cache_stats(),
+            executors=executor_stats(),
+            llm_scheduler=robot.get_llm_scheduler_stats(),
+            llm_routes=chatbot.get_route_stats(),
+            external_http=chatbot.get_http_pool_stats(),
+            public_rate_limit=get_public_rate_limit_stats(),
         )
         try:
             output_path = support.write_diagnostics_snapshot(self.state.validation_dir, snapshot)
@@ -755,66 +765,7 @@ class UIActions:
         chatbot.set_temperature(identity[4])
 
     def _apply_live_settings(self, settings: AppSettings) -> None:
-        chatbot.load_saved_settings(
-            settings.model,
-            settings.temperature,
-            settings.provider,
-            settings.api_base_url,
-            settings.api_key,
-        )
-        chatbot.configure_chat_settings(
-            max_tokens=settings.chat.max_tokens,
-            max_history_messages=settings.chat.max_history_messages,
-            max_history_chars=settings.chat.max_history_chars,
-            external_api_timeout=settings.chat.external_api_timeout,
-        )
-        chatbot.set_temperature(settings.temperature)
-        set_speech_limits(
-            settings.speech.max_sentences,
-            settings.speech.max_chars,
-        )
-        configure_runtime_settings(
-            speak_thinking=settings.speech.speak_thinking,
-            thinking_phrases=settings.speech.thinking_phrases,
-            thinking_delay_sec=settings.speech.thinking_delay_sec,
-            thinking_repeat_sec=settings.speech.thinking_repeat_sec,
-            thinking_wait_timeout=settings.speech.thinking_wait_timeout,
-            speak_wait_timeout=settings.speech.speak_wait_timeout,
-            llm_response_timeout=settings.chat.llm_response_timeout,
-            rag_retrieval_timeout=settings.rag.retrieval_timeout,
-            disconnect_timeout=settings.runtime.disconnect_timeout,
-            end_speech_timeout=settings.speech.end_speech_timeout,
-            user_letgo_debouncer_seconds=settings.speech.user_letgo_debouncer_seconds,
-        )
-        set_retrieval_settings(
-            top_k=settings.rag.top_k,
-            max_context_chars=settings.rag.max_context_chars,
-            embed_model=settings.rag.embed_model,
-        )
-        set_build_settings(
-            settings.rag.embed_model,
-            settings.rag.chunk_size,
-            settings.rag.chunk_overlap,
-        )
-        set_public_settings(
-            enabled=settings.web.enabled,
-            port=settings.web.port,
-            max_text_chars=settings.web.public_max_text_chars,
-            cooldown_sec=settings.web.public_cooldown_sec,
-        )
-        robot.set_ip(settings.ip)
-        robot.set_listen_settings(
-            partial=settings.listen.partial,
-            concat=settings.listen.concat,
-            stop_no_speech=settings.listen.stop_no_speech,
-            stop_user_end=settings.listen.stop_user_end,
-            stop_robot_start=settings.listen.stop_robot_start,
-        )
-        robot.set_voice_settings(
-            settings.voice.name,
-            settings.voice.rate,
-            settings.voice.volume,
-        )
+        app_settings.apply_settings(settings)
         self._run_coroutine(robot.apply_voice_settings())
 
     def _finalize_apply_settings(self, settings: AppSettings) -> None:
@@ -829,6 +780,7 @@ class UIActions:
             self._finish_apply_settings()
 
     def on_provider_changed(self) -> None:
+        self._model_request_id += 1
         self._available_models = []
         self.apply_model_filter()
         if self.state.settings.model_results_status_var is not None:
@@ -841,38 +793,62 @@ class UIActions:
                 f"{provider_label} model list not loaded"
             )
 
-    def refresh_model_list(self) -> None:
-        previous_identity = self._chatbot_identity()
+    def refresh_model_list(self, *, force: bool = True) -> None:
         current_model = self.state.settings.model_value.get().strip() or chatbot.get_model()
-        current_temperature = float(self.state.settings.temperature_value.get())
         provider = self._selected_provider()
         api_base_url = self._selected_api_base_url()
-        api_key = self._selected_api_key()
         try:
-            chatbot.load_saved_settings(
-                current_model,
-                current_temperature,
-                provider,
-                api_base_url,
-                api_key,
-            )
-            models = chatbot.list_models()
+            catalog_base_url = chatbot.catalog_base_url(provider, api_base_url)
         except Exception as exc:
             self.state.flash_status(f"model list error: {exc}", "#f87171", duration_ms=5000)
-            if provider == getattr(chatbot, "PROVIDER_OLLAMA", "ollama"):
+            return
+        self._model_request_id += 1
+        request_id = self._model_request_id
+
+        cached = chatbot.model_catalog.cached(provider, catalog_base_url)
+        if cached is not None:
+            self._set_available_models(list(cached.models), current_model)
+        elif self.state.settings.model_results_status_var is not None:
+            self.state.settings.model_results_status_var.set("Loading models...")
+
+        chatbot.model_catalog.get_models_async(
+            provider,
+            catalog_base_url,
+            self._selected_api_key(),
+            lambda models, error: self.state.root.after(
+                0,
+                self._on_model_list_loaded,
+                request_id,
+                provider,
+                models,
+                error,
+            ),
+            refresh=force,
+        )
+
+    def _on_model_list_loaded(
+        self,
+        request_id: int,
+        provider: str,
+        models: list[str],
+        error: Exception | None,
+    ) -> None:
+        if request_id != self._model_request_id:
+            return
+        is_ollama = provider == getattr(chatbot, "PROVIDER_OLLAMA", "ollama")
+        if error is not None:
+            self.state.flash_status(f"model list error: {error}", "#f87171", duration_ms=5000)
+            if is_ollama:
                 self.state.set_ollama_state("offline", "#f87171")
+            if self._available_models:
+                return
             models = []
-        finally:
-            chatbot.load_saved_settings(
-                previous_identity[3],
-                previous_identity[4],
-                previous_identity[0],
-                previous_identity[1],
-                previous_identity[2],
-            )
-        if models:
-            if provider == getattr(chatbot, "PROVIDER_OLLAMA", "ollama"):
-                self.state.set_ollama_state("ok", "#4ade80")
+        elif models and is_ollama:
+            self.state.set_ollama_state("ok", "#4ade80")
+        current_model = self.state.settings.model_value.get().strip() or chatbot.get_model()
+        self._set_available_models(models, current_model)
+
+    def _set_available_models(self, models: list[str], current_model: str) -> None:
         if current_model and current_model not in models:
             models = [current_model, *models]
         self._available_models = models
@@ -1013,19 +989,10 @@ class UIActions:
         self,
     ) -> tuple[Path, str, float | None, presets_store.PresetFile | None, str]:
         path = presets_store.ensure_preset_file(path=self._preset_path)
-        try:
-            raw_text = path.read_text(encoding="utf-8")
-        except Exception as exc:
-            return path, "", None, None, str(exc)
-        try:
-            mtime = path.stat().st_mtime
-        except Exception:
-            mtime = None
-        try:
-            preset_file = presets_store.parse_preset_text(raw_text)
-        except Exception as exc:
-            return path, raw_text, mtime, None, str(exc)
-        return path, raw_text, mtime, preset_file, ""
+        snapshot = presets_store.get_preset_snapshot(path=path)
+        if snapshot.error:
+            return path, snapshot.raw_text, snapshot.mtime, None, snapshot.error
+        return path, snapshot.raw_text, snapshot.mtime, snapshot.to_preset_file(), ""
 
     def reload_preset_from_disk(
         self,
@@ -1174,7 +1141,8 @@ class UIActions:
                 end_speech_timeout=end_speech_timeout,
                 user_letgo_debouncer_seconds=listen_release_debounce,
             ),
-            rag=RagSettings(
+            rag=dataclasses.replace(
+                self._settings_base.rag,
                 embed_model=rag_embed_model,
                 top_k=rag_top_k,
                 max_context_chars=rag_max_context_chars,
@@ -1182,7 +1150,8 @@ class UIActions:
                 chunk_overlap=rag_chunk_overlap,
                 retrieval_timeout=rag_retrieval_timeout,
             ),
-            web=WebSettings(
+            web=dataclasses.replace(
+                self._settings_base.web,
                 enabled=self.state.settings.web_enabled_value.get(),
                 port=web_port,
                 public_max_text_chars=public_max_text_chars,
@@ -1287,9 +1256,24 @@ class UIActions:
         self.state.set_robot_state("connecting...", "#fbbf24")
         self._run_coroutine(robot.reconnect())
 
+    def _on_settings_changed(self, settings: AppSettings) -> None:
+        # Our own saves come back here too; only edits made elsewhere need applying.
+        if settings == self._settings_base or self.state.applying_settings:
+            return
+        self._settings_base = settings
+        try:
+            self._apply_live_settings(settings)
+        except Exception as exc:
+            self.state.flash_status(f"settings reload error: {exc}", "#f87171", duration_ms=5000)
+            return
+        self._show_settings(settings)
+        self.state.flash_status("settings reloaded from disk", "#4ade80")
+
     def save_settings(self, settings: AppSettings | None = None) -> None:
         try:
-            settings_store.save_settings(settings or self._build_settings())
+            settings = settings or self._build_settings()
+            settings_store.save_settings(settings)
+            self._settings_base = settings
         except Exception as exc:
             self.state.flash_status(f"settings save error: {exc}", "#f87171", duration_ms=5000)
 
@@ -1300,59 +1284,11 @@ class UIActions:
             self.state.set_status(f"settings load error: {exc}", "#f87171")
             return
 
-        chatbot.load_saved_settings(
-            settings.model,
-            settings.temperature,
-            settings.provider,
-            settings.api_base_url,
-            settings.api_key,
-        )
-        chatbot.configure_chat_settings(
-            max_tokens=settings.chat.max_tokens,
-            max_history_messages=settings.chat.max_history_messages,
-            max_history_chars=settings.chat.max_history_chars,
-            external_api_timeout=settings.chat.external_api_timeout,
-        )
-        chatbot.set_temperature(settings.temperature)
-        set_speech_limits(settings.speech.max_sentences, settings.speech.max_chars)
-        configure_runtime_settings(
-            speak_thinking=settings.speech.speak_thinking,
-            thinking_phrases=settings.speech.thinking_phrases,
-            thinking_delay_sec=settings.speech.thinking_delay_sec,
-            thinking_repeat_sec=settings.speech.thinking_repeat_sec,
-            thinking_wait_timeout=settings.speech.thinking_wait_timeout,
-            speak_wait_timeout=settings.speech.speak_wait_timeout,
-            llm_response_timeout=settings.chat.llm_response_timeout,
-            rag_retrieval_timeout=settings.rag.retrieval_timeout,
-            disconnect_timeout=settings.runtime.disconnect_timeout,
-            end_speech_timeout=settings.speech.end_speech_timeout,
-            user_letgo_debouncer_seconds=settings.speech.user_letgo_debouncer_seconds,
-        )
-        set_retrieval_settings(
-            top_k=settings.rag.top_k,
-            max_context_chars=settings.rag.max_context_chars,
-            embed_model=settings.rag.embed_model,
-        )
-        set_build_settings(
-            settings.rag.embed_model,
-            settings.rag.chunk_size,
-            settings.rag.chunk_overlap,
-        )
-        set_public_settings(
-            enabled=settings.web.enabled,
-            port=settings.web.port,
-            max_text_chars=settings.web.public_max_text_chars,
-            cooldown_sec=settings.web.public_cooldown_sec,
-        )
-        robot.set_ip(settings.ip)
-        robot.set_listen_settings(
-            partial=settings.listen.partial,
-            concat=settings.listen.concat,
-            stop_no_speech=settings.listen.stop_no_speech,
-            stop_user_end=settings.listen.stop_user_end,
-            stop_robot_start=settings.listen.stop_robot_start,
-        )
-        robot.set_voice_settings(settings.voice.name, settings.voice.rate, settings.voice.volume)
+        self._settings_base = settings
+        app_settings.apply_settings(settings)
+        self._show_settings(settings)
+
+    def _show_settings(self, settings: AppSettings) -> None:
         if self.state.settings.provider_value is not None:
             self.state.settings.provider_value.set(settings.provider)
         if self.state.settings.api_base_url_value is not None:
@@ -43,6 +43,12 @@ def build_diagnostics_snapshot(
     character_info: Mapping[str, object],
     settings_path: Path,
     log_lines: Iterable[str],
+    rag_cache: Mapping[str, object] | None = None,
+    executors: Mapping[str, object] | None = None,
+    llm_scheduler: Mapping[str, object] | None = None,
+    llm_routes: Mapping[str, object] | None = None,
+    external_http: Mapping[str, object] | None = None,
+    public_rate_limit: Mapping[str, object] | None = None,
 ) -> dict[str, object]:
     return {
         "captured_at": datetime.now(timezone.utc).isoformat(),
@@ -54,6 +60,12 @@ def build_diagnostics_snapshot(
         "character_info": dict(character_info),
         "settings_path": str(settings_path),
         "log_lines": list(log_lines),
+        "rag_cache": dict(rag_cache or {}),
+        "executors": dict(executors or {}),
+        "llm_scheduler": dict(llm_scheduler or {}),
+        "llm_routes": dict(llm_routes or {}),
+        "external_http": dict(external_http or {}),
+        "public_rate_limit": dict(public_rate_limit or {}),
     }
 
 
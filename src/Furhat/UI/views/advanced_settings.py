@@ -169,8 +169,8 @@ def build_advanced_settings_view(
     _add_entry_row(rag_section, 2, label="Embed model", variable=settings.rag_embed_model_value, width=28)
     _add_entry_row(rag_section, 3, label="Top-k", variable=settings.rag_top_k_value)
     _add_entry_row(rag_section, 4, label="Max context chars", variable=settings.rag_max_context_chars_value)
-    _add_entry_row(rag_section, 5, label="Chunk size", variable=settings.rag_chunk_size_value)
-    _add_entry_row(rag_section, 6, label="Chunk overlap", variable=settings.rag_chunk_overlap_value)
+    _add_entry_row(rag_section, 5, label="Chunk size (tokens)", variable=settings.rag_chunk_size_value)
+    _add_entry_row(rag_section, 6, label="Chunk overlap (tokens)", variable=settings.rag_chunk_overlap_value)
     _add_entry_row(rag_section, 7, label="Retrieval timeout (sec)", variable=settings.rag_retrieval_timeout_value)
 
     runtime_section = _make_section(
@@ -3,8 +3,12 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import re
+import secrets
 import threading
 import time
+from collections import OrderedDict
+from http.cookies import CookieError, SimpleCookie
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Optional
 from urllib.parse import urlparse
@@ -18,6 +22,13 @@ DEFAULT_PORT = int(os.getenv("WEB_PORT", "7860"))
 WEB_ENABLED = os.getenv("WEB_ENABLED", "1").lower() in {"1", "true", "yes", "y", "on"}
 MAX_PUBLIC_TEXT_CHARS = int(os.getenv("PUBLIC_MAX_TEXT_CHARS", "200"))
 PUBLIC_COOLDOWN_SEC = float(os.getenv("PUBLIC_COOLDOWN_SEC", "2"))
+PUBLIC_RATE_BURST = float(os.getenv("PUBLIC_RATE_BURST", "1"))
+PUBLIC_RATE_MAX_CLIENTS = int(os.getenv("PUBLIC_RATE_MAX_CLIENTS", "1024"))
+PUBLIC_RATE_CLIENTS_PER_IP = int(os.getenv("PUBLIC_RATE_CLIENTS_PER_IP", "4"))
+PUBLIC_DISPATCH_GUARD_SEC = 0.5
+CLIENT_COOKIE_NAME = "furhat_client"
+CLIENT_COOKIE_MAX_AGE_SEC = 7 * 24 * 3600
+_CLIENT_COOKIE_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
 
 
 def set_public_settings(
@@ -26,8 +37,12 @@ def set_public_settings(
     port: int | None = None,
     max_text_chars: int | None = None,
     cooldown_sec: float | None = None,
+    rate_burst: float | None = None,
+    rate_max_clients: int | None = None,
+    rate_clients_per_ip: int | None = None,
 ) -> None:
     global WEB_ENABLED, DEFAULT_PORT, MAX_PUBLIC_TEXT_CHARS, PUBLIC_COOLDOWN_SEC
+    global PUBLIC_RATE_BURST, PUBLIC_RATE_MAX_CLIENTS, PUBLIC_RATE_CLIENTS_PER_IP
     if enabled is not None:
         WEB_ENABLED = bool(enabled)
     if port is not None:
@@ -40,6 +55,24 @@ def set_public_settings(
         if float(cooldown_sec) < 0:
             raise ValueError("Public cooldown must be >= 0.")
         PUBLIC_COOLDOWN_SEC = float(cooldown_sec)
+    if rate_burst is not None:
+        if float(rate_burst) < 1:
+            raise ValueError("Public rate burst must be >= 1.")
+        PUBLIC_RATE_BURST = float(rate_burst)
+    if rate_max_clients is not None:
+        if int(rate_max_clients) <= 0:
+            raise ValueError("Public rate max clients must be > 0.")
+        PUBLIC_RATE_MAX_CLIENTS = int(rate_max_clients)
+    if rate_clients_per_ip is not None:
+        if int(rate_clients_per_ip) <= 0:
+            raise ValueError("Public rate clients per IP must be > 0.")
+        PUBLIC_RATE_CLIENTS_PER_IP = int(rate_clients_per_ip)
+    _PUBLIC_STATE.configure_limits(
+        capacity=PUBLIC_RATE_BURST,
+        refill_sec=PUBLIC_COOLDOWN_SEC,
+        max_clients=PUBLIC_RATE_MAX_CLIENTS,
+        clients_per_address=PUBLIC_RATE_CLIENTS_PER_IP,
+    )
 
 
 HTML = """<!doctype html>
@@ -679,31 +712,251 @@ HTML = """<!doctype html>
 """
 
 
+class _TokenBucket:
+    __slots__ = ("tokens", "updated_at", "rejections")
+
+    def __init__(self, tokens: float, updated_at: float) -> None:
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.rejections = 0
+
+
+class _ClientRateLimiter:
+    """Per-client token buckets kept in an LRU-bounded table.
+
+    Each client earns one token every ``refill_sec`` seconds up to ``capacity``
+    tokens. Lookups, refills and evictions are O(1); the least recently seen
+    client is dropped once ``max_clients`` buckets exist. Callers must hold the
+    owning ``_PublicState.lock``.
+
+    A client key is ``address#cookie``, and the cookie is whatever the browser
+    sends. So each address keeps at most ``clients_per_address`` client
+    buckets, dropping its own oldest first, and also draws from a shared
+    address bucket worth that many clients. Rotating cookies therefore neither
+    evicts other visitors nor buys more than the address limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: float,
+        refill_sec: float,
+        max_clients: int,
+        clients_per_address: int = 4,
+    ) -> None:
+        self.buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+        self.addresses: OrderedDict[str, _TokenBucket] = OrderedDict()
+        self._address_clients: dict[str, OrderedDict[str, None]] = {}
+        self.total_rejections = 0
+        self.evictions = 0
+        self.configure(
+            capacity=capacity,
+            refill_sec=refill_sec,
+            max_clients=max_clients,
+            clients_per_address=clients_per_address,
+        )
+
+    def configure(
+        self,
+        *,
+        capacity: float,
+        refill_sec: float,
+        max_clients: int,
+        clients_per_address: int | None = None,
+    ) -> None:
+        self.capacity = max(1.0, float(capacity))
+        self.refill_sec = max(0.0, float(refill_sec))
+        self.max_clients = max(1, int(max_clients))
+        if clients_per_address is not None:
+            self.clients_per_address = max(1, int(clients_per_address))
+        for bucket in self.buckets.values():
+            bucket.tokens = min(bucket.tokens, self.capacity)
+        for bucket in self.addresses.values():
+            bucket.tokens = min(bucket.tokens, self._address_capacity)
+        for clients in list(self._address_clients.values()):
+            while len(clients) > self.clients_per_address:
+                self._drop(next(iter(clients)))
+        self._evict_overflow()
+
+    @property
+    def _address_capacity(self) -> float:
+        return self.capacity * self.clients_per_address
+
+    @staticmethod
+    def _address(key: str) -> str:
+        return key.partition("#")[0]
+
+    def reset(self) -> None:
+        self.buckets.clear()
+        self.addresses.clear()
+        self._address_clients.clear()
+        self.total_rejections = 0
+        self.evictions = 0
+
+    def _drop(self, key: str) -> None:
+        self.buckets.pop(key, None)
+        address = self._address(key)
+        clients = self._address_clients.get(address)
+        if clients is not None:
+            clients.pop(key, None)
+            if not clients:
+                del self._address_clients[address]
+        self.evictions += 1
+
+    def _evict_overflow(self) -> None:
+        while len(self.buckets) > self.max_clients:
+            self._drop(next(iter(self.buckets)))
+        while len(self.addresses) > self.max_clients:
+            self.addresses.popitem(last=False)
+
+    def _refill(self, bucket: _TokenBucket, now: float, capacity: float, refill_sec: float) -> None:
+        if refill_sec <= 0:
+            bucket.tokens = capacity
+        elif bucket.tokens < capacity:
+            earned = (now - bucket.updated_at) / refill_sec
+            bucket.tokens = min(capacity, bucket.tokens + earned)
+        bucket.updated_at = now
+
+    def _get(self, key: str, now: float, *, create: bool) -> _TokenBucket | None:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if not create:
+                return None
+            bucket = _TokenBucket(self.capacity, now)
+            self.buckets[key] = bucket
+            clients = self._address_clients.setdefault(self._address(key), OrderedDict())
+            clients[key] = None
+            if len(clients) > self.clients_per_address:
+                self._drop(next(iter(clients)))
+            self._evict_overflow()
+        else:
+            self.buckets.move_to_end(key)
+            self._address_clients[self._address(key)].move_to_end(key)
+            self._refill(bucket, now, self.capacity, self.refill_sec)
+        return bucket
+
+    def _get_address(self, address: str, now: float) -> _TokenBucket:
+        capacity = self._address_capacity
+        bucket = self.addresses.get(address)
+        if bucket is None:
+            bucket = _TokenBucket(capacity, now)
+            self.addresses[address] = bucket
+            self._evict_overflow()
+        else:
+            self.addresses.move_to_end(address)
+            self._refill(bucket, now, capacity, self.refill_sec / self.clients_per_address)
+        return bucket
+
+    def try_acquire(self, key: str, *, now: float | None = None) -> bool:
+        current = time.monotonic() if now is None else now
+        bucket = self._get(key, current, create=True)
+        assert bucket is not None
+        shared = self._get_address(self._address(key), current)
+        if bucket.tokens >= 1.0 and shared.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            shared.tokens -= 1.0
+            return True
+        bucket.rejections += 1
+        self.total_rejections += 1
+        return False
+
+    def refund(self, key: str) -> None:
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket.tokens = min(self.capacity, bucket.tokens + 1.0)
+        shared = self.addresses.get(self._address(key))
+        if shared is not None:
+            shared.tokens = min(self._address_capacity, shared.tokens + 1.0)
+
+    def remaining_ms(self, key: str, *, now: float | None = None) -> int:
+        current = time.monotonic() if now is None else now
+        if self.refill_sec <= 0:
+            return 0
+        waits = [0.0]
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            self._refill(bucket, current, self.capacity, self.refill_sec)
+            waits.append((1.0 - bucket.tokens) * self.refill_sec)
+        shared = self.addresses.get(self._address(key))
+        if shared is not None:
+            refill_sec = self.refill_sec / self.clients_per_address
+            self._refill(shared, current, self._address_capacity, refill_sec)
+            waits.append((1.0 - shared.tokens) * refill_sec)
+        return max(0, int(max(waits) * 1000))
+
+    def client_rejections(self, key: str) -> int:
+        bucket = self.buckets.get(key)
+        return bucket.rejections if bucket is not None else 0
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "clients": len(self.buckets),
+            "max_clients": self.max_clients,
+            "clients_per_address": self.clients_per_address,
+            "rejections_total": self.total_rejections,
+            "evictions": self.evictions,
+        }
+
+
 class _PublicState:
     def __init__(self) -> None:
         self.lock = threading.Lock()
-        self.cooldown_until = 0.0
+        self.limiter = _ClientRateLimiter(
+            capacity=PUBLIC_RATE_BURST,
+            refill_sec=PUBLIC_COOLDOWN_SEC,
+            max_clients=PUBLIC_RATE_MAX_CLIENTS,
+            clients_per_address=PUBLIC_RATE_CLIENTS_PER_IP,
+        )
+        self.dispatch_guard_until = 0.0
         self.public_listen_active = False
 
     def reset(self) -> None:
         with self.lock:
-            self.cooldown_until = 0.0
+            self.limiter.reset()
+            self.dispatch_guard_until = 0.0
             self.public_listen_active = False
 
-    def remaining_ms(self) -> int:
+    def configure_limits(
+        self,
+        *,
+        capacity: float,
+        refill_sec: float,
+        max_clients: int,
+        clients_per_address: int,
+    ) -> None:
         with self.lock:
-            return self._remaining_ms_unlocked()
+            self.limiter.configure(
+                capacity=capacity,
+                refill_sec=refill_sec,
+                max_clients=max_clients,
+                clients_per_address=clients_per_address,
+            )
 
-    def _remaining_ms_unlocked(self) -> int:
-        return max(0, int((self.cooldown_until - time.monotonic()) * 1000))
+    def remaining_ms(self, client_key: str) -> int:
+        with self.lock:
+            return self.limiter.remaining_ms(client_key)
 
-    def begin_cooldown(self) -> None:
-        self.cooldown_until = time.monotonic() + max(0.0, PUBLIC_COOLDOWN_SEC)
+    def rate_limit_status(self, client_key: str) -> dict[str, object]:
+        # Public: only the caller's own numbers; the table-wide counters are in ``limiter_stats``.
+        with self.lock:
+            return {
+                "remaining_ms": self.limiter.remaining_ms(client_key),
+                "rejections": self.limiter.client_rejections(client_key),
+            }
+
+    def limiter_stats(self) -> dict[str, object]:
+        with self.lock:
+            return self.limiter.stats()
 
 
 _PUBLIC_STATE = _PublicState()
 
 
+def get_public_rate_limit_stats() -> dict[str, object]:
+    """Visitor table size, limits and rejection totals, for operator diagnostics only."""
+    return _PUBLIC_STATE.limiter_stats()
+
+
 def _get_character_info() -> dict[str, str]:
     try:
         info = robot.get_character_info()
@@ -714,14 +967,14 @@ def _get_character_info() -> dict[str, str]:
     return {str(key): str(value) for key, value in info.items() if value is not None}
 
 
-def _get_public_status_payload() -> dict[str, object]:
+def _get_public_status_payload(client_key: str = "") -> dict[str, object]:
     status = robot.get_runtime_status()
     connected = bool(status.get("connected"))
     listening = bool(status.get("listening"))
     speaking = bool(status.get("speaking"))
     speech_session = bool(status.get("speech_session"))
     busy = bool(listening or speaking or speech_session)
-    cooldown_remaining_ms = _PUBLIC_STATE.remaining_ms()
+    cooldown_remaining_ms = _PUBLIC_STATE.remaining_ms(client_key)
     accepting_input = bool(connected and not busy and cooldown_remaining_ms <= 0)
     character_info = _get_character_info()
     character_name = str(character_info.get("name", "")).strip()
@@ -760,6 +1013,7 @@ def _get_public_status_payload() -> dict[str, object]:
         "listening": listening,
         "speaking": speaking,
         "cooldown_remaining_ms": cooldown_remaining_ms,
+        "rate_limit": _PUBLIC_STATE.rate_limit_status(client_key),
         "heard": str(status.get("heard", "") or ""),
         "spoken": str(status.get("spoken", "") or ""),
         "character_name": character_name,
@@ -796,6 +1050,12 @@ class _Handler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Cache-Control", "no-store")
+        if not self._client_cookie():
+            self.send_header(
+                "Set-Cookie",
+                f"{CLIENT_COOKIE_NAME}={secrets.token_urlsafe(12)}; Path=/; "
+                f"Max-Age={CLIENT_COOKIE_MAX_AGE_SEC}; SameSite=Lax; HttpOnly",
+            )
         self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
         self.wfile.write(payload)
@@ -811,6 +1071,24 @@ class _Handler(BaseHTTPRequestHandler):
             return {}
         return decoded if isinstance(decoded, dict) else {}
 
+    def _client_cookie(self) -> str:
+        raw = self.headers.get("Cookie", "")
+        if not raw:
+            return ""
+        try:
+            cookie = SimpleCookie(raw)
+        except CookieError:
+            return ""
+        morsel = cookie.get(CLIENT_COOKIE_NAME)
+        if morsel is None or not _CLIENT_COOKIE_RE.match(morsel.value):
+            return ""
+        return morsel.value
+
+    def _client_key(self) -> str:
+        address = str(self.client_address[0]) if self.client_address else ""
+        cookie = self._client_cookie()
+        return f"{address}#{cookie}" if cookie else address
+
     def do_GET(self) -> None:  # noqa: N802
         path = urlparse(self.path).path
         if path == "/" or path.startswith("/index"):
@@ -837,7 +1115,7 @@ class _Handler(BaseHTTPRequestHandler):
             self._send_json(_get_public_config_payload())
             return
         if path == "/api/public/status":
-            self._send_json(_get_public_status_payload())
+            self._send_json(_get_public_status_payload(self._client_key()))
             return
         self._send_json({"error": "not found"}, status=404)
 
@@ -894,15 +1172,21 @@ class _Handler(BaseHTTPRequestHandler):
         status = robot.get_runtime_status()
         connected = bool(status.get("connected"))
         busy = bool(status.get("listening") or status.get("speaking") or status.get("speech_session"))
+        if not connected:
+            return 409, {"error": "robot unavailable"}
+        if busy:
+            return 409, {"error": "robot is busy"}
+        client_key = self._client_key()
         with _PUBLIC_STATE.lock:
-            cooldown_remaining_ms = _PUBLIC_STATE._remaining_ms_unlocked()
-            if not connected:
-                return 409, {"error": "robot unavailable"}
-            if busy:
-                return 409, {"error": "robot is busy"}
-            if cooldown_remaining_ms > 0:
+            if not _PUBLIC_STATE.limiter.try_acquire(client_key):
                 return 429, {"error": "cooldown active"}
-            _PUBLIC_STATE.begin_cooldown()
+            # Requests from different clients can race past the busy check before the
+            # runtime reports the previous dispatch, so hold a short global guard.
+            now = time.monotonic()
+            if now < _PUBLIC_STATE.dispatch_guard_until:
+                _PUBLIC_STATE.limiter.refund(client_key)
+                return 409, {"error": "robot is busy"}
+            _PUBLIC_STATE.dispatch_guard_until = now + PUBLIC_DISPATCH_GUARD_SEC
         return None
 
     def _handle_public_listen_start(self) -> None:
@@ -0,0 +1,92 @@
+"""Push saved AppSettings into the modules that read them at runtime."""
+
+from __future__ import annotations
+
+from .Ollama import chatbot
+from .RAG.builder import set_build_settings
+from .RAG.retriever import set_retrieval_settings
+from .Robot import robot
+from .Robot.runtime import configure_runtime_settings
+from .Robot.text import set_speech_limits
+from .Web.server import set_public_settings
+from .settings_store import AppSettings
+
+
+def apply_settings(settings: AppSettings, *, include_robot: bool = True) -> None:
+    """Applies settings to the chat, speech, retrieval, build and public web modules.
+
+    With include_robot the model, robot address, listen and voice settings are applied too;
+    headless mode leaves those to RobotRuntime.setup. The robot is only re-addressed (and so
+    reconnected) when its IP actually changed.
+    """
+    if include_robot:
+        chatbot.load_saved_settings(
+            settings.model,
+            settings.temperature,
+            settings.provider,
+            settings.api_base_url,
+            settings.api_key,
+        )
+        chatbot.configure_chat_settings(
+            max_tokens=settings.chat.max_tokens,
+            max_history_messages=settings.chat.max_history_messages,
+            max_history_chars=settings.chat.max_history_chars,
+            external_api_timeout=settings.chat.external_api_timeout,
+        )
+        chatbot.set_temperature(settings.temperature)
+    set_speech_limits(settings.speech.max_sentences, settings.speech.max_chars)
+    configure_runtime_settings(
+        speak_thinking=settings.speech.speak_thinking,
+        thinking_phrases=settings.speech.thinking_phrases,
+        thinking_delay_sec=settings.speech.thinking_delay_sec,
+        thinking_repeat_sec=settings.speech.thinking_repeat_sec,
+        thinking_wait_timeout=settings.speech.thinking_wait_timeout,
+        speak_wait_timeout=settings.speech.speak_wait_timeout,
+        llm_response_timeout=settings.chat.llm_response_timeout,
+        rag_retrieval_timeout=settings.rag.retrieval_timeout,
+        disconnect_timeout=settings.runtime.disconnect_timeout,
+        end_speech_timeout=settings.speech.end_speech_timeout,
+        user_letgo_debouncer_seconds=settings.speech.user_letgo_debouncer_seconds,
+    )
+    set_retrieval_settings(
+        top_k=settings.rag.top_k,
+        max_context_chars=settings.rag.max_context_chars,
+        embed_model=settings.rag.embed_model,
+        ann_nprobe=settings.rag.ann_nprobe,
+        ann_min_chunks=settings.rag.ann_min_chunks,
+        rescore_candidates=settings.rag.rescore_candidates,
+        index_cache_size=settings.rag.index_cache_size,
+        min_similarity=settings.rag.min_similarity,
+        relative_similarity=settings.rag.relative_similarity,
+        mmr_lambda=settings.rag.mmr_lambda,
+    )
+    set_build_settings(
+        settings.rag.embed_model,
+        settings.rag.chunk_size,
+        settings.rag.chunk_overlap,
+        backend=settings.rag.embed_backend,
+        ann_nlist=settings.rag.ann_nlist,
+        ann_min_chunks=settings.rag.ann_min_chunks,
+        vector_storage=settings.rag.vector_storage,
+    )
+    set_public_settings(
+        enabled=settings.web.enabled,
+        port=settings.web.port,
+        max_text_chars=settings.web.public_max_text_chars,
+        cooldown_sec=settings.web.public_cooldown_sec,
+        rate_burst=settings.web.public_rate_burst,
+        rate_max_clients=settings.web.public_rate_max_clients,
+        rate_clients_per_ip=settings.web.public_rate_clients_per_ip,
+    )
+    if not include_robot:
+        return
+    if settings.ip.strip() != robot.get_ip():
+        robot.set_ip(settings.ip)
+    robot.set_listen_settings(
+        partial=settings.listen.partial,
+        concat=settings.listen.concat,
+        stop_no_speech=settings.listen.stop_no_speech,
+        stop_user_end=settings.listen.stop_user_end,
+        stop_robot_start=settings.listen.stop_robot_start,
+    )
+    robot.set_voice_settings(settings.voice.name, settings.voice.rate, settings.voice.volume)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+from typing import Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+RETRIEVAL = "retrieval"
+LLM = "llm"
+RAG_BUILD = "rag_build"
+FILE_IO = "file_io"
+
+# (workers, queued jobs allowed on top of them) per workload.
+_DEFAULT_LIMITS = {
+    RETRIEVAL: (2, 4),
+    LLM: (2, 2),
+    RAG_BUILD: (1, 2),
+    FILE_IO: (2, 8),
+}
+
+
+def _limits(name: str) -> tuple[int, int]:
+    workers, queue = _DEFAULT_LIMITS[name]
+    prefix = f"EXECUTOR_{name.upper()}"
+    return (
+        max(1, int(os.getenv(f"{prefix}_WORKERS", str(workers)))),
+        max(0, int(os.getenv(f"{prefix}_QUEUE", str(queue)))),
+    )
+
+
+class ExecutorSaturated(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """A named thread pool that refuses work instead of queueing without limit.
+
+    At most ``workers + queue_limit`` jobs are admitted at once; ``submit``
+    raises ``ExecutorSaturated`` past that. A job abandoned by a caller's
+    timeout keeps its worker until it returns, so a burst of timeouts shows up
+    as rejections here rather than as an ever longer queue.
+    """
+
+    def __init__(self, name: str, workers: int, queue_limit: int) -> None:
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.queue_limit = max(0, int(queue_limit))
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _run(self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _forget(self, future: concurrent.futures.Future) -> None:
+        # Cancelled before it started: _run never took it off the queue.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def submit(self, fn: Callable[..., T], *args: object) -> concurrent.futures.Future[T]:
+        with self._lock:
+            if self._queued + self._running >= self.workers + self.queue_limit:
+                self._rejected += 1
+                raise ExecutorSaturated(
+                    f"{self.name} executor is saturated ({self._running} running, {self._queued} queued)"
+                )
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        future = self._pool.submit(self._run, fn, *args)
+        future.add_done_callback(self._forget)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: object) -> T:
+        """Like ``asyncio.to_thread``, but on this pool.
+
+        Cancelling the await (e.g. from ``asyncio.wait_for``) drops the job if
+        it has not started yet.
+        """
+        call = functools.partial(contextvars.copy_context().run, fn, *args)
+        return await asyncio.wrap_future(self.submit(call))
+
+    def in_worker(self) -> bool:
+        """Whether the calling thread is one of this pool's workers."""
+        return threading.current_thread().name.startswith(f"{self.name}_")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "running": self._running,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_EXECUTORS: dict[str, BoundedExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(name)
+        if executor is None:
+            workers, queue_limit = _limits(name)
+            executor = _EXECUTORS[name] = BoundedExecutor(name, workers, queue_limit)
+        return executor
+
+
+async def run(name: str, fn: Callable[..., T], *args: object) -> T:
+    return await get_executor(name).run(fn, *args)
+
+
+def executor_stats() -> dict[str, dict[str, int]]:
+    with _EXECUTORS_LOCK:
+        executors = dict(_EXECUTORS)
+    return {name: executor.stats() for name, executor in executors.items()}
+
+
+def shutdown_executors(name: Optional[str] = None) -> None:
+    with _EXECUTORS_LOCK:
+        names = [name] if name is not None else list(_EXECUTORS)
+        executors = [_EXECUTORS.pop(key) for key in names if key in _EXECUTORS]
+    for executor in executors:
+        executor.shutdown()
@@ -0,0 +1,97 @@
+"""Run the robot runtime and web server without the Tk UI."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import threading
+
+from . import app_settings, paths, settings_store
+from .Ollama import chatbot
+from .Robot import robot
+from .Web import server as web_server
+
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_POLL_SEC = 0.5
+
+
+def _start_loop(event_loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(event_loop)
+    event_loop.run_forever()
+
+
+async def _cancel_pending_tasks() -> None:
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _shutdown_signals() -> list[signal.Signals]:
+    signals = [signal.SIGINT, signal.SIGTERM]
+    if hasattr(signal, "SIGBREAK"):
+        signals.append(signal.SIGBREAK)
+    return signals
+
+
+def main(*, stop_event: threading.Event | None = None) -> None:
+    logger.info("Starting Furhat Realtime in headless mode.")
+    chatbot.configure_model_caches(path_root=paths.get_data_root())
+    # RobotRuntime.setup applies the robot, listen, voice and LLM settings itself.
+    app_settings.apply_settings(settings_store.load_settings(), include_robot=False)
+
+    loop = asyncio.new_event_loop()
+    robot.attach_loop(loop)
+    loop_thread = threading.Thread(target=_start_loop, args=(loop,), daemon=True)
+    loop_thread.start()
+
+    server = web_server.start_server(loop)
+    if server is not None:
+        host, port = server.server_address[:2]
+        logger.info("Web server listening on http://%s:%s", host, port)
+
+    setup_future = asyncio.run_coroutine_threadsafe(robot.setup(), loop)
+    stop_requested = stop_event or threading.Event()
+
+    def _request_stop(signum: int, _frame: object) -> None:
+        logger.info("Received signal %s; shutting down.", signum)
+        stop_requested.set()
+
+    previous_handlers: dict[signal.Signals, object] = {}
+    if threading.current_thread() is threading.main_thread():
+        for sig in _shutdown_signals():
+            previous_handlers[sig] = signal.signal(sig, _request_stop)
+
+    try:
+        while not stop_requested.wait(SHUTDOWN_POLL_SEC):
+            if setup_future.done():
+                if not setup_future.cancelled() and setup_future.exception() is not None:
+                    logger.error("Robot runtime stopped.", exc_info=setup_future.exception())
+                break
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        try:
+            robot.disconnect(wait=True)
+        except Exception:
+            logger.exception("Robot shutdown failed.")
+        setup_future.cancel()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_pending_tasks(), loop).result(
+                    timeout=SHUTDOWN_POLL_SEC * 4
+                )
+            except Exception:
+                logger.warning("Timed out cancelling background tasks.")
+            loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=1.0)
+        if not loop_thread.is_alive():
+            loop.close()
+        logger.info("Headless runtime stopped.")
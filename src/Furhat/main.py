@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 import logging
+import sys
 import threading
+from typing import Sequence
 
 from . import bootstrap
 from .Robot import robot
-from .UI import ui
 from .Web import server as web_server
 
 
@@ -20,6 +22,9 @@ def _start_loop(event_loop: asyncio.AbstractEventLoop) -> None:
     event_loop.run_forever()
 
 def main() -> None:
+    # Imported here so headless mode never loads tkinter.
+    from .UI import ui
+
     logger.info("Starting Furhat Realtime.")
     # Dedicated asyncio loop on a background thread.
     loop = asyncio.new_event_loop()
@@ -62,9 +67,30 @@ def main() -> None:
         loop_thread.join(timeout=1.0)
 
 
-def run() -> int:
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m Furhat.main")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run the robot runtime and web server without the desktop UI",
+    )
+    return parser.parse_args(argv)
+
+
+def run(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
     log_path = bootstrap.configure_startup_logging()
     bootstrap.install_exception_logging()
+    if args.headless:
+        from . import headless
+
+        try:
+            headless.main()
+        except Exception:
+            logger.exception("Headless startup failed.")
+            print(f"Furhat Realtime failed to start. Log file: {log_path}", file=sys.stderr)
+            return 1
+        return 0
     try:
         main()
     except Exception:
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Mapping
 
 from . import paths
@@ -11,13 +13,15 @@ from . import paths
 
 DEFAULT_PRESET_PAYLOAD = {"version": 1, "global": [], "by_character": {}}
 
+_EMPTY_INDEX: Mapping[str, object] = MappingProxyType({})
+
 
 def _slugify(value: str) -> str:
     cleaned = re.sub(r"[^a-zA-Z0-9._-]+", "_", value).strip("_")
     return cleaned or "preset"
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class PromptPreset:
     id: str
     label: str
@@ -112,6 +116,73 @@ class ResolvedPresetSet:
         return [item.to_public_dict() for item in self.presets]
 
 
+def _build_id_index(presets: tuple[PromptPreset, ...]) -> Mapping[str, PromptPreset]:
+    index: dict[str, PromptPreset] = {}
+    for preset in presets:
+        index.setdefault(preset.id, preset)
+    return MappingProxyType(index)
+
+
+@dataclass(frozen=True, slots=True)
+class PresetSnapshot:
+    path: Path | None = None
+    stamp: tuple[int, int] | None = None
+    mtime: float | None = None
+    raw_text: str = ""
+    error: str = ""
+    version: int = 1
+    global_presets: tuple[PromptPreset, ...] = ()
+    by_character: Mapping[str, tuple[PromptPreset, ...]] = field(default_factory=lambda: _EMPTY_INDEX)
+    global_index: Mapping[str, PromptPreset] = field(default_factory=lambda: _EMPTY_INDEX)
+    character_index: Mapping[str, Mapping[str, PromptPreset]] = field(default_factory=lambda: _EMPTY_INDEX)
+
+    @classmethod
+    def from_preset_file(
+        cls,
+        preset_file: PresetFile,
+        *,
+        path: Path | None = None,
+        stamp: tuple[int, int] | None = None,
+        mtime: float | None = None,
+        raw_text: str = "",
+        error: str = "",
+    ) -> "PresetSnapshot":
+        global_presets = tuple(preset_file.global_presets)
+        by_character = {key: tuple(items) for key, items in preset_file.by_character.items()}
+        return cls(
+            path=path,
+            stamp=stamp,
+            mtime=mtime,
+            raw_text=raw_text,
+            error=error,
+            version=int(preset_file.version),
+            global_presets=global_presets,
+            by_character=MappingProxyType(by_character),
+            global_index=_build_id_index(global_presets),
+            character_index=MappingProxyType(
+                {key: _build_id_index(items) for key, items in by_character.items()}
+            ),
+        )
+
+    def to_preset_file(self) -> PresetFile:
+        return PresetFile(
+            version=self.version,
+            global_presets=list(self.global_presets),
+            by_character={key: list(items) for key, items in self.by_character.items()},
+        )
+
+    def active_scope(self, char_id: str) -> tuple[str, tuple[PromptPreset, ...], Mapping[str, PromptPreset]]:
+        if char_id and self.by_character.get(char_id):
+            return "character", self.by_character[char_id], self.character_index[char_id]
+        if self.global_presets:
+            return "global", self.global_presets, self.global_index
+        return "none", (), self.global_index
+
+
+_SNAPSHOT_LOCK = threading.Lock()
+_SNAPSHOTS: dict[Path, PresetSnapshot] = {}
+
+
 def _load_preset_list(value: object) -> list[PromptPreset]:
     if not isinstance(value, list):
         return []
@@ -171,9 +242,69 @@ def ensure_preset_file(*, path: Path | None = None) -> Path:
     target.parent.mkdir(parents=True, exist_ok=True)
     if not target.exists():
         target.write_text(json.dumps(DEFAULT_PRESET_PAYLOAD, indent=2), encoding="utf-8")
+        invalidate_preset_cache(target)
     return target
 
 
+def invalidate_preset_cache(path: Path | None = None) -> None:
+    with _SNAPSHOT_LOCK:
+        if path is None:
+            _SNAPSHOTS.clear()
+        else:
+            _SNAPSHOTS.pop(Path(path), None)
+
+
+def _file_stamp(path: Path) -> tuple[tuple[int, int] | None, float | None]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None, None
+    return (stat.st_mtime_ns, stat.st_size), stat.st_mtime
+
+
+def _read_preset_snapshot(
+    path: Path,
+    stamp: tuple[int, int] | None,
+    mtime: float | None,
+) -> PresetSnapshot:
+    if stamp is None:
+        return PresetSnapshot(path=path)
+    try:
+        raw_text = path.read_text(encoding="utf-8")
+    except Exception as exc:
+        return PresetSnapshot(path=path, stamp=stamp, mtime=mtime, error=str(exc))
+    try:
+        preset_file = parse_preset_text(raw_text)
+        error = ""
+    except ValueError as exc:
+        error = str(exc)
+        try:
+            preset_file = PresetFile.from_dict(json.loads(raw_text))
+        except Exception:
+            preset_file = PresetFile()
+    return PresetSnapshot.from_preset_file(
+        preset_file,
+        path=path,
+        stamp=stamp,
+        mtime=mtime,
+        raw_text=raw_text,
+        error=error,
+    )
+
+
+def get_preset_snapshot(*, path: Path | None = None) -> PresetSnapshot:
+    target = Path(path or get_preset_file_path())
+    stamp, mtime = _file_stamp(target)
+    with _SNAPSHOT_LOCK:
+        cached = _SNAPSHOTS.get(target)
+    if cached is not None and cached.stamp == stamp:
+        return cached
+    snapshot = _read_preset_snapshot(target, stamp, mtime)
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOTS[target] = snapshot
+    return snapshot
+
+
 def validate_preset_payload(data: object) -> PresetFile:
     if not isinstance(data, dict):
         raise ValueError("preset file must be a JSON object")
@@ -228,19 +359,21 @@ def format_preset_file(preset_file: PresetFile) -> str:
 
 def write_preset_file(preset_file: PresetFile, *, path: Path | None = None) -> Path:
     target = ensure_preset_file(path=path)
-    target.write_text(format_preset_file(preset_file), encoding="utf-8")
+    try:
+        target.write_text(format_preset_file(preset_file), encoding="utf-8")
+    finally:
+        invalidate_preset_cache(target)
     return target
 
 
 def load_preset_file(*, path: Path | None = None) -> PresetFile:
-    target = path or get_preset_file_path()
-    if not target.exists():
-        return PresetFile()
-    try:
-        payload = json.loads(target.read_text(encoding="utf-8"))
-    except Exception:
-        return PresetFile()
-    return PresetFile.from_dict(payload)
+    return get_preset_snapshot(path=path).to_preset_file()
+
+
+def _resolve_snapshot(preset_file: PresetFile | None, path: Path | None) -> PresetSnapshot:
+    if preset_file is not None:
+        return PresetSnapshot.from_preset_file(preset_file)
+    return get_preset_snapshot(path=path)
 
 
 def resolve_active_presets(
@@ -250,27 +383,15 @@ def resolve_active_presets(
     preset_file: PresetFile | None = None,
     path: Path | None = None,
 ) -> ResolvedPresetSet:
-    presets = preset_file or load_preset_file(path=path)
+    snapshot = _resolve_snapshot(preset_file, path)
     info = _coerce_character_info(character_info)
     char_id = str(info.get("char_id", "")).strip()
-    if char_id:
-        items = list(presets.by_character.get(char_id, []))
-        if items:
-            return ResolvedPresetSet(
-                scope="character",
-                presets=items[: max(0, int(limit))] if limit > 0 else items,
-                character_key=char_id,
-            )
-
-    if presets.global_presets:
-        items = list(presets.global_presets)
-        return ResolvedPresetSet(
-            scope="global",
-            presets=items[: max(0, int(limit))] if limit > 0 else items,
-            character_key=char_id,
-        )
-
-    return ResolvedPresetSet(scope="none", presets=[], character_key=char_id)
+    scope, items, _ = snapshot.active_scope(char_id)
+    return ResolvedPresetSet(
+        scope=scope,
+        presets=list(items[: max(0, int(limit))] if limit > 0 else items),
+        character_key=char_id,
+    )
 
 
 def find_active_preset(
@@ -283,13 +404,8 @@ def find_active_preset(
     preset_id = str(preset_id).strip()
     if not preset_id:
         return None
-    active = resolve_active_presets(
-        character_info,
-        limit=0,
-        preset_file=preset_file,
-        path=path,
-    )
-    for item in active.presets:
-        if item.id == preset_id:
-            return item
-    return None
+    snapshot = _resolve_snapshot(preset_file, path)
+    info = _coerce_character_info(character_info)
+    char_id = str(info.get("char_id", "")).strip()
+    _, _, index = snapshot.active_scope(char_id)
+    return index.get(preset_id)
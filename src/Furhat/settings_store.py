@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
+import logging
 import os
+import tempfile
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable
 
-from . import paths
+from . import executors, paths
 
 
+logger = logging.getLogger(__name__)
+
+SettingsListener = Callable[["AppSettings", "Path | None"], None]
+
 DEFAULT_MODEL = "gemma3:4b"
 DEFAULT_TEMPERATURE = 0.7
 DEFAULT_IP = "172.27.8.32"
@@ -24,12 +34,39 @@ DEFAULT_THINKING_PHRASES = [
 DEFAULT_THINKING_REPEAT_SEC = 5.0
 DEFAULT_END_SPEECH_TIMEOUT = 2.0
 DEFAULT_USER_LETGO_DEBOUNCER_SECONDS = 1.0
+# Seconds between checks for settings files edited outside this process; 0 disables.
+SETTINGS_WATCH_SEC = float(os.getenv("SETTINGS_WATCH_SEC", "2"))
 
 
 def _env_flag(name: str, default: str) -> bool:
     return os.getenv(name, default).lower() in {"1", "true", "yes", "y", "on"}
 
 
+_WARNED_LEGACY_ENV: set[str] = set()
+
+
+def chunk_tokens_from_env(name: str, legacy_name: str, default: int, *, minimum: int = 0) -> int:
+    """A chunk length in tokens from ``name``, else from the character-based ``legacy_name``."""
+    value = os.getenv(name)
+    if value is not None:
+        return int(value)
+    legacy = os.getenv(legacy_name)
+    if legacy is None:
+        return default
+    # About four characters per token, as for settings saved before chunks were sized in tokens.
+    tokens = max(minimum, int(legacy) // 4)
+    if legacy_name not in _WARNED_LEGACY_ENV:
+        _WARNED_LEGACY_ENV.add(legacy_name)
+        logger.warning(
+            "%s is deprecated: it counts characters and was read as %s=%s. Set %s instead.",
+            legacy_name,
+            name,
+            tokens,
+            name,
+        )
+    return tokens
+
+
 def _same_path(left: Path, right: Path) -> bool:
     try:
         return left.resolve() == right.resolve()
@@ -184,37 +221,79 @@ class SpeechSettings:
         }
 
 
+CHUNK_UNIT_TOKENS = "tokens"
+
+
 @dataclass(slots=True)
 class RagSettings:
     embed_model: str = os.getenv("RAG_EMBED_MODEL", "nomic-embed-text")
+    embed_backend: str = os.getenv("RAG_EMBED_BACKEND", "ollama")
     top_k: int = int(os.getenv("RAG_TOP_K", "4"))
+    min_similarity: float = float(os.getenv("RAG_MIN_SIMILARITY", "-1"))
+    relative_similarity: float = float(os.getenv("RAG_RELATIVE_SIMILARITY", "0.5"))
+    mmr_lambda: float = float(os.getenv("RAG_MMR_LAMBDA", "1"))
     max_context_chars: int = int(os.getenv("RAG_MAX_CONTEXT_CHARS", "3200"))
-    chunk_size: int = int(os.getenv("RAG_CHUNK_SIZE", "900"))
-    chunk_overlap: int = int(os.getenv("RAG_CHUNK_OVERLAP", "180"))
+    chunk_size: int = chunk_tokens_from_env("RAG_CHUNK_TOKENS", "RAG_CHUNK_SIZE", 220, minimum=1)
+    chunk_overlap: int = chunk_tokens_from_env("RAG_CHUNK_OVERLAP_TOKENS", "RAG_CHUNK_OVERLAP", 30)
     retrieval_timeout: float = float(os.getenv("RAG_RETRIEVAL_TIMEOUT", "10"))
+    ann_min_chunks: int = int(os.getenv("RAG_ANN_MIN_CHUNKS", "2000"))
+    ann_nlist: int = int(os.getenv("RAG_ANN_NLIST", "0"))
+    ann_nprobe: int = int(os.getenv("RAG_ANN_NPROBE", "8"))
+    vector_storage: str = os.getenv("RAG_VECTOR_STORAGE", "float32")
+    rescore_candidates: int = int(os.getenv("RAG_RESCORE_CANDIDATES", "16"))
+    index_cache_size: int = int(os.getenv("RAG_INDEX_CACHE_SIZE", "4"))
 
     @classmethod
     def from_dict(cls, data: object) -> "RagSettings":
         if not isinstance(data, dict):
             return cls()
         default = cls()
+        chunk_size = int(data.get("chunk_size", default.chunk_size))
+        chunk_overlap = int(data.get("chunk_overlap", default.chunk_overlap))
+        if "chunk_size" in data and data.get("chunk_unit") != CHUNK_UNIT_TOKENS:
+            # Saved before chunks were sized in tokens: about four characters per token.
+            chunk_size = max(1, chunk_size // 4)
+            chunk_overlap //= 4
         return cls(
             embed_model=str(data.get("embed_model", default.embed_model)).strip() or default.embed_model,
+            embed_backend=str(data.get("embed_backend", default.embed_backend)).strip().lower()
+            or default.embed_backend,
             top_k=int(data.get("top_k", default.top_k)),
+            min_similarity=float(data.get("min_similarity", default.min_similarity)),
+            relative_similarity=float(data.get("relative_similarity", default.relative_similarity)),
+            mmr_lambda=float(data.get("mmr_lambda", default.mmr_lambda)),
             max_context_chars=int(data.get("max_context_chars", default.max_context_chars)),
-            chunk_size=int(data.get("chunk_size", default.chunk_size)),
-            chunk_overlap=int(data.get("chunk_overlap", default.chunk_overlap)),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
             retrieval_timeout=float(data.get("retrieval_timeout", default.retrieval_timeout)),
+            ann_min_chunks=int(data.get("ann_min_chunks", default.ann_min_chunks)),
+            ann_nlist=int(data.get("ann_nlist", default.ann_nlist)),
+            ann_nprobe=int(data.get("ann_nprobe", default.ann_nprobe)),
+            vector_storage=str(data.get("vector_storage", default.vector_storage)).strip().lower()
+            or default.vector_storage,
+            rescore_candidates=int(data.get("rescore_candidates", default.rescore_candidates)),
+            index_cache_size=int(data.get("index_cache_size", default.index_cache_size)),
         )
 
     def to_dict(self) -> dict[str, object]:
         return {
             "embed_model": self.embed_model,
+            "embed_backend": self.embed_backend,
             "top_k": self.top_k,
+            "min_similarity": self.min_similarity,
+            "relative_similarity": self.relative_similarity,
+            "mmr_lambda": self.mmr_lambda,
             "max_context_chars": self.max_context_chars,
             "chunk_size": self.chunk_size,
             "chunk_overlap": self.chunk_overlap,
+            "chunk_unit": CHUNK_UNIT_TOKENS,
             "retrieval_timeout": self.retrieval_timeout,
+            "ann_min_chunks": self.ann_min_chunks,
+            "ann_nlist": self.ann_nlist,
+            "ann_nprobe": self.ann_nprobe,
+            "vector_storage": self.vector_storage,
+            "rescore_candidates": self.rescore_candidates,
+            "index_cache_size": self.index_cache_size,
         }
 
 
@@ -224,6 +303,9 @@ class WebSettings:
     port: int = int(os.getenv("WEB_PORT", "7860"))
     public_max_text_chars: int = int(os.getenv("PUBLIC_MAX_TEXT_CHARS", "200"))
     public_cooldown_sec: float = float(os.getenv("PUBLIC_COOLDOWN_SEC", "2"))
+    public_rate_burst: float = float(os.getenv("PUBLIC_RATE_BURST", "1"))
+    public_rate_max_clients: int = int(os.getenv("PUBLIC_RATE_MAX_CLIENTS", "1024"))
+    public_rate_clients_per_ip: int = int(os.getenv("PUBLIC_RATE_CLIENTS_PER_IP", "4"))
 
     @classmethod
     def from_dict(cls, data: object) -> "WebSettings":
@@ -235,6 +317,13 @@ class WebSettings:
             port=int(data.get("port", default.port)),
             public_max_text_chars=int(data.get("public_max_text_chars", default.public_max_text_chars)),
             public_cooldown_sec=float(data.get("public_cooldown_sec", default.public_cooldown_sec)),
+            public_rate_burst=float(data.get("public_rate_burst", default.public_rate_burst)),
+            public_rate_max_clients=int(
+                data.get("public_rate_max_clients", default.public_rate_max_clients)
+            ),
+            public_rate_clients_per_ip=int(
+                data.get("public_rate_clients_per_ip", default.public_rate_clients_per_ip)
+            ),
         )
 
     def to_dict(self) -> dict[str, object]:
@@ -243,6 +332,9 @@ class WebSettings:
             "port": self.port,
             "public_max_text_chars": self.public_max_text_chars,
             "public_cooldown_sec": self.public_cooldown_sec,
+            "public_rate_burst": self.public_rate_burst,
+            "public_rate_max_clients": self.public_rate_max_clients,
+            "public_rate_clients_per_ip": self.public_rate_clients_per_ip,
         }
 
 
@@ -381,16 +473,11 @@ def _merge_user_llm_settings(
     return merged
 
 
-def load_settings_with_path(
-    *,
-    canonical_path: Path | None = None,
-    legacy_path: Path | None = None,
-    user_path: Path | None = None,
+def _load_settings_from_disk(
+    canonical: Path,
+    legacy: Path,
+    user: Path,
 ) -> tuple[AppSettings, Path | None]:
-    canonical = canonical_path or get_canonical_settings_path()
-    legacy = legacy_path or get_legacy_settings_path()
-    user = user_path or get_user_settings_path()
-
     if canonical.exists():
         loaded = _read_settings_file(canonical)
         if not _same_path(canonical, user) and user.exists():
@@ -405,6 +492,177 @@ def load_settings_with_path(
     return AppSettings(), None
 
 
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _write_atomic(target: Path, text: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, target)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass(slots=True)
+class _SettingsSnapshot:
+    stamps: tuple[tuple[int, int] | None, ...]
+    settings: AppSettings
+    source: Path | None
+
+
+class SettingsService:
+    """Holds one parsed AppSettings per (canonical, legacy, user) path triple.
+
+    Files are re-read only when their (mtime_ns, size) stamp changes or after a
+    save through this service. Callers always get a private copy.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._snapshots: dict[tuple[Path, Path, Path], _SettingsSnapshot] = {}
+        self._listeners: list[SettingsListener] = []
+
+    @staticmethod
+    def _resolve_paths(
+        canonical_path: Path | None,
+        legacy_path: Path | None,
+        user_path: Path | None,
+    ) -> tuple[Path, Path, Path]:
+        return (
+            Path(canonical_path or get_canonical_settings_path()),
+            Path(legacy_path or get_legacy_settings_path()),
+            Path(user_path or get_user_settings_path()),
+        )
+
+    def _refresh(self, key: tuple[Path, Path, Path]) -> tuple[_SettingsSnapshot, bool]:
+        stamps = tuple(_file_stamp(path) for path in key)
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None and cached.stamps == stamps:
+                return cached, False
+            settings, source = _load_settings_from_disk(*key)
+            snapshot = _SettingsSnapshot(stamps=stamps, settings=settings, source=source)
+            self._snapshots[key] = snapshot
+        changed = cached is not None and (
+            cached.source != source or cached.settings.to_dict() != settings.to_dict()
+        )
+        return snapshot, changed
+
+    def load(
+        self,
+        *,
+        canonical_path: Path | None = None,
+        legacy_path: Path | None = None,
+        user_path: Path | None = None,
+    ) -> tuple[AppSettings, Path | None]:
+        snapshot, changed = self._refresh(self._resolve_paths(canonical_path, legacy_path, user_path))
+        if changed:
+            self._publish(snapshot.settings, snapshot.source)
+        return copy.deepcopy(snapshot.settings), snapshot.source
+
+    def poll(
+        self,
+        *,
+        canonical_path: Path | None = None,
+        legacy_path: Path | None = None,
+        user_path: Path | None = None,
+    ) -> bool:
+        snapshot, changed = self._refresh(self._resolve_paths(canonical_path, legacy_path, user_path))
+        if changed:
+            self._publish(snapshot.settings, snapshot.source)
+        return changed
+
+    def save(self, settings: AppSettings, *, path: Path | None = None) -> Path:
+        target = Path(path or get_canonical_settings_path())
+        payload = json.dumps(settings.to_dict(), indent=2)
+        with self._lock:
+            _write_atomic(target, payload)
+            self._snapshots = {
+                key: snapshot for key, snapshot in self._snapshots.items() if target not in key
+            }
+        self._publish(settings, target)
+        return target
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def subscribe(self, listener: SettingsListener) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.append(listener)
+        return lambda: self.unsubscribe(listener)
+
+    def unsubscribe(self, listener: SettingsListener) -> None:
+        with self._lock:
+            try:
+                self._listeners.remove(listener)
+            except ValueError:
+                pass
+
+    def _publish(self, settings: AppSettings, source: Path | None) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(copy.deepcopy(settings), source)
+            except Exception:
+                logger.exception("Settings listener failed")
+
+
+_SERVICE = SettingsService()
+
+
+def get_settings_service() -> SettingsService:
+    return _SERVICE
+
+
+def subscribe(listener: SettingsListener) -> Callable[[], None]:
+    return _SERVICE.subscribe(listener)
+
+
+def unsubscribe(listener: SettingsListener) -> None:
+    _SERVICE.unsubscribe(listener)
+
+
+async def watch_settings() -> None:
+    """Polls the settings files so subscribers see edits made on disk."""
+    if SETTINGS_WATCH_SEC <= 0:
+        return
+    while True:
+        try:
+            await executors.run(executors.FILE_IO, _SERVICE.poll)
+        except Exception as exc:
+            logger.warning("Settings watch failed: %s", exc)
+        await asyncio.sleep(SETTINGS_WATCH_SEC)
+
+
+def load_settings_with_path(
+    *,
+    canonical_path: Path | None = None,
+    legacy_path: Path | None = None,
+    user_path: Path | None = None,
+) -> tuple[AppSettings, Path | None]:
+    return _SERVICE.load(
+        canonical_path=canonical_path,
+        legacy_path=legacy_path,
+        user_path=user_path,
+    )
+
+
 def load_settings(
     *,
     canonical_path: Path | None = None,
@@ -424,7 +682,4 @@ def save_settings(
     *,
     path: Path | None = None,
 ) -> Path:
-    target = path or get_canonical_settings_path()
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(settings.to_dict(), indent=2), encoding="utf-8")
-    return target
+    return _SERVICE.save(settings, path=path)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from Furhat import app_settings  # noqa: E402
+from Furhat.settings_store import AppSettings  # noqa: E402
+
+
+class ApplySettingsTests(unittest.TestCase):
+    def _patch_all(self, stack: ExitStack, *, current_ip: str) -> dict[str, mock.MagicMock]:
+        patched = {}
+        for name in (
+            "set_speech_limits",
+            "configure_runtime_settings",
+            "set_retrieval_settings",
+            "set_build_settings",
+            "set_public_settings",
+        ):
+            patched[name] = stack.enter_context(mock.patch.object(app_settings, name))
+        for name in ("load_saved_settings", "configure_chat_settings", "set_temperature"):
+            patched[name] = stack.enter_context(mock.patch.object(app_settings.chatbot, name))
+        for name in ("set_ip", "set_listen_settings", "set_voice_settings"):
+            patched[name] = stack.enter_context(mock.patch.object(app_settings.robot, name))
+        stack.enter_context(mock.patch.object(app_settings.robot, "get_ip", return_value=current_ip))
+        return patched
+
+    def test_headless_apply_leaves_robot_and_model_alone(self) -> None:
+        with ExitStack() as stack:
+            patched = self._patch_all(stack, current_ip="")
+            app_settings.apply_settings(AppSettings(ip="10.0.0.9"), include_robot=False)
+
+        patched["set_public_settings"].assert_called_once()
+        patched["set_retrieval_settings"].assert_called_once()
+        for name in ("load_saved_settings", "set_ip", "set_listen_settings", "set_voice_settings"):
+            patched[name].assert_not_called()
+
+    def test_robot_is_only_readdressed_when_ip_changes(self) -> None:
+        with ExitStack() as stack:
+            patched = self._patch_all(stack, current_ip="10.0.0.9")
+            app_settings.apply_settings(AppSettings(ip="10.0.0.9"))
+            patched["set_ip"].assert_not_called()
+            patched["set_voice_settings"].assert_called_once()
+
+            app_settings.apply_settings(AppSettings(ip="10.0.0.10"))
+            patched["set_ip"].assert_called_once_with("10.0.0.10")
+
+
+if __name__ == "__main__":
+    unittest.main()
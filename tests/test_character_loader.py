@@ -435,7 +435,6 @@ class CharacterLoaderTests(unittest.TestCase):
                 ],
             )
             notifications: list[str] = []
-            original_index_path = character_loader.retriever.INDEX_PATH
 
             def fake_embed_texts(texts: list[str], model: str) -> list[list[float]]:
                 return [[float(index + 1), float(len(text))] for index, text in enumerate(texts)]
@@ -443,7 +442,7 @@ class CharacterLoaderTests(unittest.TestCase):
             try:
                 with (
                     mock.patch.object(character_loader, "DEFAULT_CHAR_DIR", root / "characters"),
-                    mock.patch.object(character_loader.builder, "embed_texts", side_effect=fake_embed_texts),
+                    mock.patch.object(character_loader.builder.embeddings, "embed_texts", side_effect=fake_embed_texts),
                 ):
                     character_loader._prepare_character_rag_sync(  # noqa: SLF001
                         character_path,
@@ -458,12 +457,13 @@ class CharacterLoaderTests(unittest.TestCase):
                         path.read_text(encoding="utf-8")
                         for path in sorted(sources_dir.glob("*.txt"))
                     ]
+                character_index = character_loader.retriever.get_index(character_loader.retriever.INDEX_CHARACTER)
             finally:
-                character_loader.retriever.set_index_path(original_index_path)
-                character_loader.retriever.reload_index()
+                character_loader.retriever.clear_index(character_loader.retriever.INDEX_CHARACTER)
 
         self.assertEqual(status.state, "ready")
         self.assertGreater(status.entries, 0)
+        self.assertEqual(len(character_index.entries), status.entries)
         self.assertEqual(len(source_files), 2)
         self.assertTrue(any("Support Page" in text for text in saved_texts))
         self.assertTrue(any("Supplemental plain text source" in text for text in saved_texts))
@@ -18,6 +18,9 @@ chatbot = importlib.import_module("Furhat.Ollama.chatbot")
 
 
 class _FakeResponse:
+    status = 200
+    reason = "OK"
+
     def __init__(self, payload: dict[str, object]) -> None:
         self.payload = payload
 
@@ -32,6 +35,9 @@ class _FakeResponse:
 
 
 class _FakeStreamingResponse:
+    status = 200
+    reason = "OK"
+
     def __init__(self, lines: list[str]) -> None:
         self.lines = lines
 
@@ -39,6 +45,9 @@ class _FakeStreamingResponse:
         for line in self.lines:
             yield line.encode("utf-8")
 
+    def read(self) -> bytes:
+        return b""
+
     def __enter__(self) -> "_FakeStreamingResponse":
         return self
 
@@ -48,6 +57,8 @@ class _FakeStreamingResponse:
 
 class ChatbotExternalApiTests(unittest.TestCase):
     def tearDown(self) -> None:
+        chatbot.model_catalog.clear()
+        chatbot.validation_cache.clear()
         chatbot.set_system_prompt("")
         chatbot.clear_messages()
         chatbot.load_saved_settings(chatbot.config.DEFAULT_MODEL, chatbot.config.DEFAULT_TEMPERATURE)
@@ -101,18 +112,17 @@ class ChatbotExternalApiTests(unittest.TestCase):
         )
 
         with mock.patch.object(
-            chatbot.urlrequest,
-            "urlopen",
+            chatbot.external_pool,
+            "request",
             return_value=_FakeResponse(
                 {"data": [{"id": "gpt-4o-mini"}, {"id": "gpt-4.1-mini"}]}
             ),
-        ) as urlopen:
+        ) as request:
             models = chatbot.list_models()
 
         self.assertEqual(models, ["gpt-4o-mini", "gpt-4.1-mini"])
-        request = urlopen.call_args.args[0]
-        self.assertEqual(request.full_url, "https://api.example.com/v1/models")
-        self.assertEqual(request.get_header("Authorization"), "Bearer secret-key")
+        self.assertEqual(request.call_args.args, ("GET", "https://api.example.com/v1/models"))
+        self.assertEqual(request.call_args.kwargs["headers"]["Authorization"], "Bearer secret-key")
 
     def test_get_full_response_uses_external_chat_completions(self) -> None:
         chatbot.load_saved_settings(
@@ -130,18 +140,17 @@ class ChatbotExternalApiTests(unittest.TestCase):
             "list_models",
             return_value=["gpt-4o-mini"],
         ), mock.patch.object(
-            chatbot.urlrequest,
-            "urlopen",
+            chatbot.external_pool,
+            "request",
             return_value=_FakeResponse(
                 {"choices": [{"message": {"content": "Hello from the external API."}}]}
             ),
-        ) as urlopen:
+        ) as request:
             response = chatbot.get_full_response("Tell me about the booth.")
 
         self.assertEqual(response, "Hello from the external API.")
-        request = urlopen.call_args.args[0]
-        self.assertEqual(request.full_url, "https://api.example.com/v1/chat/completions")
-        payload = json.loads(request.data.decode("utf-8"))
+        self.assertEqual(request.call_args.args, ("POST", "https://api.example.com/v1/chat/completions"))
+        payload = json.loads(request.call_args.kwargs["body"].decode("utf-8"))
         self.assertEqual(payload["model"], "gpt-4o-mini")
         self.assertEqual(payload["messages"][0]["role"], "system")
         self.assertEqual(payload["messages"][1]["role"], "user")
@@ -163,8 +172,8 @@ class ChatbotExternalApiTests(unittest.TestCase):
             "list_models",
             return_value=["gpt-4o-mini"],
         ), mock.patch.object(
-            chatbot.urlrequest,
-            "urlopen",
+            chatbot.external_pool,
+            "request",
             return_value=_FakeResponse(
                 {
                     "choices": [
@@ -218,8 +227,8 @@ class ChatbotExternalApiTests(unittest.TestCase):
             "list_models",
             return_value=["gpt-4o-mini"],
         ), mock.patch.object(
-            chatbot.urlrequest,
-            "urlopen",
+            chatbot.external_pool,
+            "request",
             return_value=_FakeStreamingResponse(stream_lines),
         ):
             chunks = list(chatbot.get_response_by_punctuation("Tell me about the booth."))
@@ -270,6 +279,81 @@ class ChatbotExternalApiTests(unittest.TestCase):
             chatbot.set_model("openai/gpt-4.1-mini")
             self.assertEqual(chatbot.get_model(), "openai/gpt-4.1-mini")
 
+    def test_model_validation_reuses_catalog_and_refetches_once_for_unknown_model(self) -> None:
+        chatbot.load_saved_settings(
+            "openai/gpt-5-mini",
+            0.4,
+            chatbot.PROVIDER_OPENAI_COMPATIBLE,
+            "https://api.example.com/v1",
+            "secret-key",
+        )
+
+        with mock.patch.object(
+            chatbot,
+            "list_models",
+            return_value=["openai/gpt-5-mini", "openai/gpt-4.1-mini"],
+        ) as list_models:
+            chatbot.set_model("openai/gpt-5-mini")
+            chatbot.set_model("openai/gpt-4.1-mini")
+            self.assertEqual(list_models.call_count, 1)
+            with self.assertRaisesRegex(ValueError, "was not returned"):
+                chatbot.set_model("openai/gpt-unknown")
+
+        self.assertEqual(list_models.call_count, 2)
+        self.assertEqual(
+            list_models.call_args.kwargs,
+            {
+                "provider": chatbot.PROVIDER_OPENAI_COMPATIBLE,
+                "api_base_url": "https://api.example.com/v1",
+                "api_key": "secret-key",
+            },
+        )
+
+    def test_validated_model_survives_reloading_the_same_settings(self) -> None:
+        settings = (
+            "openai/gpt-5-mini",
+            0.4,
+            chatbot.PROVIDER_OPENAI_COMPATIBLE,
+            "https://api.example.com/v1",
+            "secret-key",
+        )
+        chatbot.load_saved_settings(*settings)
+        with mock.patch.object(chatbot, "list_models", return_value=["openai/gpt-5-mini"]):
+            chatbot.set_model("openai/gpt-5-mini")
+
+        chatbot.model_catalog.clear()
+        chatbot.load_saved_settings(*settings)
+        with mock.patch.object(chatbot, "list_models", return_value=[]) as list_models:
+            chatbot.set_model("openai/gpt-5-mini")
+        list_models.assert_not_called()
+
+        chatbot.load_saved_settings(*settings[:4], "different-key")
+        with mock.patch.object(chatbot, "list_models", return_value=["openai/gpt-5-mini"]) as list_models:
+            chatbot.set_model("openai/gpt-5-mini")
+        list_models.assert_called_once()
+
+    def test_chat_error_for_the_model_clears_its_validation(self) -> None:
+        chatbot.load_saved_settings(
+            "gpt-4o-mini",
+            0.4,
+            chatbot.PROVIDER_OPENAI_COMPATIBLE,
+            "https://api.example.com/v1",
+            "secret-key",
+        )
+        key = (chatbot.PROVIDER_OPENAI_COMPATIBLE, "https://api.example.com/v1", "gpt-4o-mini")
+        with mock.patch.object(chatbot, "list_models", return_value=["gpt-4o-mini"]):
+            chatbot.set_model("gpt-4o-mini")
+        self.assertEqual(chatbot.validation_cache.lookup(key, "secret-key"), chatbot.catalog.VALIDATION_FRESH)
+
+        with mock.patch.object(
+            chatbot.external_pool,
+            "request",
+            return_value=_FakeResponse({"error": {"message": "The model `gpt-4o-mini` does not exist"}}),
+        ), self.assertRaisesRegex(RuntimeError, "does not exist"):
+            chatbot.get_full_response("Hello?")
+
+        self.assertEqual(chatbot.validation_cache.lookup(key, "secret-key"), chatbot.catalog.VALIDATION_MISSING)
+
     def test_extract_external_text_surfaces_top_level_error_message(self) -> None:
         with self.assertRaisesRegex(RuntimeError, "rate limit"):
             chatbot._extract_external_text(
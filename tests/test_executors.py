@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+executors = importlib.import_module("Furhat.executors")
+
+
+class BoundedExecutorTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.executor = executors.BoundedExecutor("test", 1, 1)
+        self.addCleanup(self.executor.shutdown)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    async def test_work_past_workers_and_queue_is_rejected(self) -> None:
+        started = threading.Event()
+        running = self.executor.submit(lambda: started.set() or self.release.wait(5))
+        await asyncio.to_thread(started.wait, 1)
+        queued = self.executor.submit(lambda: "queued")
+
+        with self.assertRaises(executors.ExecutorSaturated):
+            self.executor.submit(lambda: "rejected")
+        self.release.set()
+
+        self.assertEqual(queued.result(timeout=1), "queued")
+        self.assertTrue(running.result(timeout=1))
+        stats = self.executor.stats()
+        self.assertEqual((stats["running"], stats["queued"], stats["completed"]), (0, 0, 2))
+        self.assertEqual((stats["peak_queued"], stats["rejected"]), (1, 1))
+
+    async def test_timed_out_queued_job_gives_its_slot_back(self) -> None:
+        started = threading.Event()
+        self.executor.submit(lambda: started.set() or self.release.wait(5))
+        await asyncio.to_thread(started.wait, 1)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.executor.run(lambda: "never"), timeout=0.05)
+
+        self.assertEqual(self.executor.stats()["queued"], 0)
+        self.executor.submit(lambda: "admitted").cancel()
+
+    async def test_named_executors_are_shared_and_reported(self) -> None:
+        executors.shutdown_executors(executors.FILE_IO)
+        self.addCleanup(executors.shutdown_executors, executors.FILE_IO)
+
+        result = await executors.run(executors.FILE_IO, sum, [1, 2, 3])
+
+        self.assertEqual(result, 6)
+        self.assertIs(executors.get_executor(executors.FILE_IO), executors.get_executor(executors.FILE_IO))
+        self.assertEqual(executors.executor_stats()[executors.FILE_IO]["completed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from Furhat import headless, main as main_module  # noqa: E402
+
+
+class HeadlessTests(unittest.TestCase):
+    def test_headless_entrypoint_does_not_import_tkinter_or_ui(self) -> None:
+        code = (
+            "import json, sys\n"
+            "import Furhat.main, Furhat.headless\n"
+            "Furhat.main.parse_args(['--headless'])\n"
+            "print(json.dumps(sorted(name for name in sys.modules "
+            "if name == 'tkinter' or name.startswith('Furhat.UI'))))\n"
+        )
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(SRC)
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        )
+
+        self.assertEqual(json.loads(result.stdout.strip().splitlines()[-1]), [])
+
+    def test_parse_args_defaults_to_desktop_ui(self) -> None:
+        self.assertFalse(main_module.parse_args([]).headless)
+        self.assertTrue(main_module.parse_args(["--headless"]).headless)
+
+    def test_main_runs_setup_on_loop_and_shuts_down_when_stopped(self) -> None:
+        setup_started = threading.Event()
+        stop_event = threading.Event()
+
+        async def fake_setup() -> None:
+            setup_started.set()
+            stop_event.set()
+            await asyncio.sleep(3600)
+
+        original_sigint = signal.getsignal(signal.SIGINT)
+        with (
+            mock.patch.object(headless.app_settings, "apply_settings") as apply_settings,
+            mock.patch.object(headless.web_server, "start_server", return_value=None) as start_server,
+            mock.patch.object(headless.robot, "setup", side_effect=fake_setup),
+            mock.patch.object(headless.robot, "attach_loop") as attach_loop,
+            mock.patch.object(headless.robot, "disconnect") as disconnect,
+        ):
+            headless.main(stop_event=stop_event)
+
+        apply_settings.assert_called_once()
+        start_server.assert_called_once()
+        attach_loop.assert_called_once()
+        self.assertTrue(setup_started.is_set())
+        disconnect.assert_called_once_with(wait=True)
+        self.assertIs(signal.getsignal(signal.SIGINT), original_sigint)
+        loop = attach_loop.call_args.args[0]
+        self.assertFalse(loop.is_running())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+http_pool = importlib.import_module("Furhat.Ollama.http_pool")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"port": self.client_address[1], "path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the socket without announcing it, like a proxy timing out an idle connection.
+        self.close_connection = self.path == "/drop"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class HttpPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.now = [0.0]
+        self.pool = http_pool.HttpPool(max_idle=2, idle_timeout=60.0, clock=lambda: self.now[0])
+        self.addCleanup(self.pool.close)
+
+    def _get(self, path: str = "/models") -> dict[str, object]:
+        with self.pool.request("GET", f"{self.base_url}{path}", timeout=5.0) as response:
+            return json.loads(response.read())
+
+    def test_sequential_requests_share_one_connection(self) -> None:
+        first = self._get()
+        second = self._get("/models?refresh=1")
+
+        self.assertEqual(first["port"], second["port"])
+        self.assertEqual(second["path"], "/models?refresh=1")
+        stats = self.pool.stats()
+        self.assertEqual((stats["created"], stats["reused"], stats["idle"]), (1, 1, 1))
+
+    def test_idle_connections_expire(self) -> None:
+        first = self._get()
+        self.now[0] = 61.0
+        second = self._get()
+
+        self.assertNotEqual(first["port"], second["port"])
+        self.assertEqual(self.pool.stats()["expired"], 1)
+
+    def test_unfinished_response_drops_its_connection(self) -> None:
+        with self.pool.request("GET", f"{self.base_url}/models", timeout=5.0):
+            pass
+        self._get()
+
+        stats = self.pool.stats()
+        self.assertEqual((stats["created"], stats["discarded"], stats["in_use"]), (2, 1, 0))
+
+    def test_connection_closed_by_server_is_retried_once(self) -> None:
+        first = self._get("/drop")
+        second = self._get()
+
+        self.assertNotEqual(first["port"], second["port"])
+        self.assertEqual(self.pool.stats()["retried"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import importlib
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+chatbot = importlib.import_module("Furhat.Ollama.chatbot")
+routing = importlib.import_module("Furhat.Ollama.routing")
+
+LOCAL = routing.Route("local", "ollama", "gemma3:4b")
+REMOTE = routing.Route("remote", "openai_compatible", "openai/gpt-4.1-mini")
+
+
+def _backend(tokens: list[str], *, first_delay: float = 0.0, fail: Exception | None = None, seen=None):
+    """A stand-in backend that streams ``tokens`` after ``first_delay``."""
+
+    def stream(route):
+        if first_delay:
+            time.sleep(first_delay)
+        if fail is not None:
+            raise fail
+        for token in tokens:
+            if seen is not None:
+                seen.append(token)
+            yield token
+
+    return stream
+
+
+def _by_route(**backends):
+    return lambda route: backends[route.name](route)
+
+
+class RouterTests(unittest.IsolatedAsyncioTestCase):
+    async def _prime(self, router, route, ttft: float, count: int = 5) -> None:
+        for _ in range(count):
+            await router.run([route], lambda _route: iter(["ok"]), first_token_timeout=1.0)
+        with router._lock:
+            stats = router._route_stats(route)
+            stats.ttft.clear()
+            stats.ttft.extend([ttft] * count)
+
+    async def test_turn_goes_to_the_fastest_healthy_route(self) -> None:
+        router = routing.Router(hedge_percentile=0)
+        await self._prime(router, LOCAL, 0.8)
+        await self._prime(router, REMOTE, 0.2)
+
+        route, text = await router.run(
+            [LOCAL, REMOTE],
+            _by_route(local=_backend(["slow"]), remote=_backend(["fast"])),
+            first_token_timeout=1.0,
+        )
+
+        self.assertEqual((route.name, text), ("remote", "fast"))
+        self.assertEqual(router.rank([LOCAL, REMOTE]), [REMOTE, LOCAL])
+
+    async def test_slow_first_token_is_hedged_and_the_loser_stops(self) -> None:
+        router = routing.Router(hedge_percentile=0.9, min_samples=5)
+        await self._prime(router, LOCAL, 0.02)
+        await self._prime(router, REMOTE, 0.05)
+        local_seen: list[str] = []
+
+        route, text = await router.run(
+            [LOCAL, REMOTE],
+            _by_route(
+                local=_backend(["late ", "answer"], first_delay=0.3, seen=local_seen),
+                remote=_backend(["quick ", "answer"]),
+            ),
+            first_token_timeout=2.0,
+        )
+        await asyncio.sleep(0.4)
+
+        self.assertEqual((route.name, text), ("remote", "quick answer"))
+        self.assertEqual(local_seen, ["late "])
+        stats = router.stats()["local"]
+        self.assertEqual((stats["hedges"], stats["samples"]), (1, 6))
+
+    async def test_hanging_route_without_samples_fails_over_at_the_first_token_deadline(self) -> None:
+        router = routing.Router(hedge_percentile=0.9)
+        backends = _by_route(local=_backend(["late"], first_delay=0.3), remote=_backend(["hi"]))
+
+        route, text = await router.run([LOCAL, REMOTE], backends, first_token_timeout=0.1)
+
+        self.assertEqual((route.name, text), ("remote", "hi"))
+        self.assertEqual(router.stats()["local"]["error_rate"], 1.0)
+        self.assertEqual(router.rank([LOCAL, REMOTE])[0], REMOTE)
+
+    async def test_deadline_covers_only_the_first_token(self) -> None:
+        router = routing.Router(hedge_percentile=0)
+
+        def slow_tail(route):
+            yield "Hello"
+            time.sleep(0.2)
+            yield " there."
+
+        route, text = await router.run([LOCAL], slow_tail, first_token_timeout=0.1)
+
+        self.assertEqual(text, "Hello there.")
+        self.assertEqual(router.stats()["local"]["error_rate"], 0.0)
+
+    async def test_executor_queue_wait_does_not_count_against_the_first_token(self) -> None:
+        router = routing.Router(hedge_percentile=0)
+        queue = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(queue.shutdown, wait=True)
+        queue.submit(time.sleep, 0.3)  # Someone else's job holds the only worker.
+
+        route, text = await router.run(
+            [LOCAL],
+            _backend(["ok"]),
+            first_token_timeout=0.2,
+            submit=queue.submit,
+        )
+
+        self.assertEqual((route.name, text), ("local", "ok"))
+        self.assertLess(router.stats()["local"]["ttft_p50_ms"], 200.0)
+
+    async def test_failing_route_hands_over_and_is_skipped_until_cooldown(self) -> None:
+        now = [0.0]
+        lock = threading.Lock()
+
+        def clock() -> float:
+            with lock:
+                return now[0]
+
+        router = routing.Router(hedge_percentile=0, max_error_rate=0.5, cooldown_sec=30.0, clock=clock)
+        backends = _by_route(local=_backend([], fail=RuntimeError("GPU busy")), remote=_backend(["hi"]))
+
+        route, text = await router.run([LOCAL, REMOTE], backends, first_token_timeout=5.0)
+
+        self.assertEqual((route.name, text), ("remote", "hi"))
+        self.assertFalse(router.stats()["local"]["healthy"])
+        self.assertEqual(router.rank([LOCAL, REMOTE])[0], REMOTE)
+        now[0] = 31.0
+        self.assertTrue(router.stats()["local"]["healthy"])
+
+    async def test_every_route_failing_raises_the_last_error(self) -> None:
+        router = routing.Router(hedge_percentile=0)
+        backends = _by_route(
+            local=_backend([], fail=RuntimeError("GPU busy")),
+            remote=_backend([], fail=RuntimeError("HTTP 503")),
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "HTTP 503"):
+            await router.run([LOCAL, REMOTE], backends, first_token_timeout=5.0)
+
+
+class ChatbotRoutingTests(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self) -> None:
+        chatbot.configure_routing(routes=[])
+        chatbot.clear_messages()
+
+    async def test_routed_turn_validates_routes_and_records_the_winner(self) -> None:
+        broken = routing.Route("broken", "openai_compatible", "o3-mini")
+        chatbot.configure_routing(routes=[REMOTE, broken], hedge_percentile=0)
+        attempted: list[str] = []
+
+        def fake_validate(model, route=None):
+            if route is not None and route.name == "broken":
+                raise ValueError("unsupported model")
+
+        def fake_stream(route, history, finish_reasons):
+            attempted.append(route.name)
+            self.assertEqual(history[-1], {"role": "user", "content": "hello"})
+            if route.name == chatbot.PRIMARY_ROUTE:
+                raise RuntimeError("GPU busy")
+            finish_reasons[route.name] = "length"
+            yield "Hi there."
+
+        with mock.patch.object(
+            chatbot, "_validate_chat_model", side_effect=fake_validate
+        ) as validate, mock.patch.object(chatbot, "_stream_route", side_effect=fake_stream):
+            response = await chatbot.get_reply("hello")
+
+        self.assertEqual(response, "Hi there.")
+        self.assertIn(mock.call(REMOTE.model, REMOTE), validate.call_args_list)
+        self.assertNotIn("broken", attempted)
+        self.assertEqual(chatbot.messages[-1], {"role": "assistant", "content": "Hi there."})
+        info = chatbot.get_last_completion_info()
+        self.assertEqual((info["route"], info["model"], info["truncated"]), ("remote", REMOTE.model, True))
+        self.assertEqual(set(chatbot.get_route_stats()), {"primary", "remote"})
+
+    async def test_failed_routed_turn_leaves_no_unanswered_prompt(self) -> None:
+        chatbot.configure_routing(routes=[REMOTE], hedge_percentile=0)
+
+        def fake_stream(route, history, finish_reasons):
+            raise RuntimeError(f"{route.name} down")
+            yield ""
+
+        with (
+            mock.patch.object(chatbot, "_validate_chat_model"),
+            mock.patch.object(chatbot, "_stream_route", side_effect=fake_stream),
+        ):
+            with self.assertRaises(RuntimeError):
+                await chatbot.get_reply("hello")
+
+        self.assertNotIn({"role": "user", "content": "hello"}, chatbot.messages)
+
+    def test_routes_are_parsed_from_json(self) -> None:
+        routes = chatbot._parse_routes(
+            '[{"name": "cloud", "provider": "openai_compatible", "model": "openai/gpt-4.1-mini",'
+            ' "api_base_url": "https://example.test/v1/"}]'
+        )
+
+        self.assertEqual(routes[0].api_base_url, "https://example.test/v1")
+        with self.assertRaises(ValueError):
+            chatbot._parse_routes('[{"name": "primary", "model": "x"}]')
+
+
+if __name__ == "__main__":
+    unittest.main()
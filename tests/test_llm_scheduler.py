@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+scheduler = importlib.import_module("Furhat.Ollama.scheduler")
+
+
+class LlmSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_waiters_run_by_class_then_arrival(self) -> None:
+        llm = scheduler.LlmScheduler(1, preempt=False)
+        order: list[str] = []
+        gate = asyncio.Event()
+
+        async def job(name: str, priority: str) -> None:
+            async with llm.slot(priority):
+                order.append(name)
+                await gate.wait()
+
+        first = asyncio.create_task(job("first", scheduler.BACKGROUND))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(job("warmup", scheduler.BACKGROUND)),
+            asyncio.create_task(job("web-1", scheduler.INTERACTIVE_WEB)),
+            asyncio.create_task(job("desk", scheduler.INTERACTIVE_DESKTOP)),
+            asyncio.create_task(job("web-2", scheduler.INTERACTIVE_WEB)),
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(llm.stats()[scheduler.INTERACTIVE_WEB]["waiting"], 2)
+        gate.set()
+        await asyncio.gather(first, *waiters)
+
+        self.assertEqual(order, ["first", "desk", "web-1", "web-2", "warmup"])
+        self.assertEqual(llm.stats()[scheduler.INTERACTIVE_WEB]["admitted"], 2)
+
+    async def test_interactive_turn_preempts_background_work(self) -> None:
+        llm = scheduler.LlmScheduler(1)
+        started = asyncio.Event()
+
+        async def warmup() -> str:
+            try:
+                async with llm.slot(scheduler.BACKGROUND):
+                    started.set()
+                    await asyncio.sleep(10)
+            except scheduler.Preempted:
+                return "preempted"
+            return "finished"
+
+        background = asyncio.create_task(warmup())
+        await started.wait()
+        async with llm.slot(scheduler.INTERACTIVE_DESKTOP):
+            pass
+
+        self.assertEqual(await background, "preempted")
+        stats = llm.stats()
+        self.assertEqual(stats[scheduler.BACKGROUND]["preempted"], 1)
+        self.assertEqual(stats[scheduler.BACKGROUND]["running"], 0)
+
+    async def test_preempted_executor_call_raises_preempted(self) -> None:
+        llm = scheduler.LlmScheduler(1)
+        started = asyncio.Event()
+
+        async def warmup() -> str:
+            try:
+                async with llm.slot(scheduler.BACKGROUND):
+                    started.set()
+                    await asyncio.get_running_loop().run_in_executor(None, time.sleep, 0.2)
+            except scheduler.Preempted:
+                return "preempted"
+            return "finished"
+
+        background = asyncio.create_task(warmup())
+        await started.wait()
+        async with llm.slot(scheduler.INTERACTIVE_WEB):
+            pass
+
+        self.assertEqual(await background, "preempted")
+        self.assertEqual(background.cancelling() if hasattr(background, "cancelling") else 0, 0)
+
+    def test_preemption_needs_no_uncancel(self) -> None:
+        # Python 3.10 tasks have no cancel count to withdraw.
+        self.assertTrue(scheduler._forget_own_cancel(SimpleNamespace()))
+
+    async def test_cancelled_waiter_gives_up_its_place(self) -> None:
+        llm = scheduler.LlmScheduler(1)
+        ticket = await llm.acquire(scheduler.INTERACTIVE_WEB)
+        waiter = asyncio.create_task(llm.acquire(scheduler.INTERACTIVE_WEB))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        llm.release(ticket)
+
+        stats = llm.stats()[scheduler.INTERACTIVE_WEB]
+        self.assertEqual((stats["waiting"], stats["running"], stats["admitted"]), (0, 0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from Furhat.Ollama import catalog  # noqa: E402
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ModelCatalogTests(unittest.TestCase):
+    def test_get_models_caches_per_provider_and_base_url_until_ttl(self) -> None:
+        calls: list[tuple[str, str, str]] = []
+        clock = _Clock()
+
+        def fetcher(provider: str, base_url: str, api_key: str) -> list[str]:
+            calls.append((provider, base_url, api_key))
+            return [f"{provider}-model"]
+
+        model_catalog = catalog.ModelCatalog(fetcher, ttl_sec=60, clock=clock)
+
+        self.assertEqual(model_catalog.get_models("ollama", "", ""), ["ollama-model"])
+        self.assertEqual(model_catalog.get_models("ollama", "", ""), ["ollama-model"])
+        model_catalog.get_models("openai_compatible", "https://api.example.com/v1", "key")
+        clock.now += 61
+        model_catalog.get_models("ollama", "", "")
+
+        self.assertEqual(
+            calls,
+            [
+                ("ollama", "", ""),
+                ("openai_compatible", "https://api.example.com/v1", "key"),
+                ("ollama", "", ""),
+            ],
+        )
+
+    def test_entries_are_persisted_without_api_key(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "model_catalog.json"
+            first = catalog.ModelCatalog(lambda *_args: ["a", "b"], path=path)
+            first.get_models("openai_compatible", "https://api.example.com/v1", "secret-key")
+
+            second = catalog.ModelCatalog(lambda *_args: [], path=path)
+            entry = second.cached("openai_compatible", "https://api.example.com/v1")
+
+            self.assertIsNotNone(entry)
+            assert entry is not None
+            self.assertEqual(entry.models, ("a", "b"))
+            self.assertNotIn("secret-key", path.read_text(encoding="utf-8"))
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8"))["version"], 1)
+
+    def test_get_models_async_shares_one_fetch_between_callers(self) -> None:
+        release = threading.Event()
+        calls: list[str] = []
+
+        def fetcher(provider: str, base_url: str, api_key: str) -> list[str]:
+            calls.append(provider)
+            release.wait(timeout=2)
+            return ["m1"]
+
+        model_catalog = catalog.ModelCatalog(fetcher)
+        results: list[tuple[list[str], Exception | None]] = []
+        done = threading.Event()
+
+        def callback(models: list[str], error: Exception | None) -> None:
+            results.append((models, error))
+            if len(results) == 2:
+                done.set()
+
+        thread = model_catalog.get_models_async("ollama", "", "", callback)
+        self.assertIsNone(model_catalog.get_models_async("ollama", "", "", callback))
+        release.set()
+        self.assertTrue(done.wait(2))
+        assert thread is not None
+        thread.join(timeout=2)
+
+        self.assertEqual(calls, ["ollama"])
+        self.assertEqual(results, [(["m1"], None), (["m1"], None)])
+
+    def test_get_models_async_reports_errors(self) -> None:
+        def fetcher(provider: str, base_url: str, api_key: str) -> list[str]:
+            raise RuntimeError("offline")
+
+        model_catalog = catalog.ModelCatalog(fetcher)
+        results: list[tuple[list[str], Exception | None]] = []
+
+        thread = model_catalog.get_models_async("ollama", "", "", lambda m, e: results.append((m, e)))
+        assert thread is not None
+        thread.join(timeout=2)
+
+        self.assertEqual(results[0][0], [])
+        self.assertIsInstance(results[0][1], RuntimeError)
+
+
+class ModelValidationCacheTests(unittest.TestCase):
+    KEY = ("openai_compatible", "https://api.example.com/v1", "gpt-4o-mini")
+
+    def test_lookup_moves_from_fresh_to_stale_to_missing(self) -> None:
+        clock = _Clock()
+        cache = catalog.ModelValidationCache(ttl_sec=60, max_stale_sec=600, clock=clock)
+
+        self.assertEqual(cache.lookup(self.KEY, "key"), catalog.VALIDATION_MISSING)
+        cache.mark_valid(self.KEY, "key")
+        self.assertEqual(cache.lookup(self.KEY, "key"), catalog.VALIDATION_FRESH)
+        self.assertEqual(cache.lookup(self.KEY, "other-key"), catalog.VALIDATION_MISSING)
+        clock.now += 120
+        self.assertEqual(cache.lookup(self.KEY, "key"), catalog.VALIDATION_STALE)
+        clock.now += 600
+        self.assertEqual(cache.lookup(self.KEY, "key"), catalog.VALIDATION_MISSING)
+
+    def test_entries_persist_with_key_fingerprint_only(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "model_validation.json"
+            catalog.ModelValidationCache(path=path).mark_valid(self.KEY, "secret-key")
+
+            reloaded = catalog.ModelValidationCache(path=path)
+
+            # Trusted for the first turn, but re-checked since another process proved it.
+            self.assertEqual(reloaded.lookup(self.KEY, "secret-key"), catalog.VALIDATION_STALE)
+            self.assertNotIn("secret-key", path.read_text(encoding="utf-8"))
+            reloaded.mark_valid(self.KEY, "secret-key")
+            self.assertEqual(reloaded.lookup(self.KEY, "secret-key"), catalog.VALIDATION_FRESH)
+
+    def test_failed_background_revalidation_discards_entry(self) -> None:
+        clock = _Clock()
+        cache = catalog.ModelValidationCache(ttl_sec=60, max_stale_sec=600, clock=clock)
+        cache.mark_valid(self.KEY, "key")
+        clock.now += 120
+
+        def failing_validator() -> None:
+            raise RuntimeError("model removed")
+
+        thread = cache.revalidate_async(self.KEY, "key", failing_validator)
+        assert thread is not None
+        thread.join(timeout=2)
+
+        self.assertEqual(cache.lookup(self.KEY, "key"), catalog.VALIDATION_MISSING)
+
+    def test_successful_background_revalidation_refreshes_entry(self) -> None:
+        clock = _Clock()
+        cache = catalog.ModelValidationCache(ttl_sec=60, max_stale_sec=600, clock=clock)
+        cache.mark_valid(self.KEY, "key")
+        clock.now += 120
+
+        thread = cache.revalidate_async(self.KEY, "key", lambda: None)
+        assert thread is not None
+        thread.join(timeout=2)
+
+        self.assertEqual(cache.lookup(self.KEY, "key"), catalog.VALIDATION_FRESH)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -159,6 +160,62 @@ class PresetsStoreTests(unittest.TestCase):
         assert preset is not None
         self.assertEqual(preset.prompt, "char intro")
 
+    def test_preset_snapshot_is_cached_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preset_path = Path(temp_dir) / "demo_presets.json"
+            preset_path.write_text(
+                json.dumps({"version": 1, "global": [{"id": "intro", "prompt": "first"}]}),
+                encoding="utf-8",
+            )
+
+            first = presets_store.get_preset_snapshot(path=preset_path)
+            with mock.patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+                second = presets_store.get_preset_snapshot(path=preset_path)
+                preset = presets_store.find_active_preset({}, "intro", path=preset_path)
+
+            self.assertIs(first, second)
+            assert preset is not None
+            self.assertEqual(preset.prompt, "first")
+            with self.assertRaises(TypeError):
+                first.global_index["other"] = preset  # type: ignore[index]
+
+            preset_path.write_text(
+                json.dumps({"version": 1, "global": [{"id": "intro", "prompt": "second, longer"}]}),
+                encoding="utf-8",
+            )
+            third = presets_store.get_preset_snapshot(path=preset_path)
+
+            self.assertIsNot(first, third)
+            self.assertEqual(third.global_index["intro"].prompt, "second, longer")
+
+    def test_write_preset_file_invalidates_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preset_path = Path(temp_dir) / "demo_presets.json"
+            presets_store.ensure_preset_file(path=preset_path)
+            self.assertEqual(presets_store.get_preset_snapshot(path=preset_path).global_presets, ())
+
+            presets_store.write_preset_file(
+                presets_store.PresetFile.from_dict({"global": [{"id": "a", "prompt": "hello"}]}),
+                path=preset_path,
+            )
+            resolved = presets_store.resolve_active_presets({}, path=preset_path)
+
+            self.assertEqual(resolved.scope, "global")
+            self.assertEqual([item.id for item in resolved.presets], ["a"])
+
+    def test_preset_snapshot_reports_validation_error_and_keeps_lenient_presets(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preset_path = Path(temp_dir) / "demo_presets.json"
+            preset_path.write_text(
+                json.dumps({"version": 1, "global": [{"id": "ok", "prompt": "fine"}, {"prompt": ""}]}),
+                encoding="utf-8",
+            )
+
+            snapshot = presets_store.get_preset_snapshot(path=preset_path)
+
+            self.assertIn("global[1].prompt", snapshot.error)
+            self.assertEqual([item.id for item in snapshot.global_presets], ["ok"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -132,10 +132,14 @@ class PublicWebServerTests(unittest.TestCase):
         method: str,
         path: str,
         body: dict[str, object] | None = None,
+        *,
+        cookie: str = "",
     ) -> tuple[int, dict[str, object]]:
         connection = http.client.HTTPConnection(self.host, self.port, timeout=5)
         payload = None
         headers = {}
+        if cookie:
+            headers["Cookie"] = f"{web_server.CLIENT_COOKIE_NAME}={cookie}"
         if body is not None:
             payload = json.dumps(body)
             headers["Content-Type"] = "application/json"
@@ -205,6 +209,51 @@ class PublicWebServerTests(unittest.TestCase):
         self.assertEqual(data_state["busy_reason"], "cooldown")
         self.assertEqual(data_state["input_enabled_reason"], "cooldown")
 
+    def test_public_cooldown_is_tracked_per_client_cookie(self) -> None:
+        with mock.patch.object(web_server, "PUBLIC_DISPATCH_GUARD_SEC", 0.0):
+            status_a, _ = self._request("POST", "/api/public/speak", {"text": "one"}, cookie="visitor-aaaa")
+            status_a2, _ = self._request("POST", "/api/public/speak", {"text": "two"}, cookie="visitor-aaaa")
+            status_b, _ = self._request("POST", "/api/public/speak", {"text": "three"}, cookie="visitor-bbbb")
+
+        self.assertEqual(status_a, 200)
+        self.assertEqual(status_a2, 429)
+        self.assertEqual(status_b, 200)
+
+        _, data_a = self._request("GET", "/api/public/status", cookie="visitor-aaaa")
+        _, data_c = self._request("GET", "/api/public/status", cookie="visitor-cccc")
+        self.assertEqual(data_a["busy_reason"], "cooldown")
+        self.assertEqual(data_a["rate_limit"]["rejections"], 1)
+        self.assertGreater(data_a["rate_limit"]["remaining_ms"], 0)
+        self.assertEqual(set(data_a["rate_limit"]), {"remaining_ms", "rejections"})
+        self.assertEqual(web_server.get_public_rate_limit_stats()["clients"], 2)
+        self.assertEqual(data_c["status_text"], "Ready")
+        self.assertEqual(data_c["rate_limit"]["rejections"], 0)
+
+    def test_dispatch_guard_rejects_back_to_back_clients_without_spending_tokens(self) -> None:
+        status_a, _ = self._request("POST", "/api/public/speak", {"text": "one"}, cookie="visitor-aaaa")
+        status_b, data_b = self._request("POST", "/api/public/speak", {"text": "two"}, cookie="visitor-bbbb")
+
+        self.assertEqual(status_a, 200)
+        self.assertEqual(status_b, 409)
+        self.assertEqual(data_b, {"error": "robot is busy"})
+        _, data_state = self._request("GET", "/api/public/status", cookie="visitor-bbbb")
+        self.assertEqual(data_state["cooldown_remaining_ms"], 0)
+
+    def test_index_sets_client_cookie_once(self) -> None:
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        connection.request("GET", "/")
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        self.assertIn(f"{web_server.CLIENT_COOKIE_NAME}=", response.getheader("Set-Cookie", ""))
+
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=5)
+        connection.request("GET", "/", headers={"Cookie": f"{web_server.CLIENT_COOKIE_NAME}=visitor-aaaa"})
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        self.assertIsNone(response.getheader("Set-Cookie"))
+
     def test_public_endpoints_return_busy_when_runtime_is_busy(self) -> None:
         self.fake_robot.status["speech_session"] = True
 
@@ -249,5 +298,42 @@ class PublicWebServerTests(unittest.TestCase):
         self.assertEqual(self.fake_robot.listen_channels, ["web"])
 
 
+class ClientRateLimiterTests(unittest.TestCase):
+    def test_bucket_refills_over_time_up_to_capacity(self) -> None:
+        limiter = web_server._ClientRateLimiter(capacity=2, refill_sec=1.0, max_clients=4)
+
+        self.assertTrue(limiter.try_acquire("a", now=0.0))
+        self.assertTrue(limiter.try_acquire("a", now=0.0))
+        self.assertFalse(limiter.try_acquire("a", now=0.5))
+        self.assertEqual(limiter.remaining_ms("a", now=0.5), 500)
+        self.assertTrue(limiter.try_acquire("a", now=1.0))
+        self.assertEqual(limiter.client_rejections("a"), 1)
+
+    def test_least_recently_seen_client_is_evicted(self) -> None:
+        limiter = web_server._ClientRateLimiter(capacity=1, refill_sec=60.0, max_clients=2)
+
+        limiter.try_acquire("a", now=0.0)
+        limiter.try_acquire("b", now=0.0)
+        limiter.try_acquire("a", now=0.1)
+        limiter.try_acquire("c", now=0.2)
+
+        self.assertEqual(list(limiter.buckets), ["a", "c"])
+        self.assertEqual(limiter.stats()["evictions"], 1)
+        self.assertEqual(limiter.remaining_ms("b", now=0.3), 0)
+
+    def test_rotating_cookies_stays_within_the_address(self) -> None:
+        limiter = web_server._ClientRateLimiter(
+            capacity=1, refill_sec=60.0, max_clients=4, clients_per_address=2
+        )
+        limiter.try_acquire("10.0.0.2#visitor", now=0.0)
+
+        granted = [limiter.try_acquire(f"10.0.0.9#rotated-{idx}", now=0.1) for idx in range(6)]
+
+        self.assertEqual(granted, [True, True, False, False, False, False])
+        self.assertIn("10.0.0.2#visitor", limiter.buckets)
+        self.assertEqual(sum(key.startswith("10.0.0.9#") for key in limiter.buckets), 2)
+        self.assertEqual(limiter.remaining_ms("10.0.0.9#rotated-6", now=0.1), 30000)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import importlib
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+ann = importlib.import_module("Furhat.RAG.ann")
+builder = importlib.import_module("Furhat.RAG.builder")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+
+
+def _clustered_vectors(count: int, centers: int, dim: int = 8) -> list[list[float]]:
+    rng = random.Random(3)
+    anchors = [[rng.gauss(0.0, 1.0) for _ in range(dim)] for _ in range(centers)]
+    return [
+        [value + rng.gauss(0.0, 0.05) for value in anchors[idx % centers]]
+        for idx in range(count)
+    ]
+
+
+class IvfIndexTests(unittest.TestCase):
+    def test_probe_returns_the_query_cluster(self) -> None:
+        vectors = _clustered_vectors(120, centers=4)
+        index = ann.IvfIndex.build(vectors, nlist=4)
+
+        candidates = index.probe(vectors[5], nprobe=1)
+
+        self.assertIn(5, candidates)
+        self.assertTrue(all(idx % 4 == 5 % 4 for idx in candidates))
+        self.assertEqual(sorted(index.ids), list(range(120)))
+
+    def test_rag_index_uses_ann_only_above_threshold(self) -> None:
+        vectors = _clustered_vectors(60, centers=3)
+        entries = [
+            retriever.RagEntry(text=f"chunk {idx}", source="s.txt", chunk_id=idx, start=0, end=0)
+            for idx in range(60)
+        ]
+        index = retriever.RagIndex(
+            embeddings=vectors,
+            entries=entries,
+            ann=ann.IvfIndex.build(vectors, nlist=3),
+        )
+
+        with (
+            mock.patch.object(retriever, "ANN_MIN_CHUNKS", 10),
+            mock.patch.object(retriever, "ANN_NPROBE", 1),
+            mock.patch.object(index.ann, "probe", wraps=index.ann.probe) as probe,
+        ):
+            approximate = index.rank_vector(vectors[7], 5)
+            exact = index.rank_vector(vectors[7], 5, exact=True)
+        with (
+            mock.patch.object(retriever, "ANN_MIN_CHUNKS", 100),
+            mock.patch.object(index.ann, "probe") as skipped_probe,
+        ):
+            brute_force = index.rank_vector(vectors[7], 5)
+
+        probe.assert_called_once()
+        skipped_probe.assert_not_called()
+        self.assertEqual(approximate, exact)
+        self.assertEqual(brute_force, exact)
+
+    def test_builder_persists_ann_for_large_indexes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            data_dir = root / "data"
+            data_dir.mkdir()
+            for idx in range(6):
+                (data_dir / f"page{idx}.txt").write_text(f"Topic {idx} details. " * 10, encoding="utf-8")
+            output = root / "index.pkl"
+
+            with mock.patch.object(builder, "ANN_MIN_CHUNKS", 4), mock.patch.object(builder, "ANN_NLIST", 2):
+                builder.build_index(
+                    data_dir=data_dir,
+                    output=output,
+                    chunk_size=100,
+                    chunk_overlap=0,
+                    backend=embeddings.BACKEND_HASHED_NGRAM,
+                )
+            index = retriever.RagIndex.load(output)
+
+        self.assertIsNotNone(index.ann)
+        self.assertEqual(index.ann.nlist, 2)
+        self.assertEqual(sorted(index.ann.ids), list(range(len(index.entries))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+builder = importlib.import_module("Furhat.RAG.builder")
+cache = importlib.import_module("Furhat.RAG.cache")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+
+
+class TTLCacheTests(unittest.TestCase):
+    def test_entries_expire_and_least_recent_is_evicted(self) -> None:
+        now = [0.0]
+        store = cache.TTLCache(2, 10.0, clock=lambda: now[0])
+        store.put("a", 1)
+        store.put("b", 2)
+        store.get("a")
+        store.put("c", 3)
+
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a"), 1)
+        now[0] = 11.0
+        self.assertIsNone(store.get("c"))
+        self.assertEqual(store.stats(), {"entries": 1, "capacity": 2, "hits": 2, "misses": 2, "hit_rate": 0.5})
+
+    def test_zero_capacity_stores_nothing(self) -> None:
+        store = cache.TTLCache(0, 10.0)
+        store.put("a", 1)
+
+        self.assertIsNone(store.get("a"))
+
+
+class RetrievalCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(retriever.set_index_path, retriever.INDEX_PATH)
+        self.addCleanup(retriever.clear_query_caches)
+        retriever.clear_query_caches()
+        self.root = Path(temp_dir.name)
+
+    def _index(self, name: str, text: str) -> Path:
+        data_dir = self.root / name
+        data_dir.mkdir()
+        (data_dir / "rooms.txt").write_text(text, encoding="utf-8")
+        output = self.root / f"{name}.pkl"
+        builder.build_index(data_dir=data_dir, output=output, backend=embeddings.BACKEND_HASHED_NGRAM)
+        return output
+
+    def test_repeated_question_skips_embedding_and_scoring(self) -> None:
+        index = retriever.set_index_path(self._index("site", "The robotics lab is in room B204."))
+
+        with mock.patch.object(index.embedder, "embed_query", wraps=index.embedder.embed_query) as embed:
+            first = retriever.retrieve("Where is the robotics lab?")
+            second = retriever.retrieve("  where is the ROBOTICS lab?")
+
+        self.assertEqual(first, second)
+        self.assertEqual(embed.call_count, 1)
+        self.assertEqual(retriever.cache_stats()["results"]["hits"], 1)
+
+    def test_swapping_the_index_invalidates_results(self) -> None:
+        retriever.set_index_path(self._index("old", "The robotics lab is in room B204."))
+        retriever.retrieve("robotics lab")
+        retriever.set_index_path(self._index("new", "The robotics lab moved to room C310."))
+
+        entries = retriever.retrieve("robotics lab")
+
+        self.assertIn("C310", entries[0].text)
+
+
+if __name__ == "__main__":
+    unittest.main()
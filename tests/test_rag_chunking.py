@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+chunking = importlib.import_module("Furhat.RAG.chunking")
+
+
+NOTES = """Front Desk Notes
+
+====================
+1) VISITING
+====================
+Address:
+- 33 Quail Road,   Longmont.
+
+Parking
+Visitors park in the north lot. The south lot is for staff.
+
+## Tours
+Tours run on Fridays, e.g. at 10 a.m. and at 2 p.m.
+Groups larger than ten
+should book ahead.
+"""
+
+
+class ChunkingTests(unittest.TestCase):
+    def test_headings_become_section_metadata(self) -> None:
+        chunks = chunking.chunk_document(NOTES, source="desk.txt", max_tokens=12, overlap_tokens=0)
+        sections = {chunk.section for chunk in chunks}
+
+        self.assertEqual(chunks[0].title, "Front Desk Notes")
+        self.assertIn("1) VISITING > Parking", sections)
+        self.assertIn("1) VISITING > Tours", sections)
+        self.assertTrue(all("  " not in chunk.text and "====" not in chunk.text for chunk in chunks))
+
+    def test_sentences_stay_whole(self) -> None:
+        chunks = chunking.chunk_document(NOTES, max_tokens=30, overlap_tokens=0)
+        texts = [chunk.text for chunk in chunks if chunk.section.endswith("Tours")]
+
+        self.assertEqual(
+            texts,
+            ["Tours\nTours run on Fridays, e.g. at 10 a.m. and at 2 p.m.", "Groups larger than ten should book ahead."],
+        )
+        self.assertTrue(all(chunking.estimate_tokens(chunk.text) <= 30 for chunk in chunks))
+
+    def test_overlap_repeats_trailing_sentences_within_a_section(self) -> None:
+        text = " ".join(f"Fact number {idx} is here." for idx in range(12))
+
+        chunks = chunking.chunk_document(text, max_tokens=20, overlap_tokens=6)
+
+        self.assertGreater(len(chunks), 2)
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertEqual(current.text.split(". ")[0] + ".", previous.text.split(". ")[-1])
+            self.assertLess(current.start, previous.end)
+
+    def test_offsets_point_into_the_source(self) -> None:
+        chunks = chunking.chunk_document(NOTES, max_tokens=12, overlap_tokens=0)
+        parking = next(chunk for chunk in chunks if "north lot" in chunk.text)
+
+        self.assertTrue(NOTES[parking.start : parking.end].startswith("Parking"))
+
+    def test_contextual_text_adds_missing_headings_only(self) -> None:
+        self.assertEqual(
+            chunking.contextual_text("Visitors park north.", "Desk", "Visiting > Parking"),
+            "Desk > Visiting > Parking\nVisitors park north.",
+        )
+        self.assertEqual(chunking.contextual_text("Parking\nVisitors park north.", "", "Parking"), "Parking\nVisitors park north.")
+        self.assertEqual(chunking.title_from_source("03_08d7d519_2.Mitosis-Meiosis.txt"), "Mitosis Meiosis")
+
+
+if __name__ == "__main__":
+    unittest.main()
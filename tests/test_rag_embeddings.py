@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import importlib
+import math
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+builder = importlib.import_module("Furhat.RAG.builder")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+
+
+class HashedNgramEmbedderTests(unittest.TestCase):
+    def test_vectors_are_normalised_and_stable_across_instances(self) -> None:
+        first = embeddings.HashedNgramEmbedder(dim=256)
+        second = embeddings.HashedNgramEmbedder(dim=256)
+
+        vector = first.embed_query("Room B204 hosts the robotics lab.")
+
+        self.assertEqual(vector, second.embed_query("Room B204 hosts the robotics lab."))
+        self.assertAlmostEqual(math.sqrt(sum(value * value for value in vector)), 1.0)
+
+    def test_idf_round_trips_through_payload(self) -> None:
+        embedder = embeddings.HashedNgramEmbedder(dim=128)
+        embedder.embed_documents(["alpha beta", "beta gamma", "gamma delta"])
+
+        restored = embeddings.embedder_from_payload({"backend": embedder.to_payload()}, "unused")
+
+        self.assertIsInstance(restored, embeddings.HashedNgramEmbedder)
+        self.assertEqual(restored.idf, embedder.idf)
+        self.assertEqual(restored.embed_query("beta"), embedder.embed_query("beta"))
+
+    def test_legacy_payload_falls_back_to_ollama(self) -> None:
+        restored = embeddings.embedder_from_payload({"model": "nomic-embed-text"}, "other")
+
+        self.assertIsInstance(restored, embeddings.OllamaEmbedder)
+        self.assertEqual(restored.model, "nomic-embed-text")
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Unsupported embed backend"):
+            embeddings.create_embedder("word2vec", "nomic-embed-text")
+
+    def test_hashed_index_builds_and_retrieves_without_ollama(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            data_dir = root / "data"
+            data_dir.mkdir()
+            (data_dir / "rooms.txt").write_text(
+                "The robotics lab is in room B204 next to the makerspace.",
+                encoding="utf-8",
+            )
+            (data_dir / "food.txt").write_text(
+                "The cafeteria serves lunch from eleven until one.",
+                encoding="utf-8",
+            )
+            output = root / "index.pkl"
+
+            with mock.patch.object(embeddings.ollama, "embed", side_effect=AssertionError("network")):
+                count = builder.build_index(
+                    data_dir=data_dir,
+                    output=output,
+                    backend=embeddings.BACKEND_HASHED_NGRAM,
+                )
+                index = retriever.RagIndex.load(output)
+                results = index.retrieve("where is B204", k=1)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(index.embedder.name, embeddings.BACKEND_HASHED_NGRAM)
+        self.assertEqual(results[0].source, "rooms.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+builder = importlib.import_module("Furhat.RAG.builder")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+executors = importlib.import_module("Furhat.executors")
+
+
+class _FixedEmbedder:
+    name = "fixed"
+    model = "fixed"
+    fits_corpus = True
+    min_similarity = 0.0
+
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0, 0.0]
+
+
+def _memory_index(*vectors: list[float], prefix: str) -> object:
+    entries = [retriever.RagEntry(f"{prefix} chunk {idx}", f"{prefix}-{idx}.txt", 0, 0, 7) for idx in range(len(vectors))]
+    return retriever.RagIndex(embeddings=list(vectors), entries=entries, embedder=_FixedEmbedder())
+
+
+class FederatedRetrievalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(retriever.clear_index, retriever.INDEX_CHARACTER)
+        self.addCleanup(retriever.set_index_path, retriever.INDEX_PATH)
+        self.root = Path(temp_dir.name)
+
+    def _index(self, name: str, files: dict[str, str]) -> Path:
+        data_dir = self.root / name
+        data_dir.mkdir()
+        for filename, text in files.items():
+            (data_dir / filename).write_text(text, encoding="utf-8")
+        output = self.root / f"{name}.pkl"
+        builder.build_index(data_dir=data_dir, output=output, backend=embeddings.BACKEND_HASHED_NGRAM)
+        return output
+
+    def _load_both(self) -> None:
+        retriever.set_index_path(self._index("site", {"parking.txt": "Parking at the venue is free on weekends."}))
+        retriever.set_index_path(
+            self._index("persona", {"bio.txt": "The robot was built in Stockholm and loves parking jokes."}),
+            retriever.INDEX_CHARACTER,
+        )
+
+    def test_character_index_keeps_global_facts(self) -> None:
+        self._load_both()
+
+        sources = {entry.source for entry in retriever.retrieve("parking", k=4)}
+
+        self.assertEqual(sources, {"parking.txt", "bio.txt"})
+        self.assertEqual(set(retriever.get_indexes()), {retriever.INDEX_GLOBAL, retriever.INDEX_CHARACTER})
+
+    def test_weights_order_indexes(self) -> None:
+        self._load_both()
+
+        with mock.patch.object(retriever, "INDEX_WEIGHTS", {"global": 2.0, "character": 1.0}):
+            global_first = retriever.retrieve("parking", k=2)
+        with mock.patch.object(retriever, "INDEX_WEIGHTS", {"global": 1.0, "character": 2.0}):
+            character_first = retriever.retrieve("parking", k=2)
+
+        self.assertEqual(global_first[0].source, "parking.txt")
+        self.assertEqual(character_first[0].source, "bio.txt")
+
+    def test_slow_index_is_dropped_after_budget(self) -> None:
+        self._load_both()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        slow = retriever.get_index(retriever.INDEX_CHARACTER)
+
+        with (
+            mock.patch.object(retriever, "RETRIEVAL_BUDGET_MS", 50),
+            mock.patch.object(slow, "candidates", side_effect=lambda *args, **kwargs: release.wait(5) and []),
+        ):
+            entries = retriever.retrieve("parking", k=4)
+
+        self.assertEqual([entry.source for entry in entries], ["parking.txt"])
+
+    def test_search_on_a_busy_retrieval_worker_runs_inline(self) -> None:
+        self._load_both()
+        pool = executors.BoundedExecutor(executors.RETRIEVAL, workers=1, queue_limit=0)
+        self.addCleanup(pool.shutdown)
+
+        with mock.patch.object(executors, "get_executor", return_value=pool):
+            future = pool.submit(retriever.retrieve, "parking", 4)
+            sources = {entry.source for entry in future.result(timeout=5)}
+
+        self.assertEqual(sources, {"parking.txt", "bio.txt"})
+        self.assertFalse(pool.in_worker())
+
+    def test_duplicate_chunks_fill_one_slot(self) -> None:
+        text = "Parking at the venue is free on weekends."
+        retriever.set_index_path(self._index("site", {"parking.txt": text}))
+        retriever.set_index_path(self._index("persona", {"copy.txt": text}), retriever.INDEX_CHARACTER)
+
+        self.assertEqual(len(retriever.retrieve("parking", k=4)), 1)
+
+    def _load_memory(self, global_index: object, character_index: object) -> None:
+        retriever._swap(retriever.INDEX_GLOBAL, self.root / "global.pkl", global_index)
+        retriever._swap(retriever.INDEX_CHARACTER, self.root / "character.pkl", character_index)
+
+    def test_relative_cutoff_spans_indexes(self) -> None:
+        # The character index's best chunk is weak next to the global one.
+        self._load_memory(
+            _memory_index([0.9, 0.44, 0.0], prefix="global"),
+            _memory_index([0.2, 0.98, 0.0], prefix="character"),
+        )
+
+        with (
+            mock.patch.object(retriever, "HYBRID_SEARCH", False),
+            mock.patch.object(retriever, "RELATIVE_SIMILARITY", 0.5),
+            mock.patch.object(retriever, "INDEX_WEIGHTS", {"global": 0.8, "character": 1.0}),
+        ):
+            entries = retriever.retrieve("lab", k=4)
+
+        self.assertEqual([entry.source for entry in entries], ["global-0.txt"])
+
+    def test_mmr_runs_once_on_the_merged_list(self) -> None:
+        # Two near-copies of the best global chunk, then a different one.
+        self._load_memory(
+            _memory_index([1.0, 0.1, 0.0], [1.0, 0.12, 0.0], [0.98, 0.15, 0.02], [0.7, 0.0, 0.7], prefix="global"),
+            _memory_index([0.05, 0.0, 1.0], prefix="character"),
+        )
+
+        with (
+            mock.patch.object(retriever, "HYBRID_SEARCH", False),
+            mock.patch.object(retriever, "RELATIVE_SIMILARITY", 0.5),
+            mock.patch.object(retriever, "MMR_LAMBDA", 0.3),
+            mock.patch.object(retriever, "INDEX_WEIGHTS", {"global": 0.8, "character": 1.0}),
+        ):
+            entries = retriever.retrieve("lab", k=2)
+
+        self.assertEqual([entry.source for entry in entries], ["global-0.txt", "global-3.txt"])
+
+    def test_cleared_character_index_stops_contributing(self) -> None:
+        self._load_both()
+        version = retriever.get_index_version()
+
+        retriever.clear_index(retriever.INDEX_CHARACTER)
+
+        self.assertEqual({entry.source for entry in retriever.retrieve("parking", k=4)}, {"parking.txt"})
+        self.assertEqual(retriever.get_index_version(), version + 1)
+        with self.assertRaises(ValueError):
+            retriever.clear_index(retriever.INDEX_GLOBAL)
+
+
+if __name__ == "__main__":
+    unittest.main()
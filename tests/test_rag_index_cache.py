@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+builder = importlib.import_module("Furhat.RAG.builder")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+vectors = importlib.import_module("Furhat.RAG.vectors")
+
+
+def _build(root: Path, name: str, text: str) -> Path:
+    data_dir = root / f"{name}_data"
+    data_dir.mkdir(exist_ok=True)
+    (data_dir / f"{name}.txt").write_text(text, encoding="utf-8")
+    output = root / f"{name}.pkl"
+    builder.build_index(data_dir=data_dir, output=output, backend=embeddings.BACKEND_HASHED_NGRAM)
+    return output
+
+
+class IndexCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.original_path = retriever.INDEX_PATH
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(retriever.set_index_path, self.original_path)
+
+    def test_switching_back_reuses_loaded_index(self) -> None:
+        alice = _build(self.root, "alice", "Alice works in the robotics lab.")
+        bob = _build(self.root, "bob", "Bob runs the cafeteria.")
+
+        with mock.patch.object(retriever.RagIndex, "load", wraps=retriever.RagIndex.load) as load:
+            first = retriever.set_index_path(alice)
+            version = retriever.get_index_version()
+            retriever.set_index_path(bob)
+            again = retriever.set_index_path(alice)
+
+        self.assertIs(again, first)
+        self.assertIs(retriever.get_index(), first)
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(retriever.get_index_version(), version + 2)
+
+    def test_reload_picks_up_rebuilt_file_only(self) -> None:
+        path = _build(self.root, "alice", "Alice works in the robotics lab.")
+        first = retriever.set_index_path(path)
+        version = retriever.get_index_version()
+
+        self.assertIs(retriever.reload_index(), first)
+        self.assertEqual(retriever.get_index_version(), version)
+
+        _build(self.root, "alice", "Alice moved to the library on the second floor.")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        rebuilt = retriever.reload_index()
+
+        self.assertIsNot(rebuilt, first)
+        self.assertIn("library", rebuilt.entries[0].text)
+        self.assertEqual(retriever.get_index_version(), version + 1)
+
+    def test_lru_evicts_least_recently_used(self) -> None:
+        paths = [_build(self.root, name, f"{name} text") for name in ("a", "b", "c")]
+        cache = retriever.IndexCache(capacity=2)
+
+        first = cache.get(paths[0])
+        cache.get(paths[1])
+        self.assertIs(cache.get(paths[0]), first)
+        cache.get(paths[2])
+
+        with mock.patch.object(retriever.RagIndex, "load", wraps=retriever.RagIndex.load) as load:
+            cache.get(paths[0])
+            cache.get(paths[1])
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(load.call_count, 1)
+
+    def test_evicted_index_stays_readable_for_its_holder(self) -> None:
+        paths = []
+        for name in ("a", "b"):
+            data_dir = self.root / f"{name}_data"
+            data_dir.mkdir()
+            (data_dir / f"{name}.txt").write_text(f"{name} lives in the robotics lab.", encoding="utf-8")
+            paths.append(self.root / f"{name}.pkl")
+            builder.build_index(
+                data_dir=data_dir,
+                output=paths[-1],
+                backend=embeddings.BACKEND_HASHED_NGRAM,
+                vector_storage=vectors.STORAGE_INT8,
+            )
+        cache = retriever.IndexCache(capacity=1)
+        store = cache.get(paths[0]).embeddings
+        map_exact = store._map_exact
+
+        def map_then_evict() -> object:
+            mapping = map_exact()
+            cache.get(paths[1])  # Another thread evicts the index mid-read.
+            return mapping
+
+        with mock.patch.object(store, "_map_exact", side_effect=map_then_evict):
+            row = store.exact_row(0)
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(len(row), store.dim)
+        store.close()
+
+    def test_missing_index_clears_the_active_one(self) -> None:
+        retriever.set_index_path(_build(self.root, "alice", "Alice works in the robotics lab."))
+
+        self.assertIsNone(retriever.set_index_path(self.root / "missing.pkl"))
+        self.assertIsNone(retriever.get_index())
+        self.assertEqual(retriever.retrieve_context("robotics"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import importlib
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+lexical = importlib.import_module("Furhat.RAG.lexical")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+
+
+class _FixedEmbedder:
+    name = "fixed"
+    model = "fixed"
+    fits_corpus = True
+    min_similarity = 0.0
+
+    def __init__(self, query_vec: list[float]) -> None:
+        self.query_vec = query_vec
+
+    def embed_query(self, text: str) -> list[float]:
+        return list(self.query_vec)
+
+
+TEXTS = [
+    "The makerspace has laser cutters and 3D printers for students.",
+    "Visitors can find the robotics lab in room B204 on the second floor.",
+    "The cafeteria is open for lunch and the front desk can help visitors.",
+]
+
+
+class InvertedIndexTests(unittest.TestCase):
+    def test_search_ranks_exact_identifier_first(self) -> None:
+        index = lexical.InvertedIndex.build(TEXTS)
+
+        results = index.search("Which room is B204?", 3)
+
+        self.assertEqual(results[0][1], 1)
+        self.assertGreater(results[0][0], results[1][0])
+
+    def test_rare_terms_outweigh_common_ones(self) -> None:
+        index = lexical.InvertedIndex.build(TEXTS)
+
+        results = index.search("the cafeteria", 3)
+
+        self.assertEqual(results[0][1], 2)
+
+    def test_payload_round_trip_preserves_scores(self) -> None:
+        index = lexical.InvertedIndex.build(TEXTS)
+        restored = lexical.InvertedIndex.from_payload(pickle.loads(pickle.dumps(index.to_payload())))
+
+        self.assertEqual(restored.search("visitors lab", 3), index.search("visitors lab", 3))
+
+    def test_reciprocal_rank_fusion_rewards_agreement(self) -> None:
+        fused = lexical.reciprocal_rank_fusion([[0, 1, 2], [1, 2]], k=60)
+
+        self.assertEqual(fused[0], 1)
+        self.assertEqual(set(fused), {0, 1, 2})
+
+
+class HybridRetrievalTests(unittest.TestCase):
+    def _index(self) -> object:
+        entries = [
+            retriever.RagEntry(text=text, source=f"{idx}.txt", chunk_id=0, start=0, end=len(text))
+            for idx, text in enumerate(TEXTS)
+        ]
+        # The dense side prefers the makerspace chunk for every query.
+        embeddings = [[1.0, 0.0], [0.2, 1.0], [0.6, 0.4]]
+        return retriever.RagIndex(
+            embeddings=embeddings,
+            entries=entries,
+            embedder=_FixedEmbedder([1.0, 0.0]),
+        )
+
+    def test_hybrid_retrieval_surfaces_lexical_match(self) -> None:
+        index = self._index()
+
+        with mock.patch.object(retriever, "HYBRID_SEARCH", True):
+            results = index.retrieve("room B204", k=1)
+        with mock.patch.object(retriever, "HYBRID_SEARCH", False):
+            dense_only = index.retrieve("room B204", k=1)
+
+        self.assertEqual(results[0].source, "1.txt")
+        self.assertEqual(dense_only[0].source, "0.txt")
+
+    def test_legacy_index_without_postings_builds_them_on_load(self) -> None:
+        payload = {
+            "model": "nomic-embed-text",
+            "entries": [{"text": text, "source": f"{idx}.txt"} for idx, text in enumerate(TEXTS)],
+            "embeddings": [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]],
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "legacy.pkl"
+            path.write_bytes(pickle.dumps(payload))
+            index = retriever.RagIndex.load(path)
+
+        self.assertEqual(len(index.lexical), 3)
+        self.assertEqual(index.lexical.search("B204", 1)[0][1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+packing = importlib.import_module("Furhat.RAG.packing")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+
+
+def _hit(text: str, source: str, chunk_id: int, start: int, score: float = 1.0):
+    entry = retriever.RagEntry(text=text, source=source, chunk_id=chunk_id, start=start, end=start + len(text))
+    return retriever.RagHit(entry, score)
+
+
+class PackContextTests(unittest.TestCase):
+    def test_overlapping_chunks_merge_without_repeating_sentences(self) -> None:
+        first = "Doors open at nine. Registration is in the lobby."
+        second = "Registration is in the lobby. Talks start at ten."
+        hits = [_hit(second, "day.txt", 1, 20), _hit(first, "day.txt", 0, 0)]
+
+        context = packing.pack_context(hits, 500)
+
+        self.assertEqual(context, "Doors open at nine. Registration is in the lobby. Talks start at ten.")
+
+    def test_near_duplicates_from_other_sources_are_dropped(self) -> None:
+        text = "Parking at the venue is free on weekends and costs five euros on weekdays."
+        hits = [
+            _hit(text, "site.txt", 0, 0),
+            _hit(text.replace("five", "5"), "copy.txt", 0, 0),
+            _hit("The cafeteria serves lunch from noon.", "food.txt", 0, 0),
+        ]
+
+        context = packing.pack_context(hits, 500)
+
+        self.assertEqual(context.split(packing.BLOCK_SEPARATOR), [text, "The cafeteria serves lunch from noon."])
+
+    def test_budget_is_filled_by_density_and_trimmed_at_sentences(self) -> None:
+        top = "The keynote is in hall A."
+        long = " ".join(f"Sentence {idx} talks about the long schedule." for idx in range(20))
+        short = "Coffee is served at eleven in the foyer."
+        hits = [_hit(top, "a.txt", 0, 0, 0.03), _hit(long, "b.txt", 0, 0, 0.02), _hit(short, "c.txt", 0, 0, 0.01)]
+
+        context = packing.pack_context(hits, 240)
+        blocks = context.split(packing.BLOCK_SEPARATOR)
+
+        self.assertLessEqual(len(context), 240)
+        self.assertEqual(blocks[0], top)
+        self.assertEqual(blocks[2], short)
+        self.assertTrue(blocks[1].startswith("Sentence 0") and blocks[1].endswith("schedule."))
+
+    def test_top_block_is_cut_at_a_word_when_nothing_else_fits(self) -> None:
+        context = packing.pack_context([_hit("alpha beta gamma delta", "a.txt", 0, 0)], 13)
+
+        self.assertEqual(context, "alpha beta")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import importlib
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+builder = importlib.import_module("Furhat.RAG.builder")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+prompting = importlib.import_module("Furhat.RAG.prompting")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+vectors_module = importlib.import_module("Furhat.RAG.vectors")
+
+
+def _hits(*similarities: float) -> list:
+    return [
+        retriever.RagHit(retriever.RagEntry(f"chunk {idx}", f"{idx}.txt", 0, 0, 7), 1.0 / (idx + 1), similarity)
+        for idx, similarity in enumerate(similarities)
+    ]
+
+
+class RelevantHitsTests(unittest.TestCase):
+    def test_nothing_above_the_floor_means_no_hits(self) -> None:
+        self.assertEqual(retriever.relevant_hits(_hits(0.05, 0.04), 0.1), [])
+
+    def test_clear_best_match_comes_alone(self) -> None:
+        with mock.patch.object(retriever, "RELATIVE_SIMILARITY", 0.5):
+            hits = retriever.relevant_hits(_hits(0.6, 0.2, 0.15), 0.1)
+
+        self.assertEqual([hit.entry.source for hit in hits], ["0.txt"])
+
+    def test_close_matches_all_stay_in_ranked_order(self) -> None:
+        with mock.patch.object(retriever, "RELATIVE_SIMILARITY", 0.5):
+            # A lexical match ranked first keeps its place despite a lower cosine.
+            hits = retriever.relevant_hits(_hits(0.3, 0.4, 0.35, 0.05), 0.1)
+
+        self.assertEqual([hit.entry.source for hit in hits], ["0.txt", "1.txt", "2.txt"])
+
+
+class _FixedEmbedder:
+    name = "fixed"
+    model = "fixed"
+    fits_corpus = True
+    min_similarity = 0.0
+
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0, 0.0]
+
+
+class DiversityTests(unittest.TestCase):
+    def _index(self) -> object:
+        # Two near-copies of the best chunk, then a less similar but different one.
+        vectors = [[1.0, 0.1, 0.0], [1.0, 0.12, 0.0], [0.98, 0.15, 0.02], [0.7, 0.0, 0.7]]
+        entries = [retriever.RagEntry(f"chunk {idx}", f"{idx}.txt", 0, 0, 7) for idx in range(len(vectors))]
+        return retriever.RagIndex(embeddings=vectors, entries=entries, embedder=_FixedEmbedder())
+
+    def test_mmr_swaps_near_duplicates_for_coverage(self) -> None:
+        index = self._index()
+
+        with (
+            mock.patch.object(retriever, "HYBRID_SEARCH", False),
+            mock.patch.object(retriever, "RELATIVE_SIMILARITY", 0.0),
+        ):
+            with mock.patch.object(retriever, "MMR_LAMBDA", 1.0):
+                plain = index.retrieve("lab", k=2)
+            with mock.patch.object(retriever, "MMR_LAMBDA", 0.3):
+                diverse = index.retrieve("lab", k=2)
+
+        self.assertEqual([entry.source for entry in plain], ["0.txt", "1.txt"])
+        self.assertEqual([entry.source for entry in diverse], ["0.txt", "3.txt"])
+
+    def test_lazy_mmr_matches_full_rescoring(self) -> None:
+        rng = random.Random(7)
+        rows = [[rng.gauss(0.0, 1.0) for _ in range(32)] for _ in range(12)]
+        rows[3] = [value + rng.gauss(0.0, 0.05) for value in rows[0]]
+        # A sparse block exercises the nonzero-only path.
+        sparse = [[0.0] * 32 for _ in range(12)]
+        for row in sparse:
+            for pos in rng.sample(range(32), 4):
+                row[pos] = rng.uniform(0.1, 1.0)
+        entries = [retriever.RagEntry(f"chunk {idx}", f"{idx}.txt", idx, 0, 7) for idx in range(12)]
+        scores = sorted((rng.uniform(0.4, 1.0) for _ in range(12)), reverse=True)
+
+        def expected(index: object, k: int, mmr_lambda: float) -> list[int]:
+            def cosine(a: int, b: int) -> float:
+                left, right = index.embeddings[a], index.embeddings[b]
+                dot = sum(x * y for x, y in zip(left, right))
+                return dot / ((index.norms[a] or 1.0) * (index.norms[b] or 1.0))
+
+            picked, remaining = [0], list(range(1, 12))
+            while remaining and len(picked) < k:
+                best = max(
+                    remaining,
+                    key=lambda pos: mmr_lambda * scores[pos] / scores[0]
+                    - (1.0 - mmr_lambda) * max(0.0, *(cosine(pos, other) for other in picked)),
+                )
+                picked.append(best)
+                remaining.remove(best)
+            return picked
+
+        for storage in ("float32", "int8"):
+            for vectors in (rows, sparse):
+                store = vectors_module.Int8Store.from_rows(vectors) if storage == "int8" else vectors
+                index = retriever.RagIndex(embeddings=store, entries=entries, embedder=_FixedEmbedder())
+                ranked = [(index, idx, retriever.RagHit(entries[idx], scores[idx])) for idx in range(12)]
+                for mmr_lambda in (0.2, 0.5, 0.8):
+                    with mock.patch.object(retriever, "MMR_LAMBDA", mmr_lambda):
+                        picked = [idx for _, idx, _ in retriever.diversify(ranked, 5)]
+                    self.assertEqual(picked, expected(index, 5, mmr_lambda), (storage, mmr_lambda))
+
+    def test_invalid_lambda_is_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "MMR lambda"):
+            retriever.set_retrieval_settings(top_k=4, max_context_chars=3200, embed_model="", mmr_lambda=1.5)
+
+
+class ContextGateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(retriever.set_index_path, retriever.INDEX_PATH)
+        root = Path(temp_dir.name)
+        data_dir = root / "data"
+        data_dir.mkdir()
+        (data_dir / "rooms.txt").write_text("The robotics lab is in room B204 on the second floor.", encoding="utf-8")
+        (data_dir / "food.txt").write_text("The cafeteria serves lunch from eleven until one.", encoding="utf-8")
+        output = root / "index.pkl"
+        builder.build_index(data_dir=data_dir, output=output, backend=embeddings.BACKEND_HASHED_NGRAM)
+        retriever.set_index_path(output)
+
+    def test_small_talk_gets_no_context_block(self) -> None:
+        context = retriever.retrieve_context("hi")
+
+        self.assertEqual(context, "")
+        self.assertEqual(prompting.build_prompt("hi", context), "hi")
+
+    def test_on_topic_question_gets_only_the_matching_chunk(self) -> None:
+        context = retriever.retrieve_context("when is lunch in the cafeteria")
+
+        self.assertIn("lunch", context)
+        self.assertNotIn("B204", context)
+
+    def test_floor_override_disables_the_gate(self) -> None:
+        with (
+            mock.patch.object(retriever, "MIN_SIMILARITY", 0.0),
+            mock.patch.object(retriever, "RELATIVE_SIMILARITY", 0.0),
+        ):
+            self.assertEqual(len(retriever.retrieve("hi", k=4)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
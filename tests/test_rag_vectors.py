@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+vectors = importlib.import_module("Furhat.RAG.vectors")
+builder = importlib.import_module("Furhat.RAG.builder")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+
+
+def _rows(count: int = 20, dim: int = 16) -> list[list[float]]:
+    rng = random.Random(11)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(count)]
+
+
+class VectorStoreTests(unittest.TestCase):
+    def test_int8_dot_tracks_float_dot(self) -> None:
+        rows = _rows()
+        exact = vectors.Float32Store.from_rows(rows)
+        quantized = vectors.Int8Store.from_rows(rows)
+        query = rows[3]
+
+        for idx in range(len(rows)):
+            self.assertAlmostEqual(quantized.dot(idx, query), exact.dot(idx, query), delta=0.05)
+        self.assertEqual(quantized.memory_bytes(), len(rows) * 16 + len(rows) * 4)
+        self.assertLess(quantized.memory_bytes(), exact.memory_bytes() // 2)
+
+    def test_legacy_embedding_lists_load_as_float32(self) -> None:
+        store = vectors.store_from_payload({"embeddings": [[1.0, 2.0], [3.0, 4.0]]})
+
+        self.assertIsInstance(store, vectors.Float32Store)
+        self.assertEqual(store[1], [3.0, 4.0])
+        self.assertEqual(len(store), 2)
+
+    def test_unknown_storage_is_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Unsupported vector storage"):
+            vectors.create_store([[1.0]], "float8")
+
+
+class QuantizedIndexTests(unittest.TestCase):
+    def test_int8_index_writes_sidecar_and_rescores_shortlist(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            data_dir = root / "data"
+            data_dir.mkdir()
+            (data_dir / "rooms.txt").write_text("The robotics lab is in room B204.", encoding="utf-8")
+            (data_dir / "food.txt").write_text("Lunch is served in the cafeteria.", encoding="utf-8")
+            output = root / "index.pkl"
+            builder.build_index(
+                data_dir=data_dir,
+                output=output,
+                backend=embeddings.BACKEND_HASHED_NGRAM,
+                vector_storage=vectors.STORAGE_INT8,
+            )
+            index = retriever.RagIndex.load(output)
+            store = index.embeddings
+
+            with (
+                mock.patch.object(retriever, "RESCORE_CANDIDATES", 4),
+                mock.patch.object(store, "exact_dot", wraps=store.exact_dot) as exact_dot,
+            ):
+                ranking = index.dense_ranking("where is the robotics lab", 1)
+            self.assertTrue(store.exact_path.exists())
+            self.assertNotEqual(store.exact_path, vectors.exact_sidecar_path(output))
+            store.close()
+
+        self.assertIsInstance(store, vectors.Int8Store)
+        self.assertEqual(index.entries[ranking[0]].source, "rooms.txt")
+        self.assertEqual(exact_dot.call_count, 2)
+        self.assertEqual(index.stats()["vector_storage"], vectors.STORAGE_INT8)
+
+    def test_rebuild_never_mixes_sidecars(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            data_dir = root / "data"
+            data_dir.mkdir()
+            output = root / "index.pkl"
+            source = data_dir / "rooms.txt"
+
+            def build(text: str) -> object:
+                source.write_text(text, encoding="utf-8")
+                builder.build_index(
+                    data_dir=data_dir,
+                    output=output,
+                    backend=embeddings.BACKEND_HASHED_NGRAM,
+                    vector_storage=vectors.STORAGE_INT8,
+                )
+                return retriever.RagIndex.load(output).embeddings
+
+            mapped = build("The robotics lab is in room B204.")
+            unmapped = retriever.RagIndex.load(output).embeddings
+            self.assertTrue(mapped.has_exact)
+            before = mapped.exact_row(0).tolist()
+            vectors.exact_sidecar_path(output).write_bytes(b"legacy")
+
+            rebuilt = build("Lunch is served in the cafeteria on the ground floor.")
+
+            self.assertEqual(mapped.exact_row(0).tolist(), before)
+            self.assertFalse(unmapped.has_exact)
+            self.assertTrue(rebuilt.has_exact)
+            self.assertNotEqual(rebuilt.exact_row(0).tolist(), before)
+            self.assertEqual(sorted(root.glob("*.f32")), [rebuilt.exact_path])
+            for store in (mapped, rebuilt):
+                store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
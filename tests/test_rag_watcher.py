@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+builder = importlib.import_module("Furhat.RAG.builder")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+retriever = importlib.import_module("Furhat.RAG.retriever")
+watcher = importlib.import_module("Furhat.RAG.watcher")
+
+
+class IndexWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(retriever.set_index_path, retriever.INDEX_PATH)
+        self.root = Path(temp_dir.name)
+        self.data_dir = self.root / "data"
+        self.data_dir.mkdir()
+        self.output = self.root / "index.pkl"
+
+    def _build(self, text: str) -> None:
+        (self.data_dir / "faq.txt").write_text(text, encoding="utf-8")
+        builder.build_index(data_dir=self.data_dir, output=self.output, backend=embeddings.BACKEND_HASHED_NGRAM)
+        # Keep two builds inside one mtime tick distinguishable.
+        stat = self.output.stat()
+        os.utime(self.output, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_build_publishes_checksum_without_temp_files(self) -> None:
+        self._build("The robotics lab is in room B204.")
+
+        manifest = json.loads(builder.index_manifest_path(self.output).read_text(encoding="utf-8"))
+
+        self.assertEqual(manifest["checksum"], builder.index_checksum(self.output))
+        self.assertTrue(builder.index_is_published(self.output))
+        self.assertEqual(sorted(path.name for path in self.root.iterdir()), ["data", "index.json", "index.pkl"])
+
+    def test_rebuilt_index_is_hot_swapped(self) -> None:
+        self._build("The robotics lab is in room B204.")
+        retriever.set_index_path(self.output)
+        index_watcher = watcher.IndexWatcher()
+        self.assertFalse(index_watcher.check())
+
+        self._build("The robotics lab moved to room C310.")
+
+        self.assertTrue(index_watcher.check())
+        self.assertIn("C310", retriever.get_index().entries[0].text)
+        self.assertFalse(index_watcher.check())
+
+    def test_half_written_index_is_not_loaded(self) -> None:
+        self._build("The robotics lab is in room B204.")
+        retriever.set_index_path(self.output)
+        index_watcher = watcher.IndexWatcher()
+        index_watcher.check()
+        active = retriever.get_index()
+
+        self.output.write_bytes(self.output.read_bytes()[:-10])
+
+        self.assertFalse(builder.index_is_published(self.output))
+        self.assertFalse(index_watcher.check())
+        self.assertIs(retriever.get_index(), active)
+
+
+def _fake_embed(texts, model):
+    return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in texts]
+
+
+class IncrementalIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.data_dir = self.root / "data"
+        self.data_dir.mkdir()
+        self.output = self.root / "index.pkl"
+        for patcher in (
+            mock.patch.object(builder, "EMBED_BACKEND", embeddings.BACKEND_OLLAMA),
+            mock.patch.object(builder, "EMBED_MODEL", "embed-test"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(embeddings, "embed_texts", side_effect=_fake_embed)
+        self.embed = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _update(self):
+        return builder.update_index(data_dir=self.data_dir, output=self.output)
+
+    def _embedded_texts(self) -> list[str]:
+        # Embedded text is led by the chunk's title line; compare the chunk body.
+        texts = [text.splitlines()[-1] for call in self.embed.call_args_list for text in call.args[0]]
+        self.embed.reset_mock()
+        return texts
+
+    def test_only_changed_files_are_embedded(self) -> None:
+        (self.data_dir / "rooms.txt").write_text("The lab is in B204.", encoding="utf-8")
+        (self.data_dir / "food.txt").write_text("Lunch is at noon.", encoding="utf-8")
+        self.assertTrue(self._update().full_rebuild)
+        self._embedded_texts()
+
+        (self.data_dir / "food.txt").write_text("Lunch is at one.", encoding="utf-8")
+        (self.data_dir / "hours.txt").write_text("Open until six.", encoding="utf-8")
+        update = self._update()
+
+        self.assertEqual((update.added, update.changed, update.removed), (["hours.txt"], ["food.txt"], []))
+        self.assertEqual(sorted(self._embedded_texts()), ["Lunch is at one.", "Open until six."])
+
+        (self.data_dir / "rooms.txt").unlink()
+        update = self._update()
+        index = retriever.RagIndex.load(self.output)
+
+        self.assertEqual(update.removed, ["rooms.txt"])
+        self.assertEqual(self._embedded_texts(), [])
+        self.assertEqual([entry.source for entry in index.entries], ["food.txt", "hours.txt"])
+        self.assertEqual(index.embeddings[0], _fake_embed(["food\nLunch is at one."], "")[0])
+        self.assertFalse(self._update().written)
+
+    def test_removing_every_file_empties_the_index(self) -> None:
+        (self.data_dir / "rooms.txt").write_text("The lab is in B204.", encoding="utf-8")
+        self._update()
+
+        (self.data_dir / "rooms.txt").unlink()
+        update = self._update()
+
+        self.assertTrue(update.written)
+        self.assertEqual((update.entries, update.removed), (0, ["rooms.txt"]))
+        self.assertEqual(retriever.RagIndex.load(self.output).entries, [])
+        self.assertTrue(builder.index_is_published(self.output))
+        self.assertFalse(self._update().written)
+
+        (self.data_dir / "hours.txt").write_text("Open until six.", encoding="utf-8")
+        self.assertEqual(self._update().added, ["hours.txt"])
+        self.assertEqual([entry.source for entry in retriever.RagIndex.load(self.output).entries], ["hours.txt"])
+
+    def test_corpus_watcher_waits_for_stable_scan_then_swaps(self) -> None:
+        self.addCleanup(retriever.set_index_path, retriever.INDEX_PATH)
+        (self.data_dir / "faq.txt").write_text("Parking is free.", encoding="utf-8")
+        self._update()
+        retriever.set_index_path(self.output)
+        corpus = watcher.CorpusWatcher(self.data_dir, self.output)
+        corpus.check()
+        corpus.check()
+
+        self._embedded_texts()
+        (self.data_dir / "faq.txt").write_text("Parking costs two euros.", encoding="utf-8")
+        self.assertIsNone(corpus.check())
+        update = corpus.check()
+
+        self.assertEqual(update.changed, ["faq.txt"])
+        self.assertFalse(update.full_rebuild)
+        self.assertEqual(self._embedded_texts(), ["Parking costs two euros."])
+        self.assertIn("two euros", retriever.get_index().entries[0].text)
+
+
+if __name__ == "__main__":
+    unittest.main()
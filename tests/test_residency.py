@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+residency = importlib.import_module("Furhat.Ollama.residency")
+chatbot = importlib.import_module("Furhat.Ollama.chatbot")
+embeddings = importlib.import_module("Furhat.RAG.embeddings")
+
+
+def _ms(value: float) -> int:
+    return int(value * 1_000_000)
+
+
+class ResidencyManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = residency.ResidencyManager(clock=lambda: 100.0)
+
+    def test_get_keep_alive_reads_numbers_as_seconds(self) -> None:
+        with mock.patch.object(residency, "OLLAMA_KEEP_ALIVE", "30m"):
+            self.assertEqual(residency.get_keep_alive(), "30m")
+        with mock.patch.object(residency, "OLLAMA_KEEP_ALIVE", "-1"):
+            self.assertEqual(residency.get_keep_alive(), -1.0)
+
+    def test_observe_logs_cold_load_then_eviction(self) -> None:
+        with self.assertLogs(residency.logger, level="INFO") as logs:
+            self.manager.observe("chat", "llama", {"load_duration": _ms(1800)})
+            self.manager.observe("chat", "llama", {"load_duration": _ms(3)})
+            self.manager.observe("chat", "llama", {"load_duration": _ms(1500)})
+
+        self.assertIn("loaded chat model llama", logs.output[0])
+        self.assertIn("evicted and reloaded", logs.output[1])
+        self.assertEqual(len(logs.output), 2)
+        state = self.manager.snapshot()[0]
+        self.assertEqual(state["loads"], 2)
+        self.assertEqual(state["evictions"], 1)
+        self.assertTrue(state["resident"])
+
+    def test_ping_passes_keep_alive_and_survives_failures(self) -> None:
+        client = mock.Mock()
+        client.chat.return_value = SimpleNamespace(load_duration=_ms(1))
+        with (
+            mock.patch.object(residency, "OLLAMA_KEEP_ALIVE", "1h"),
+            mock.patch.object(residency.ollama, "embed", side_effect=RuntimeError("down")) as embed,
+            self.assertLogs(residency.logger, level="WARNING"),
+        ):
+            self.manager.ping(client, "llama", "nomic")
+
+        client.chat.assert_called_once_with(model="llama", messages=[], keep_alive="1h")
+        embed.assert_called_once_with(model="nomic", input=residency.WARMUP_TEXT, keep_alive="1h")
+        resident = {(item["kind"], item["model"]): item["resident"] for item in self.manager.snapshot()}
+        self.assertEqual(resident, {("chat", "llama"): True})
+
+    def test_keep_warm_pings_current_models_until_cancelled(self) -> None:
+        client = mock.Mock()
+        models = mock.Mock(side_effect=[("llama", ""), ("llama", "nomic")])
+
+        async def run() -> None:
+            with (
+                mock.patch.object(residency, "OLLAMA_KEEPWARM_SEC", 0.01),
+                mock.patch.object(residency.ollama, "embed") as embed,
+            ):
+                task = asyncio.create_task(self.manager.keep_warm(client, models))
+                while models.call_count < 2 or not embed.called:
+                    await asyncio.sleep(0.01)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                embed.assert_called_with(model="nomic", input=mock.ANY, keep_alive=mock.ANY)
+
+        asyncio.run(run())
+        self.assertGreaterEqual(client.chat.call_count, 2)
+
+    def test_warm_pings_run_on_the_llm_pool(self) -> None:
+        client = mock.Mock()
+        calls = []
+
+        async def fake_run(name, fn, *args):
+            calls.append(name)
+            return fn(*args)
+
+        with (
+            mock.patch.object(residency.executors, "run", side_effect=fake_run),
+            mock.patch.object(residency.ollama, "embed"),
+        ):
+            asyncio.run(self.manager.warm(client, "llama", "nomic"))
+
+        self.assertEqual(calls, [residency.executors.LLM, residency.executors.LLM])
+        client.chat.assert_called_once()
+
+    def test_keep_warm_skips_a_round_when_the_llm_pool_is_full(self) -> None:
+        async def saturated(name, fn, *args):
+            raise residency.executors.ExecutorSaturated(name)
+
+        with (
+            mock.patch.object(residency, "OLLAMA_KEEPWARM_SEC", 0),
+            mock.patch.object(residency.executors, "run", side_effect=saturated),
+        ):
+            asyncio.run(self.manager.keep_warm(mock.Mock(), lambda: ("llama", "")))
+
+
+class KeepAliveCallTests(unittest.TestCase):
+    def test_chat_and_embed_calls_set_keep_alive(self) -> None:
+        response = SimpleNamespace(
+            message=SimpleNamespace(content="Hello"),
+            done_reason="stop",
+            load_duration=_ms(1),
+        )
+        with (
+            mock.patch.object(residency, "OLLAMA_KEEP_ALIVE", "45m"),
+            mock.patch.object(chatbot, "current_provider", chatbot.PROVIDER_OLLAMA),
+            mock.patch.object(chatbot, "current_model", "llama"),
+            mock.patch.object(chatbot, "_validate_chat_model"),
+            mock.patch.object(chatbot, "messages", []),
+            mock.patch.object(chatbot, "client") as client,
+            mock.patch.object(embeddings.ollama, "embed", return_value={"embeddings": [[0.5, 0.5]]}) as embed,
+        ):
+            client.chat.return_value = response
+            self.assertEqual(chatbot.get_full_response("hi"), "Hello")
+            self.assertEqual(embeddings.embed_text("hi", "nomic"), [0.5, 0.5])
+
+        self.assertEqual(client.chat.call_args.kwargs["keep_alive"], "45m")
+        embed.assert_called_once_with(model="nomic", input="hi", keep_alive="45m")
+
+
+if __name__ == "__main__":
+    unittest.main()
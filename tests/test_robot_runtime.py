@@ -261,6 +261,43 @@ class RobotRuntimeTests(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(self.runtime.runtime_status.connected)
         self.assertEqual(self.runtime.runtime_status.last_error, "boom")
 
+    async def test_setup_warms_models_while_connecting(self) -> None:
+        warm_started = asyncio.Event()
+        connect_saw_warmup: list[bool] = []
+
+        async def fake_keep_warm(client, models, **kwargs) -> None:
+            warm_started.set()
+            await asyncio.sleep(3600)
+
+        async def fake_watch() -> None:
+            await asyncio.sleep(3600)
+
+        async def fake_connect() -> None:
+            await asyncio.sleep(0)
+            connect_saw_warmup.append(warm_started.is_set())
+            raise RuntimeError("stop setup")
+
+        with (
+            mock.patch.object(self.runtime, "load_runtime_settings"),
+            mock.patch.object(self.runtime, "load_startup_character"),
+            mock.patch.object(self.runtime, "connect_until_ready", side_effect=fake_connect),
+            mock.patch.object(
+                runtime_module.residency.residency_manager,
+                "keep_warm",
+                side_effect=fake_keep_warm,
+            ),
+            mock.patch.object(runtime_module.watcher, "watch_indexes", side_effect=fake_watch),
+            mock.patch.object(runtime_module.settings_store, "watch_settings", side_effect=fake_watch),
+        ):
+            with self.assertRaisesRegex(RuntimeError, "stop setup"):
+                await self.runtime.setup()
+            await asyncio.sleep(0)
+
+        self.assertEqual(connect_saw_warmup, [True])
+        self.assertTrue(self.runtime.residency_task.cancelled())
+        self.assertTrue(self.runtime.index_watch_task.cancelled())
+        self.assertTrue(self.runtime.settings_watch_task.cancelled())
+
     def test_disconnect_uses_attached_loop_from_sync_context(self) -> None:
         loop = asyncio.new_event_loop()
 
@@ -315,6 +352,26 @@ class RobotRuntimeTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(transcript[0]["source"], "preset")
         self.assertEqual(transcript[0]["preset_id"], "intro")
 
+    async def test_saturated_llm_pool_fails_the_turn_fast(self) -> None:
+        saturated = runtime_module.executors.BoundedExecutor("llm", 1, 0)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        saturated.submit(release.wait, 5)
+
+        with (
+            mock.patch.object(runtime_module, "SPEAK_THINKING", False),
+            mock.patch.object(runtime_module.retriever, "retrieve_context", return_value=""),
+            mock.patch.object(runtime_module.Ollama, "get_full_response", return_value="late") as get_full_response,
+            mock.patch.dict(runtime_module.executors._EXECUTORS, {runtime_module.executors.LLM: saturated}),
+        ):
+            await self.runtime.speak_from_prompt("hello there")
+
+        get_full_response.assert_not_called()
+        transcript = self.runtime.get_transcript()
+        self.assertEqual(transcript[0]["status"], "error")
+        self.assertEqual(transcript[0]["error"], "ollama busy")
+        self.assertEqual(saturated.stats()["rejected"], 1)
+
     async def test_empty_listen_result_records_empty_transcript(self) -> None:
         with mock.patch.object(runtime_module.robot_config, "END_SPEECH_TIMEOUT", 0.01):
             await self.runtime.on_listen_activate(channel="web")
@@ -384,6 +441,60 @@ class RobotRuntimeTests(unittest.IsolatedAsyncioTestCase):
         transcript = self.runtime.get_transcript()
         self.assertEqual(transcript[-1]["status"], "cancelled")
 
+    async def test_concurrent_identical_prompts_share_one_model_call(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_response(prompt: str) -> str:
+            started.set()
+            release.wait(timeout=2)
+            return "shared reply"
+
+        with (
+            mock.patch.object(runtime_module, "SPEAK_THINKING", False),
+            mock.patch.object(runtime_module.retriever, "retrieve_context", return_value="") as retrieve_context,
+            mock.patch.object(runtime_module.prompting, "build_prompt", return_value="prompt"),
+            mock.patch.object(
+                runtime_module.Ollama,
+                "get_full_response",
+                side_effect=slow_response,
+            ) as get_full_response,
+            mock.patch.object(runtime_module.text, "shorten_for_speech", side_effect=lambda value: value),
+            mock.patch.object(runtime_module.text, "sanitize_for_speech", side_effect=lambda value: value),
+        ):
+            first = asyncio.create_task(
+                self.runtime.speak_from_prompt("Who are you?", channel="web", source="preset", preset_id="intro")
+            )
+            await asyncio.to_thread(started.wait, 1)
+            second = asyncio.create_task(self.runtime.speak_from_prompt("  who are   YOU? ", channel="desktop"))
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(first, second)
+
+        retrieve_context.assert_called_once()
+        get_full_response.assert_called_once()
+        self.assertEqual(self.runtime.coalesced_requests, 1)
+        self.assertEqual(self.runtime.inflight_replies, {})
+        transcript = self.runtime.get_transcript()
+        self.assertEqual(len(transcript), 2)
+        self.assertEqual([turn["channel"] for turn in transcript], ["web", "desktop"])
+        self.assertEqual([turn["spoken_text"] for turn in transcript], ["shared reply", "shared reply"])
+        self.assertEqual([turn["coalesced"] for turn in transcript], [False, True])
+        self.assertEqual({turn["status"] for turn in transcript}, {"completed"})
+
+    def test_coalesce_key_normalizes_prompt_and_tracks_index_version(self) -> None:
+        first_key = self.runtime._coalesce_key("  Hello   THERE ")
+        with mock.patch.object(
+            runtime_module.retriever,
+            "get_index_version",
+            return_value=first_key[3] + 1,
+        ):
+            second_key = self.runtime._coalesce_key("hello there")
+
+        self.assertEqual(first_key[0], "hello there")
+        self.assertEqual(first_key[:3], second_key[:3])
+        self.assertNotEqual(first_key, second_key)
+
     async def test_repeat_last_response_replays_last_completed_text(self) -> None:
         with (
             mock.patch.object(runtime_module, "SPEAK_THINKING", False),
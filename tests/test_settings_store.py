@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -144,6 +146,100 @@ class SettingsStoreTests(unittest.TestCase):
             self.assertEqual(loaded.temperature, 0.4)
             self.assertEqual(loaded.chat.external_api_timeout, 40.0)
 
+    def test_character_chunk_sizes_are_converted_to_tokens(self) -> None:
+        legacy = settings_store.RagSettings.from_dict({"chunk_size": 900, "chunk_overlap": 180})
+        current = settings_store.RagSettings.from_dict(legacy.to_dict())
+
+        self.assertEqual((legacy.chunk_size, legacy.chunk_overlap), (225, 45))
+        self.assertEqual((current.chunk_size, current.chunk_overlap), (225, 45))
+
+    def test_load_reuses_snapshot_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_root = Path(temp_dir)
+            canonical = temp_root / "settings.json"
+            paths = {
+                "canonical_path": canonical,
+                "legacy_path": temp_root / "legacy.json",
+                "user_path": temp_root / "user.json",
+            }
+            canonical.write_text(json.dumps({"model": "first"}), encoding="utf-8")
+
+            first = settings_store.load_settings(**paths)
+            first.model = "mutated by caller"
+            with mock.patch.object(
+                settings_store,
+                "_read_settings_file",
+                side_effect=AssertionError("re-read"),
+            ):
+                second = settings_store.load_settings(**paths)
+            self.assertEqual(second.model, "first")
+
+            canonical.write_text(json.dumps({"model": "second-model"}), encoding="utf-8")
+            third = settings_store.load_settings(**paths)
+            self.assertEqual(third.model, "second-model")
+
+    def test_save_writes_atomically_and_notifies_subscribers(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_root = Path(temp_dir)
+            canonical = temp_root / "settings.json"
+            paths = {
+                "canonical_path": canonical,
+                "legacy_path": temp_root / "legacy.json",
+                "user_path": temp_root / "user.json",
+            }
+            service = settings_store.SettingsService()
+            events: list[tuple[str, Path | None]] = []
+            unsubscribe = service.subscribe(lambda settings, path: events.append((settings.model, path)))
+            self.assertEqual(service.load(**paths)[0].model, settings_store.DEFAULT_MODEL)
+
+            service.save(settings_store.AppSettings(model="saved"), path=canonical)
+            loaded, source = service.load(**paths)
+            canonical.write_text(json.dumps({"model": "edited on disk"}), encoding="utf-8")
+            self.assertTrue(service.poll(**paths))
+            self.assertFalse(service.poll(**paths))
+            unsubscribe()
+            service.save(settings_store.AppSettings(model="quiet"), path=canonical)
+
+            self.assertEqual(loaded.model, "saved")
+            self.assertEqual(source, canonical)
+            self.assertEqual(events, [("saved", canonical), ("edited on disk", canonical)])
+            self.assertEqual([item.name for item in temp_root.iterdir()], ["settings.json"])
+
+    def test_legacy_chunk_env_counts_characters(self) -> None:
+        legacy = {"RAG_CHUNK_SIZE": "900", "RAG_CHUNK_OVERLAP": "120"}
+        with (
+            mock.patch.dict(settings_store.os.environ, legacy),
+            mock.patch.object(settings_store, "_WARNED_LEGACY_ENV", set()),
+        ):
+            settings_store.os.environ.pop("RAG_CHUNK_TOKENS", None)
+            settings_store.os.environ.pop("RAG_CHUNK_OVERLAP_TOKENS", None)
+            with self.assertLogs(settings_store.logger, "WARNING") as logs:
+                size = settings_store.chunk_tokens_from_env("RAG_CHUNK_TOKENS", "RAG_CHUNK_SIZE", 220)
+                overlap = settings_store.chunk_tokens_from_env("RAG_CHUNK_OVERLAP_TOKENS", "RAG_CHUNK_OVERLAP", 30)
+            settings_store.os.environ["RAG_CHUNK_TOKENS"] = "180"
+            tokens = settings_store.chunk_tokens_from_env("RAG_CHUNK_TOKENS", "RAG_CHUNK_SIZE", 220)
+
+        self.assertEqual((size, overlap, tokens), (225, 30, 180))
+        self.assertIn("RAG_CHUNK_SIZE is deprecated", logs.output[0])
+
+    def test_watch_polls_the_settings_files(self) -> None:
+        sleeps: list[float] = []
+
+        async def stop_after_first(delay: float) -> None:
+            sleeps.append(delay)
+            raise asyncio.CancelledError
+
+        with (
+            mock.patch.object(settings_store, "SETTINGS_WATCH_SEC", 2.0),
+            mock.patch.object(settings_store._SERVICE, "poll", return_value=False) as poll,
+            mock.patch.object(settings_store.asyncio, "sleep", side_effect=stop_after_first),
+        ):
+            with self.assertRaises(asyncio.CancelledError):
+                asyncio.run(settings_store.watch_settings())
+
+        poll.assert_called_once_with()
+        self.assertEqual(sleeps, [2.0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -133,5 +133,34 @@ class UIActionsApplySettingsTests(unittest.TestCase):
         self.assertEqual(self.state.apply_enabled_values, [False])
 
 
+class UIActionsSettingsWatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state = _DummyState()
+        self.actions = UIActions(self.state)
+        self.actions._settings_base = AppSettings(model="old-model")
+
+    def test_disk_edit_is_applied_and_shown(self) -> None:
+        edited = AppSettings(model="new-model")
+        with (
+            mock.patch.object(self.actions, "_apply_live_settings") as apply_live,
+            mock.patch.object(self.actions, "_show_settings") as show_settings,
+        ):
+            self.actions._on_settings_changed(edited)
+
+        apply_live.assert_called_once_with(edited)
+        show_settings.assert_called_once_with(edited)
+        self.assertIs(self.actions._settings_base, edited)
+
+    def test_own_save_echo_is_ignored(self) -> None:
+        with (
+            mock.patch.object(self.actions, "_apply_live_settings") as apply_live,
+            mock.patch.object(self.actions, "_show_settings") as show_settings,
+        ):
+            self.actions._on_settings_changed(AppSettings(model="old-model"))
+
+        apply_live.assert_not_called()
+        show_settings.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -52,6 +52,7 @@ class UISupportTests(unittest.TestCase):
             character_info={"name": "Pepper", "voice_id": "voice"},
             settings_path=ROOT / "src" / "settings.json",
             log_lines=["line 1", "line 2"],
+            rag_cache={"results": {"hits": 3, "misses": 1, "hit_rate": 0.75}},
         )
         self.assertIn("captured_at", snapshot)
         self.assertEqual(
@@ -65,6 +66,7 @@ class UISupportTests(unittest.TestCase):
         self.assertEqual(snapshot["character_info"], {"name": "Pepper", "voice_id": "voice"})
         self.assertEqual(snapshot["settings_path"], str(ROOT / "src" / "settings.json"))
         self.assertEqual(snapshot["log_lines"], ["line 1", "line 2"])
+        self.assertEqual(snapshot["rag_cache"]["results"]["hit_rate"], 0.75)
 
     def test_write_diagnostics_snapshot_writes_timestamped_json(self) -> None:
         snapshot = {